@@ -0,0 +1,64 @@
+# Copying fitz samples into a QImage vs. wrapping them in place.
+# Usage: python benchmarks/bench_qimage.py file.pdf [--zoom 2.0] [--page 0] [--repeat 20]
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymupdf as fitz
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+from utils.qt_image import pixmap_to_qimage
+
+
+def copy_path(pix):
+    # The previous display path: bytes copy, then a second copy into the QPixmap
+    img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+    return QPixmap.fromImage(img)
+
+
+def wrap_path(pix):
+    return pixmap_to_qimage(pix)
+
+
+def measure(func, pix, repeat):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        func(pix)
+    elapsed = (time.perf_counter() - t0) / repeat
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdf")
+    parser.add_argument("--zoom", type=float, default=2.0)
+    parser.add_argument("--page", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    with fitz.open(args.pdf) as doc:
+        pix = doc[args.page].get_pixmap(matrix=fitz.Matrix(args.zoom, args.zoom), colorspace=fitz.csRGB)
+
+    size = pix.stride * pix.height
+    copy_time, copy_peak = measure(copy_path, pix, args.repeat)
+    wrap_time, wrap_peak = measure(wrap_path, pix, args.repeat)
+    img = wrap_path(pix)
+    shared = int(img.constBits()) == pix.samples_ptr
+
+    print(f"page {args.page} at zoom {args.zoom}: {pix.width}x{pix.height}, {size / 1e6:.1f} MB of samples")
+    print(f"copy (samples -> QImage -> QPixmap): {copy_time * 1e3:8.2f} ms  python peak {copy_peak / 1e6:7.1f} MB")
+    print(f"wrap (samples_mv -> QImage):         {wrap_time * 1e3:8.2f} ms  python peak {wrap_peak / 1e6:7.1f} MB")
+    print(f"wrapped image shares the fitz buffer: {shared}")
+    del img, app
+
+
+if __name__ == "__main__":
+    main()
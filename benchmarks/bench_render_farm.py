@@ -0,0 +1,54 @@
+# Serial single-document rasterization vs. RenderFarm across processes.
+# Usage: python benchmarks/bench_render_farm.py file.pdf [--zoom 2.0] [--workers N]
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymupdf as fitz
+from core.render_farm import RenderFarm
+
+
+def render_serial(path, zoom):
+    with fitz.open(path) as doc:
+        mat = fitz.Matrix(zoom, zoom)
+        for page in doc:
+            page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, annots=True)
+        return len(doc)
+
+
+def render_farm(path, zoom, workers):
+    with fitz.open(path) as doc:
+        page_count = len(doc)
+    with RenderFarm(path, workers) as farm:
+        # Pool start-up is included, as a caller would pay it
+        for rendered in farm.render(range(page_count), zoom=zoom, ordered=False):
+            rendered.release()
+    return page_count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("pdf")
+    parser.add_argument("--zoom", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    pages = render_serial(args.pdf, args.zoom)
+    serial = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    render_farm(args.pdf, args.zoom, args.workers)
+    farm = time.perf_counter() - t0
+
+    print(f"{pages} pages at zoom {args.zoom}")
+    print(f"serial:               {serial:8.2f} s  ({pages / serial:7.1f} pages/s)")
+    print(f"farm ({args.workers:2d} workers):    {farm:8.2f} s  ({pages / farm:7.1f} pages/s)")
+    print(f"speedup:              {serial / farm:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Memory and fill time of SearchResults vs. the former list of match dicts.
+# Usage: python benchmarks/bench_search_results.py [--hits N] [--per-page N]
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymupdf as fitz
+from core.search_results import SearchResults
+
+
+def page_hits(page_num, per_page):
+    return [fitz.Rect(72 + i % 10 * 40, 72 + i // 10 * 14, 100 + i % 10 * 40, 84 + i // 10 * 14)
+            for i in range(per_page)]
+
+
+def fill_dicts(text, pages, per_page):
+    results = []
+    for page_num in range(pages):
+        results.extend({'page': page_num, 'rect': rect, 'text': text} for rect in page_hits(page_num, per_page))
+    return results
+
+
+def fill_arrays(text, pages, per_page):
+    results = SearchResults(text)
+    for page_num in range(pages):
+        results.add_page(page_num, page_hits(page_num, per_page))
+    return results
+
+
+def measure(fill, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    results = fill(*args)
+    elapsed = time.perf_counter() - t0
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, elapsed, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hits", type=int, default=1_000_000)
+    parser.add_argument("--per-page", type=int, default=500)
+    args = parser.parse_args()
+    pages = max(1, args.hits // args.per_page)
+
+    print(f"{pages * args.per_page} hits on {pages} pages")
+    for name, fill in (("list of dicts", fill_dicts), ("SearchResults", fill_arrays)):
+        results, elapsed, current, peak = measure(fill, "the", pages, args.per_page)
+        t0 = time.perf_counter()
+        for i in range(0, len(results), max(1, len(results) // 1000)):
+            results[i]
+        lookup = (time.perf_counter() - t0) * 1e6 / 1000
+        print(f"{name:14s} {current / 2**20:8.1f} MB held, {peak / 2**20:8.1f} MB peak, "
+              f"fill {elapsed:6.2f} s, {lookup:5.1f} us per lookup")
+        del results
+
+
+if __name__ == "__main__":
+    main()
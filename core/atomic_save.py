@@ -0,0 +1,61 @@
+import os
+import stat
+import tempfile
+import pymupdf as fitz
+from core.save_profiles import apply_profile, needs_rewrite
+
+# Read once here; changing the umask later from a worker thread would race other threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_snapshot(data, target, profile=None, stage=None):
+    """Write a PDF snapshot to target through a temp file in the same folder.
+
+    data is a complete PDF from Document.tobytes(). Unless profile is None or
+    'fast' it is opened and saved again with that save profile (garbage
+    collection, compression, ...); otherwise the bytes are written as they
+    are. The temp file replaces target only once fully written and synced,
+    so a failure at any point leaves the old file untouched. stage(name)
+    reports progress. Returns the size of the written file.
+    """
+    directory = os.path.dirname(os.path.abspath(target))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".saving-", suffix=".pdf")
+    try:
+        if profile and needs_rewrite(profile):
+            os.close(fd)
+            fd = None
+            with fitz.open(stream=data, filetype="pdf") as doc:
+                apply_profile(doc, profile, tmp_path, stage)
+            fd = os.open(tmp_path, os.O_RDONLY)
+        else:
+            if stage:
+                stage("write")
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        if stage:
+            stage("sync")
+        os.fsync(fd)
+        size = os.fstat(fd).st_size
+        os.close(fd)
+        fd = None
+        if stage:
+            stage("replace")
+        os.chmod(tmp_path, _file_mode(target))
+        os.replace(tmp_path, target)
+        return size
+    except BaseException:
+        if fd is not None:
+            os.close(fd)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_mode(target):
+    # mkstemp files are private; the saved file keeps the mode of the one it replaces
+    try:
+        return stat.S_IMODE(os.stat(target).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
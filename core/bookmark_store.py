@@ -0,0 +1,113 @@
+import json
+import os
+import time
+
+BOOKMARKS_VERSION = 2
+MAX_BOOKMARKS = 10000  # least recently updated entries beyond this are dropped on flush
+
+
+class BookmarkStore:
+    """Last read page and reading state per document, keyed by content fingerprint.
+
+    Updates only touch memory; flush() writes the whole store when something
+    changed, to a temp file that then replaces the old one, so a crash
+    never leaves a half-written file. Each entry also remembers the path it
+    was last seen at, which finds the page again when the fingerprint has
+    changed (the file was saved) but the path has not. The older format, a
+    plain {path: page} map, is read and converted as files are opened.
+    Besides the page, an entry may hold a 'state' dict of view settings
+    (zoom, scroll offsets, view mode, ...) owned by the caller.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}  # fingerprint -> {'page', 'path', 'updated', 'state'}
+        self._by_path = {}  # path -> fingerprint
+        self._legacy = {}  # path -> page, from the old format
+        self.dirty = False
+        self.writes = 0
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading bookmarks: {e}")
+            return
+        if isinstance(data, dict) and data.get('version') == BOOKMARKS_VERSION:
+            self.entries = data.get('documents', {})
+            self._legacy = data.get('legacy', {})
+        elif isinstance(data, dict):
+            self._legacy = {path: page for path, page in data.items() if isinstance(page, int)}
+        self._by_path = {entry['path']: key for key, entry in self.entries.items() if entry.get('path')}
+
+    def _find(self, fingerprint, path):
+        entry = self.entries.get(fingerprint) if fingerprint else None
+        if entry is None and path:
+            key = self._by_path.get(path)
+            entry = self.entries.get(key) if key else None
+        return entry
+
+    def get(self, fingerprint, path=None):
+        entry = self._find(fingerprint, path)
+        if entry is None:
+            return self._legacy.get(path, 0) if path else 0
+        return entry['page']
+
+    def get_state(self, fingerprint, path=None):
+        entry = self._find(fingerprint, path)
+        return dict(entry.get('state') or {}) if entry else {}
+
+    def set(self, fingerprint, path, page):
+        self._update(fingerprint, path, page=page)
+
+    def set_state(self, fingerprint, path, state):
+        self._update(fingerprint, path, state=dict(state))
+
+    def _update(self, fingerprint, path, **fields):
+        key = fingerprint or path
+        if not key:
+            return
+        entry = self.entries.get(key)
+        if entry is not None and entry['path'] == path and all(entry.get(k) == v for k, v in fields.items()):
+            return
+        if entry is not None and entry['path'] != path:
+            self._by_path.pop(entry['path'], None)
+        old_key = self._by_path.get(path)
+        if old_key and old_key != key:
+            # Same path, new content: the old content's entry carries over, then goes
+            old = self.entries.pop(old_key, None)
+            if entry is None and old is not None:
+                entry = old
+        if entry is None:
+            entry = {'page': self._legacy.get(path, 0)}
+        entry.update(fields, path=path, updated=time.time())
+        self.entries[key] = entry
+        self._by_path[path] = key
+        self._legacy.pop(path, None)
+        self.dirty = True
+
+    def flush(self):
+        if not self.dirty:
+            return True
+        if len(self.entries) > MAX_BOOKMARKS:
+            recent = sorted(self.entries.items(), key=lambda item: item[1]['updated'], reverse=True)
+            self.entries = dict(recent[:MAX_BOOKMARKS])
+            self._by_path = {entry['path']: key for key, entry in self.entries.items()}
+        data = {'version': BOOKMARKS_VERSION, 'documents': self.entries}
+        if self._legacy:
+            data['legacy'] = self._legacy
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving bookmarks: {e}")
+            return False
+        self.dirty = False
+        self.writes += 1
+        return True
@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+
+import pymupdf as fitz
+
+# Per-process state, set up once by the pool initializer
+_worker_doc = None
+_worker_cancel = None
+
+
+def _init_worker(path, cancel_event):
+    global _worker_doc, _worker_cancel
+    _worker_doc = fitz.open(path)
+    _worker_cancel = cancel_event
+
+
+def worker_document():
+    """The worker process's own handle on the pool's PDF file."""
+    return _worker_doc
+
+
+def worker_cancelled():
+    return _worker_cancel.is_set()
+
+
+class DocumentPool:
+    """Worker processes that each open one PDF file, with a shared cancel flag.
+
+    Subclasses submit module-level task functions to self._pool; the tasks
+    reach the file through worker_document() and poll worker_cancelled().
+    """
+
+    def __init__(self, path, workers=None):
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        # spawn keeps the workers clear of the GUI's threads and Qt state
+        self._context = multiprocessing.get_context("spawn")
+        self._cancel = self._context.Event()
+        self._pool = None
+
+    def start(self):
+        if self._pool is None:
+            self._pool = self._context.Pool(
+                self.workers, initializer=_init_worker, initargs=(self.path, self._cancel)
+            )
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.cancel()
+        self.close()
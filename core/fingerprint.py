@@ -0,0 +1,28 @@
+import hashlib
+import os
+
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+def document_fingerprint(path, doc=None):
+    """Content fingerprint of a PDF file: size, mtime, first/last blocks and the PDF /ID."""
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        stat = os.stat(path)
+        h = hashlib.sha1()
+        h.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        with open(path, 'rb') as f:
+            h.update(f.read(FINGERPRINT_BLOCK_SIZE))
+            if stat.st_size > FINGERPRINT_BLOCK_SIZE:
+                f.seek(max(FINGERPRINT_BLOCK_SIZE, stat.st_size - FINGERPRINT_BLOCK_SIZE))
+                h.update(f.read(FINGERPRINT_BLOCK_SIZE))
+        if doc is not None and doc.is_pdf:
+            kind, value = doc.xref_get_key(-1, "ID")
+            if kind == 'array':
+                h.update(value.encode())
+        return h.hexdigest()
+    except Exception as e:
+        print(f"Error fingerprinting {path}: {e}")
+        return None
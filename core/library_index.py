@@ -0,0 +1,274 @@
+import argparse
+from collections import namedtuple
+import os
+import re
+import sqlite3
+import time
+import pymupdf as fitz
+from core.fingerprint import document_fingerprint
+from core.search_engine import fold_strokes
+from core.text_cache import TEXTPAGE_FLAGS
+
+LIBRARY_INDEX_DB = "pdf_library.sqlite"
+PAGE_ROWID_BITS = 20  # page rows are keyed doc_id << 20 | page, so one document holds up to ~1M pages
+DEFAULT_LIBRARY_RESULTS = 50
+SNIPPET_TOKENS = 12
+
+LibraryHit = namedtuple('LibraryHit', ['path', 'title', 'page', 'snippet', 'rank'])
+
+_QUERY_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def fts_query(text):
+    """FTS5 MATCH expression for free text: every word or "quoted phrase" must occur.
+
+    Terms are quoted so punctuation in user input is never read as query syntax;
+    a trailing * keeps its prefix meaning.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERM.findall(text):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith('*')
+        term = term.rstrip('*') if prefix else term
+        if not term.strip():
+            continue
+        quoted = '"' + term.replace('"', '""') + '"'
+        terms.append(quoted + '*' if prefix else quoted)
+    return ' '.join(terms)
+
+
+def find_pdfs(folder):
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                yield os.path.join(root, name)
+
+
+class LibraryIndex:
+    """Full-text index of every PDF under one or more folders, in SQLite FTS5.
+
+    documents holds one row per file with the size, mtime and fingerprint it
+    was indexed at; pages is an FTS5 table with one row per page. The
+    tokenizer drops diacritics but not stroke letters (đ, ø, ł), so pages
+    holding those also get a stroke-folded copy in the folded column. A
+    connection belongs to the thread that opened it, so an indexing thread
+    opens its own LibraryIndex on the same database.
+    """
+
+    def __init__(self, db_path=LIBRARY_INDEX_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        # WAL lets the GUI query while a crawl is writing
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=5000")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " id INTEGER PRIMARY KEY,"
+            " path TEXT NOT NULL UNIQUE,"
+            " fingerprint TEXT,"
+            " size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " page_count INTEGER NOT NULL,"
+            " title TEXT NOT NULL,"
+            " indexed_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS folders ("
+            " path TEXT PRIMARY KEY,"
+            " indexed_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS pages USING fts5("
+            " text, folded, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        self.conn.commit()
+
+    #  Indexing
+    def update(self, folder, cancelled=None, progress=None):
+        """Bring the index of folder up to date; returns counts of what changed.
+
+        Files whose size and mtime match the stored row are skipped. A new
+        path whose fingerprint matches a vanished file is taken as a move and
+        keeps its pages. progress(done, total, path) is called per file.
+        """
+        folder = os.path.abspath(folder)
+        stats = {'added': 0, 'updated': 0, 'moved': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+        files = list(find_pdfs(folder))
+        known = {
+            row[1]: row for row in self.conn.execute(
+                "SELECT id, path, fingerprint, size, mtime_ns FROM documents"
+            ) if self._in_folder(row[1], folder)
+        }
+        present = set(files)
+        vanished = {row[2]: row for path, row in known.items() if path not in present and row[2]}
+
+        for done, path in enumerate(files, 1):
+            if cancelled and cancelled():
+                return None
+            if progress:
+                progress(done, len(files), path)
+            try:
+                stat = os.stat(path)
+            except OSError as e:
+                print(f"Error reading {path}: {e}")
+                stats['failed'] += 1
+                continue
+            row = known.get(path)
+            if row and row[3] == stat.st_size and row[4] == stat.st_mtime_ns:
+                stats['unchanged'] += 1
+                continue
+
+            fingerprint = document_fingerprint(path)
+            moved = vanished.pop(fingerprint, None) if not row and fingerprint else None
+            if moved:
+                with self.conn:
+                    self.conn.execute("UPDATE documents SET path = ? WHERE id = ?", (path, moved[0]))
+                del known[moved[1]]
+                stats['moved'] += 1
+                continue
+            if self._index_file(path, stat, fingerprint, row[0] if row else None):
+                stats['updated' if row else 'added'] += 1
+            else:
+                stats['failed'] += 1
+
+        for path, row in known.items():
+            if path not in present:
+                self._remove_document(row[0])
+                stats['removed'] += 1
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO folders VALUES (?, ?)", (folder, time.time()))
+        return stats
+
+    def _index_file(self, path, stat, fingerprint, doc_id=None):
+        # Text is read before the transaction so a broken file leaves the old rows alone
+        try:
+            with fitz.open(path) as doc:
+                title = (doc.metadata or {}).get('title') or os.path.basename(path)
+                texts = [page.get_text("text", flags=TEXTPAGE_FLAGS) for page in doc]
+        except Exception as e:
+            print(f"Error indexing {path}: {e}")
+            if doc_id is not None:
+                # Keep the last good text; the old size and mtime make the next scan retry
+                return False
+            # Recorded without pages, so an unreadable file is not retried until it changes
+            title, texts = os.path.basename(path), []
+            failed = True
+        else:
+            failed = False
+
+        with self.conn:
+            if doc_id is None:
+                doc_id = self.conn.execute(
+                    "INSERT INTO documents (path, fingerprint, size, mtime_ns, page_count, title, indexed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, fingerprint, stat.st_size, stat.st_mtime_ns, len(texts), title, time.time())
+                ).lastrowid
+            else:
+                self._delete_pages(doc_id)
+                self.conn.execute(
+                    "UPDATE documents SET fingerprint = ?, size = ?, mtime_ns = ?, page_count = ?,"
+                    " title = ?, indexed_at = ? WHERE id = ?",
+                    (fingerprint, stat.st_size, stat.st_mtime_ns, len(texts), title, time.time(), doc_id)
+                )
+            rows = []
+            for page_num, text in enumerate(texts):
+                if text.strip():
+                    folded = fold_strokes(text)
+                    rows.append((doc_id << PAGE_ROWID_BITS | page_num, text, folded if folded != text else ''))
+            self.conn.executemany("INSERT INTO pages (rowid, text, folded) VALUES (?, ?, ?)", rows)
+        return not failed
+
+    def _delete_pages(self, doc_id):
+        # rowid range delete; FTS5 has no index on other columns
+        self.conn.execute(
+            "DELETE FROM pages WHERE rowid >= ? AND rowid < ?",
+            (doc_id << PAGE_ROWID_BITS, (doc_id + 1) << PAGE_ROWID_BITS)
+        )
+
+    def _remove_document(self, doc_id):
+        with self.conn:
+            self._delete_pages(doc_id)
+            self.conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    @staticmethod
+    def _in_folder(path, folder):
+        return path.startswith(folder.rstrip(os.sep) + os.sep)
+
+    #  Queries
+    def search(self, text, limit=DEFAULT_LIBRARY_RESULTS, marks=('[', ']')):
+        """Best matching pages across the library, best first, as LibraryHit."""
+        query = fts_query(text)
+        if not query:
+            return []
+        try:
+            rows = self.conn.execute(
+                "SELECT d.path, d.title, pages.rowid, snippet(pages, 0, ?, ?, '…', ?), bm25(pages)"
+                " FROM pages JOIN documents d ON d.id = pages.rowid >> ?"
+                " WHERE pages MATCH ? ORDER BY bm25(pages) LIMIT ?",
+                (marks[0], marks[1], SNIPPET_TOKENS, PAGE_ROWID_BITS, query, limit)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Error searching library: {e}")
+            return []
+        page_mask = (1 << PAGE_ROWID_BITS) - 1
+        return [
+            LibraryHit(path, title, rowid & page_mask, ' '.join(snippet.split()), rank)
+            for path, title, rowid, snippet, rank in rows
+        ]
+
+    def folders(self):
+        """Indexed folders, most recently indexed first."""
+        return [row[0] for row in self.conn.execute("SELECT path FROM folders ORDER BY indexed_at DESC")]
+
+    def stats(self):
+        documents, pages = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(page_count), 0) FROM documents"
+        ).fetchone()
+        return {'documents': documents, 'pages': pages}
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def main(argv=None):
+    # python -m core.library_index index FOLDER | search QUERY
+    parser = argparse.ArgumentParser(prog="python -m core.library_index",
+                                     description="Index a folder of PDFs and search it.")
+    parser.add_argument("--db", default=LIBRARY_INDEX_DB, help="index database (default: %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    index_cmd = commands.add_parser("index", help="crawl a folder and update the index")
+    index_cmd.add_argument("folder")
+    search_cmd = commands.add_parser("search", help="ranked search across indexed PDFs")
+    search_cmd.add_argument("query", nargs="+")
+    search_cmd.add_argument("--limit", type=int, default=DEFAULT_LIBRARY_RESULTS)
+    args = parser.parse_args(argv)
+
+    with LibraryIndex(args.db) as library:
+        if args.command == "index":
+            if not os.path.isdir(args.folder):
+                parser.error(f"not a folder: {args.folder}")
+            t0 = time.perf_counter()
+            stats = library.update(args.folder)
+            summary = ", ".join(f"{count} {name}" for name, count in stats.items())
+            print(f"{summary} in {time.perf_counter() - t0:.1f} s")
+            totals = library.stats()
+            print(f"library: {totals['documents']} documents, {totals['pages']} pages")
+        else:
+            hits = library.search(" ".join(args.query), args.limit)
+            for hit in hits:
+                print(f"{hit.path}  p.{hit.page + 1}  {hit.snippet}")
+            if not hits:
+                print("No matches found")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+import threading
+
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_TILE_CACHE_BYTES = 96 * 1024 * 1024
+
+
+class PageCache:
+    """LRU cache of rendered pixmaps bounded by a memory budget in bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prefetch_hits = 0
+        self._entries = OrderedDict()
+        self._prefetched = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def pixmap_size(pixmap):
+        return pixmap.stride * pixmap.height
+
+    def get(self, key):
+        with self._lock:
+            pixmap = self._entries.get(key)
+            if pixmap is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            if key in self._prefetched:
+                self._prefetched.discard(key)
+                self.prefetch_hits += 1
+            return pixmap
+
+    def put(self, key, pixmap, prefetched=False):
+        size = self.pixmap_size(pixmap)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= self.pixmap_size(old)
+                self._prefetched.discard(key)
+
+            # A single pixmap larger than the whole budget is never kept
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = pixmap
+            self.current_bytes += size
+            if prefetched:
+                self._prefetched.add(key)
+            self._evict()
+
+    def contains(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            key, pixmap = self._entries.popitem(last=False)
+            self.current_bytes -= self.pixmap_size(pixmap)
+            self._prefetched.discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._prefetched.clear()
+            self.current_bytes = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.prefetch_hits = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'prefetch_hits': self.prefetch_hits,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,9 @@
+from collections import namedtuple
+
+PAGES_ROTATED = 'rotated'
+PAGES_MODIFIED = 'modified'  # content or annotations changed
+PAGES_INSERTED = 'inserted'
+PAGES_REMOVED = 'removed'
+
+# indices are ascending; for PAGES_REMOVED they refer to positions before the removal
+PageChange = namedtuple('PageChange', ['kind', 'indices'])
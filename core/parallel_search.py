@@ -0,0 +1,61 @@
+import pymupdf as fitz
+from core.document_pool import DocumentPool, worker_cancelled, worker_document
+from core.text_cache import TEXTPAGE_FLAGS
+
+SHARDS_PER_WORKER = 4  # smaller shards even out pages of very different cost
+PARALLEL_SEARCH_MIN_PAGES = 200  # below this, pool start-up costs more than it saves
+
+def _search_shard(args):
+    text, pages, keep_text = args
+    hits = []
+    texts = {}
+    doc = worker_document()
+    for page_num in pages:
+        if worker_cancelled():
+            break
+        page = doc[page_num]
+        textpage = page.get_textpage(flags=TEXTPAGE_FLAGS)
+        rects = page.search_for(text, textpage=textpage)
+        if rects:
+            hits.append((page_num, [tuple(r) for r in rects]))
+        if keep_text:
+            texts[page_num] = textpage.extractText()
+    return len(pages), hits, texts
+
+
+def shard_pages(pages, shard_count):
+    """Split pages into at most shard_count contiguous runs, keeping their order."""
+    pages = list(pages)
+    shard_count = max(1, min(shard_count, len(pages)))
+    size, extra = divmod(len(pages), shard_count)
+    shards, start = [], 0
+    for i in range(shard_count):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(pages[start:end])
+        start = end
+    return [s for s in shards if s]
+
+
+class ParallelSearch(DocumentPool):
+    """Searches page shards of one PDF file across worker processes."""
+
+    def search(self, text, pages, ordered=False):
+        """Yield (page, [fitz.Rect]) for every page with hits, shard by shard.
+
+        With ordered=True shards are yielded in page order; otherwise as
+        soon as each one finishes.
+        """
+        for _, hits, _ in self.search_shards(text, pages, ordered):
+            for page_num, rects in hits:
+                yield page_num, [fitz.Rect(r) for r in rects]
+
+    def search_shards(self, text, pages, ordered=False, keep_text=False):
+        # (pages in shard, [(page, rect tuples)], {page: text}) per finished shard,
+        # hits possibly empty; the page texts only with keep_text
+        self.start()
+        self._cancel.clear()
+        tasks = [(text, shard, keep_text) for shard in shard_pages(pages, self.workers * SHARDS_PER_WORKER)]
+        results = self._pool.imap if ordered else self._pool.imap_unordered
+        for shard in results(_search_shard, tasks, chunksize=1):
+            if not self._cancel.is_set():
+                yield shard
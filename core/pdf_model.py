@@ -1,23 +1,67 @@
 import pymupdf as fitz
-import json
 import os
+import tempfile
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from core.page_cache import PageCache, DEFAULT_CACHE_BYTES, DEFAULT_TILE_CACHE_BYTES
+from core.text_cache import TextPageCache, TEXTPAGE_FLAGS
+from core.fingerprint import document_fingerprint
+from core.bookmark_store import BookmarkStore
+from core.atomic_save import write_snapshot
+from core.save_profiles import (
+    SAVE_PROFILE, SAVE_AS_PROFILE, get_profile, needs_rewrite, save_report, format_report
+)
+from core.search_index import SEARCH_INDEX_DIR
+from core.parallel_search import PARALLEL_SEARCH_MIN_PAGES
+from core.search_engine import PLAIN_SEARCH
+from core.search_results import SearchResults
+from core.page_events import (
+    PageChange, PAGES_ROTATED, PAGES_MODIFIED, PAGES_INSERTED, PAGES_REMOVED
+)
+
+DISPLAY_LIST_CACHE_PAGES = 32
 
 
 class PDFModel:
-    def __init__(self):
+    def __init__(self, render_cache_bytes=DEFAULT_CACHE_BYTES):
         self.doc = None
         self.file_path = None
         self.current_page = 0
-        self.search_results = []
+        self.search_results = SearchResults()
         self.current_search_index = -1
         self.last_search_text = ""
+        self._running_search = None  # (text, options, source key) of the scan in progress
+        self._finished_search = None  # the same for the last scan that ran to the end
+        self._search_snapshot = None  # (source key, bytes) of unsaved edits
         self.bookmarks_file = "pdf_bookmarks.json"
-        self.bookmarks = self.load_bookmarks()
+        self.bookmarks = BookmarkStore(self.bookmarks_file)
+        self.search_index = None
+        self.page_cache = PageCache(render_cache_bytes)
+        self.tile_cache = PageCache(DEFAULT_TILE_CACHE_BYTES)
+        self._display_lists = OrderedDict()  # page index -> (rotation, DisplayList)
+        self.text_cache = TextPageCache()
+        self._page_revisions = []
+        self._source_pages = []
+        self.source_version = 0
+        self._layout_version = 0  # bumped when pages are inserted or removed
+        self.fingerprint = None
+        self.change_listeners = []
+        self._modified = False
+        self._edit_count = 0
+        self._rotated_sources = set()  # pages of the file whose rotation was changed
+        self.saving = False  # edits are refused while a save is writing a snapshot
+        self.last_save_report = None
 
     def load_pdf(self, path):
         self.doc = fitz.open(path)
         self.file_path = path
-        self.current_page = self.get_bookmark(path)
+        self._reset_source_pages()
+        # Looked up by fingerprint, so needs _reset_source_pages first
+        self.current_page = min(self.get_bookmark(path), len(self.doc) - 1) if len(self.doc) else 0
+        self.save_bookmark(path, self.current_page)  # follows a renamed file to its new path
+        self.page_cache.reset_stats()
+        self.text_cache.reset_stats()
         self.clear_search()
 
     def get_page_count(self):
@@ -26,16 +70,264 @@ class PDFModel:
     def get_current_page_pixmap(self, zoom=1.0):
         if not self.doc:
             return None
-        page = self.doc[self.current_page]
-        mat = fitz.Matrix(zoom, zoom)
-        return page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, annots=True)
+        return self.get_pixmap_by_index(self.current_page, zoom, cached=True)
 
-    def get_pixmap_by_index(self, idx, zoom=1.0):
+    def get_pixmap_by_index(self, idx, zoom=1.0, cached=False):
         if not self.doc or not (0 <= idx < len(self.doc)):
             return None
         page = self.doc[idx]
+        if not cached:
+            mat = fitz.Matrix(zoom, zoom)
+            return page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, annots=True)
+
+        key = self.render_cache_key(idx, zoom)
+        pixmap = self.page_cache.get(key)
+        if pixmap is None:
+            pixmap = self._render_page(idx, zoom)
+            self.page_cache.put(key, pixmap)
+        return pixmap
+
+    #  Display Lists
+    def _get_display_list(self, idx):
+        page = self.doc[idx]
+        entry = self._display_lists.get(idx)
+        if entry and entry[0] == page.rotation:
+            self._display_lists.move_to_end(idx)
+            return entry[1]
+
+        # Static page content only, annotations are drawn on top per render
+        display_list = page.get_displaylist(annots=False)
+        self._display_lists[idx] = (page.rotation, display_list)
+        while len(self._display_lists) > DISPLAY_LIST_CACHE_PAGES:
+            self._display_lists.popitem(last=False)
+        return display_list
+
+    def _render_page(self, idx, zoom, clip=None):
+        page = self.doc[idx]
         mat = fitz.Matrix(zoom, zoom)
-        return page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, annots=True)
+        if not self.doc.is_pdf:
+            return page.get_pixmap(matrix=mat, clip=clip, colorspace=fitz.csRGB, annots=True)
+
+        try:
+            pixmap = self._get_display_list(idx).get_pixmap(
+                matrix=mat, colorspace=fitz.csRGB, alpha=False, clip=clip
+            )
+            if page.first_annot or page.first_widget:
+                self._draw_annotations(page, pixmap, mat)
+            return pixmap
+        except Exception as e:
+            print(f"Error rendering page {idx} from display list: {e}")
+            return page.get_pixmap(matrix=mat, clip=clip, colorspace=fitz.csRGB, annots=True)
+
+    @staticmethod
+    def _draw_annotations(page, pixmap, mat):
+        mupdf = fitz.mupdf
+        pdf_page = mupdf.pdf_page_from_fz_page(page.this)
+        ctm = mupdf.FzMatrix(*mat)
+        device = mupdf.fz_new_draw_device(mupdf.FzMatrix(), pixmap.this)
+        try:
+            mupdf.pdf_run_page_annots(pdf_page, device, ctm, mupdf.FzCookie())
+            mupdf.pdf_run_page_widgets(pdf_page, device, ctm, mupdf.FzCookie())
+        finally:
+            mupdf.fz_close_device(device)
+
+    def _drop_display_list(self, idx=None):
+        if idx is None:
+            self._display_lists.clear()
+        else:
+            self._display_lists.pop(idx, None)
+
+    def get_page_pixel_size(self, idx, zoom=1.0):
+        if not self.doc or not (0 <= idx < len(self.doc)):
+            return 0, 0
+        irect = (self.doc[idx].rect * fitz.Matrix(zoom, zoom)).irect
+        return irect.width, irect.height
+
+    def get_tile_pixmap(self, idx, zoom, tile_x, tile_y, tile_size):
+        if not self.doc or not (0 <= idx < len(self.doc)):
+            return None
+
+        key = self.render_cache_key(idx, zoom) + (tile_x, tile_y, tile_size)
+        pixmap = self.tile_cache.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        page = self.doc[idx]
+        # Tile bounds are in device pixels, clip is in (rotated) page coordinates
+        clip = fitz.Rect(
+            tile_x * tile_size / zoom, tile_y * tile_size / zoom,
+            (tile_x + 1) * tile_size / zoom, (tile_y + 1) * tile_size / zoom
+        ) & page.rect
+        if clip.is_empty:
+            return None
+
+        pixmap = self._render_page(idx, zoom, clip=clip)
+        self.tile_cache.put(key, pixmap)
+        return pixmap
+
+    #  Render Cache
+    def render_cache_key(self, idx, zoom):
+        # The layout version keeps a late render of a shifted page from landing on its new neighbour
+        return (idx, round(zoom, 4), self.doc[idx].rotation, self._page_revisions[idx], self._layout_version)
+
+    def is_page_cached(self, idx, zoom):
+        if not self.doc or not (0 <= idx < len(self.doc)):
+            return False
+        return self.page_cache.contains(self.render_cache_key(idx, zoom))
+
+    def get_render_cache_stats(self):
+        return self.page_cache.stats()
+
+    #  Text Layer
+    def get_page_textpage(self, idx):
+        # Returns (page, textpage); search_for and get_text need that same page object
+        entry = self.text_cache.get(idx)
+        if entry is None:
+            page = self.doc[idx]
+            entry = (page, page.get_textpage(flags=TEXTPAGE_FLAGS))
+            self.text_cache.put(idx, *entry)
+        return entry
+
+    def get_page_text(self, idx):
+        text = self.text_cache.get_text(idx)
+        if text is None:
+            _, textpage = self.get_page_textpage(idx)
+            text = textpage.extractText()
+        return text
+
+    def get_text_cache_stats(self):
+        return self.text_cache.stats()
+
+    #  Change Events
+    def add_change_listener(self, callback):
+        self.change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        if callback in self.change_listeners:
+            self.change_listeners.remove(callback)
+
+    def _emit_change(self, kind, indices):
+        self._modified = True
+        self._edit_count += 1
+        event = PageChange(kind, sorted(set(indices)))
+        for callback in list(self.change_listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in page change listener: {e}")
+
+    def _mark_page_modified(self, idx):
+        # Bumping the revision makes every cached render of the page stale
+        if 0 <= idx < len(self._page_revisions):
+            self._page_revisions[idx] += 1
+            self.text_cache.discard(idx)
+            self._emit_change(PAGES_MODIFIED, [idx])
+
+    def _mark_pages_rotated(self, indices):
+        self._rotated_sources.update(self._source_pages[i] for i in indices if self._source_pages[i] is not None)
+        self._emit_change(PAGES_ROTATED, indices)
+
+    def _mark_page_inserted(self, position):
+        if position == -1:
+            position = len(self._source_pages)
+        self._source_pages.insert(position, None)
+        self._page_revisions.insert(position, 0)
+        self._layout_version += 1
+        self._drop_display_list()
+        self.text_cache.clear()
+        # Page indices shifted, so cached renders can no longer be trusted
+        self.page_cache.clear()
+        self.tile_cache.clear()
+        self._emit_change(PAGES_INSERTED, [position])
+
+    def _mark_pages_removed(self, indices):
+        removed = sorted(i for i in set(indices) if 0 <= i < len(self._source_pages))
+        for i in reversed(removed):
+            del self._source_pages[i]
+            del self._page_revisions[i]
+        self._layout_version += 1
+        self._drop_display_list()
+        self.text_cache.clear()
+        self.page_cache.clear()
+        self.tile_cache.clear()
+        if removed:
+            self._emit_change(PAGES_REMOVED, removed)
+
+    def _reset_source_pages(self):
+        # The file on disk now matches the document page for page
+        count = len(self.doc) if self.doc else 0
+        self._source_pages = list(range(count))
+        self._page_revisions = [0] * count
+        self._layout_version += 1
+        self.source_version += 1
+        self._modified = False
+        self._rotated_sources = set()
+        self._search_snapshot = None
+        self._drop_display_list()
+        self.text_cache.clear()
+        self.search_index = None
+        self.fingerprint = document_fingerprint(self.file_path, self.doc)
+        self.page_cache.clear()
+        self.tile_cache.clear()
+
+    def get_render_job(self, idx, zoom):
+        # Workers render from their own handle on file_path, so only pages
+        # whose content still matches the file on disk can be handed out
+        if not self.doc or not self.file_path or not (0 <= idx < len(self.doc)):
+            return None
+        source_idx = self._source_pages[idx]
+        if source_idx is None or self._page_revisions[idx] != 0:
+            return None
+        return {
+            'key': self.render_cache_key(idx, zoom),
+            'path': self.file_path,
+            'source_version': self.source_version,
+            'source_page': source_idx,
+            'rotation': self.doc[idx].rotation,
+            'zoom': zoom,
+        }
+
+    def is_modified(self):
+        return self._modified
+
+    def get_dirty_pages(self):
+        # Pages that differ from the file: new, edited or rotated
+        if not self.doc:
+            return []
+        return [
+            i for i, source in enumerate(self._source_pages)
+            if source is None or self._page_revisions[i] != 0 or source in self._rotated_sources
+        ]
+
+    def can_edit(self):
+        return self.doc is not None and not self.saving
+
+    def create_render_source(self):
+        # Path other processes can open to see the document as it is now.
+        # Returns (path, is_temporary); unsaved edits go through a snapshot file.
+        if not self.doc:
+            return None, False
+        if self.file_path and not self._modified:
+            return self.file_path, False
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.doc.tobytes())
+        return path, True
+
+    def get_source_page_key(self, idx):
+        # (page in file, rotation) for pages whose content matches the file on disk
+        if not self.doc or not (0 <= idx < len(self.doc)):
+            return None
+        source_idx = self._source_pages[idx]
+        if source_idx is None or self._page_revisions[idx] != 0:
+            return None
+        return source_idx, self.doc[idx].rotation
+
+    def get_prefetch_job(self, idx, zoom):
+        job = self.get_render_job(idx, zoom)
+        if job is None or self.page_cache.contains(job['key']):
+            return None
+        return job
 
     def get_current_page(self):
         if not self.doc:
@@ -70,65 +362,69 @@ class PDFModel:
         return False
 
     #  Bookmark Management
-    def load_bookmarks(self):
-        if os.path.exists(self.bookmarks_file):
-            try:
-                with open(self.bookmarks_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading bookmarks: {e}")
-                return {}
-        return {}
+    def _bookmark_fingerprint(self, file_path):
+        if file_path == self.file_path:
+            return self.fingerprint
+        return document_fingerprint(file_path)
 
     def save_bookmark(self, file_path, page_num):
+        # Only recorded in memory; flush_bookmarks writes them out
         if not file_path:
             return False
-
-        try:
-            self.bookmarks[file_path] = page_num
-            with open(self.bookmarks_file, 'w', encoding='utf-8') as f:
-                json.dump(self.bookmarks, f, ensure_ascii=False, indent=2)
-            return True
-        except Exception as e:
-            print(f"Error saving bookmark: {e}")
-            return False
+        self.bookmarks.set(self._bookmark_fingerprint(file_path), os.path.abspath(file_path), page_num)
+        return True
 
     def get_bookmark(self, file_path):
+        return self.bookmarks.get(self._bookmark_fingerprint(file_path), os.path.abspath(file_path))
+
+    def get_session_state(self):
+        # View state saved for the open document: zoom, scroll offsets, view mode, ...
+        if not self.file_path:
+            return {}
+        return self.bookmarks.get_state(self.fingerprint, os.path.abspath(self.file_path))
+
+    def save_session_state(self, state):
+        if self.file_path:
+            self.bookmarks.set_state(self.fingerprint, os.path.abspath(self.file_path), state)
 
-        return self.bookmarks.get(file_path, 0)
+    def flush_bookmarks(self):
+        return self.bookmarks.flush()
 
     #  Page Rotation
     def rotate_current_page(self, rotation=90):
-        if not self.doc:
+        if not self.can_edit():
             return False
 
         try:
             page = self.doc[self.current_page]
             page.set_rotation(rotation)
+            self._mark_pages_rotated([self.current_page])
             return True
         except Exception as e:
             print(f"Error rotating page: {e}")
             return False
 
     def rotate_page_by_index(self, idx, rotation=90):
-        if not self.doc or not (0 <= idx < len(self.doc)):
+        if not self.can_edit() or not (0 <= idx < len(self.doc)):
             return False
 
         try:
             page = self.doc[idx]
             page.set_rotation(rotation)
+            self._mark_pages_rotated([idx])
             return True
         except Exception as e:
             print(f"Error rotating page: {e}")
             return False
 
     def rotate_all_pages(self, rotation=90):
-        if not self.doc:
+        if not self.can_edit():
             return False
 
         try:
             for page in self.doc:
                 page.set_rotation(rotation)
+            self._mark_pages_rotated(range(len(self.doc)))
             return True
         except Exception as e:
             print(f"Error rotating all pages: {e}")
@@ -149,25 +445,28 @@ class PDFModel:
 
     #  Page Operations
     def delete_current_page(self):
-        if self.doc and len(self.doc) > 1:
-            self.doc.delete_page(self.current_page)
+        if self.can_edit() and len(self.doc) > 1:
+            deleted = self.current_page
+            self.doc.delete_page(deleted)
+            self._mark_pages_removed([deleted])
             if self.current_page >= len(self.doc):
                 self.current_page = len(self.doc) - 1
             return True
         return False
 
     def delete_pages(self, indices):
-        if not self.doc:
+        if not self.can_edit():
             return False
         for i in sorted(set(indices), reverse=True):
             if 0 <= i < len(self.doc):
                 self.doc.delete_page(i)
+        self._mark_pages_removed([i for i in indices if 0 <= i < len(self._source_pages)])
         if self.current_page >= len(self.doc):
             self.current_page = max(0, len(self.doc) - 1)
         return True
 
     def add_new_page(self, position=-1):
-        if not self.doc:
+        if not self.can_edit():
             return False
 
         try:
@@ -175,17 +474,19 @@ class PDFModel:
                 self.doc.new_page()
             else:
                 self.doc.new_page(pno=position)
+            self._mark_page_inserted(position)
             return True
         except Exception as e:
             print(f"Error adding page: {e}")
             return False
 
     def insert_page_after_current(self):
-        if not self.doc:
+        if not self.can_edit():
             return False
 
         try:
             self.doc.new_page(pno=self.current_page + 1)
+            self._mark_page_inserted(self.current_page + 1)
             self.current_page += 1
             return True
         except Exception as e:
@@ -193,11 +494,12 @@ class PDFModel:
             return False
 
     def insert_page_before_current(self):
-        if not self.doc:
+        if not self.can_edit():
             return False
 
         try:
             self.doc.new_page(pno=self.current_page)
+            self._mark_page_inserted(self.current_page)
             return True
         except Exception as e:
             print(f"Error inserting page: {e}")
@@ -205,7 +507,7 @@ class PDFModel:
 
     #  Annotation Operations
     def add_highlight_annotation(self, rect, color=(1, 1, 0), opacity=0.4):
-        if not self.doc:
+        if not self.can_edit():
             return None
 
         page = self.doc[self.current_page]
@@ -214,13 +516,14 @@ class PDFModel:
             annot.set_colors(stroke=None, fill=color)
             annot.set_opacity(opacity)
             annot.update()
+            self._mark_page_modified(self.current_page)
             return annot
         except Exception as e:
             print(f"Error adding highlight: {e}")
             return None
 
     def add_underline_annotation(self, rect, color=(0, 0, 1)):
-        if not self.doc:
+        if not self.can_edit():
             return None
 
         page = self.doc[self.current_page]
@@ -228,13 +531,14 @@ class PDFModel:
             annot = page.add_underline_annot(rect)
             annot.set_colors(stroke=color)
             annot.update()
+            self._mark_page_modified(self.current_page)
             return annot
         except Exception as e:
             print(f"Error adding underline: {e}")
             return None
 
     def add_strikeout_annotation(self, rect, color=(1, 0, 0)):
-        if not self.doc:
+        if not self.can_edit():
             return None
 
         page = self.doc[self.current_page]
@@ -242,13 +546,14 @@ class PDFModel:
             annot = page.add_strikeout_annot(rect)
             annot.set_colors(stroke=color)
             annot.update()
+            self._mark_page_modified(self.current_page)
             return annot
         except Exception as e:
             print(f"Error adding strikeout: {e}")
             return None
 
     def add_text_annotation(self, rect, text, icon="Note", color=(1, 0.8, 0), opacity=0.9):
-        if not self.doc:
+        if not self.can_edit():
             return None
 
         page = self.doc[self.current_page]
@@ -258,13 +563,14 @@ class PDFModel:
             annot.set_colors(stroke=color)
             annot.set_opacity(opacity)
             annot.update()
+            self._mark_page_modified(self.current_page)
             return annot
         except Exception as e:
             print(f"Error adding text annotation: {e}")
             return None
 
     def add_freetext(self, rect, text, fontsize=12, color=(0, 0, 0), bg_color=(1, 1, 1), border_width=1):
-        if not self.doc:
+        if not self.can_edit():
             return None
 
         page = self.doc[self.current_page]
@@ -281,13 +587,14 @@ class PDFModel:
             else:
                 annot.set_border(width=0)
             annot.update()
+            self._mark_page_modified(self.current_page)
             return annot
         except Exception as e:
             print(f"Error adding freetext: {e}")
             return None
 
     def remove_text_in_rect(self, rect, color=(1, 1, 1)):
-        if not self.doc:
+        if not self.can_edit():
             return None
 
         page = self.doc[self.current_page]
@@ -295,6 +602,9 @@ class PDFModel:
             annot = page.add_redact_annot(rect, fill=color)
             annot.update()
             page.apply_redactions(images=fitz.PDF_REDACT_IMAGE_NONE)
+            # Redaction rewrites the content stream itself
+            self._drop_display_list(self.current_page)
+            self._mark_page_modified(self.current_page)
             return annot
         except Exception as e:
             print(f"Error removing text (trying fallback method): {e}")
@@ -304,6 +614,7 @@ class PDFModel:
                 annot.set_colors(stroke=color, fill=color)
                 annot.set_opacity(1.0)
                 annot.update()
+                self._mark_page_modified(self.current_page)
                 return annot
             except Exception as e2:
                 print(f"Error in fallback method: {e2}")
@@ -311,7 +622,7 @@ class PDFModel:
 
     #  Erase Annotation Operations
     def erase_annotations_in_rect(self, rect):
-        if not self.doc:
+        if not self.can_edit():
             return 0
 
         page = self.doc[self.current_page]
@@ -333,7 +644,7 @@ class PDFModel:
                 annot = next_annot
 
             if removed_count > 0:
-                page.update()
+                self._mark_page_modified(self.current_page)
 
         except Exception as e:
             print(f"Error in erase_annotations_in_rect: {e}")
@@ -341,7 +652,7 @@ class PDFModel:
         return removed_count
 
     def erase_annotation_at_point(self, point):
-        if not self.doc:
+        if not self.can_edit():
             return False
 
         page = self.doc[self.current_page]
@@ -354,7 +665,7 @@ class PDFModel:
 
                 if rect.contains(point):
                     page.delete_annot(annot)
-                    page.update()
+                    self._mark_page_modified(self.current_page)
                     return True
 
                 annot = next_annot
@@ -395,7 +706,7 @@ class PDFModel:
         return annotations
 
     def clear_all_annotations_on_page(self):
-        if not self.doc:
+        if not self.can_edit():
             return 0
 
         page = self.doc[self.current_page]
@@ -413,7 +724,7 @@ class PDFModel:
                 annot = next_annot
 
             if removed_count > 0:
-                page.update()
+                self._mark_page_modified(self.current_page)
 
         except Exception as e:
             print(f"Error clearing all annotations: {e}")
@@ -421,39 +732,62 @@ class PDFModel:
         return removed_count
 
     #  Text Extraction
-    def get_text_regions(self):
+    def get_text_regions(self, words=False):
+        # Rects are returned in displayed (rotated) page coordinates, per block or per word
         if not self.doc:
             return [], None
 
-        page = self.doc[self.current_page]
         try:
-            textpage = page.get_textpage()
-            blocks = textpage.extractBLOCKS()
-            text_rects = [fitz.Rect(b[:4]) for b in blocks if len(b) >= 5]
+            page, textpage = self.get_page_textpage(self.current_page)
+            entries = textpage.extractWORDS() if words else textpage.extractBLOCKS()
+            rotation = page.rotation_matrix
+            text_rects = [fitz.Rect(e[:4]) * rotation for e in entries if len(e) >= 5]
             return text_rects, page.rect
         except Exception as e:
             print(f"Error extracting text regions: {e}")
             return [], None
 
+    #  Search Index
+    def get_search_index_dir(self):
+        # Indexes are kept next to the bookmarks file
+        return os.path.join(os.path.dirname(os.path.abspath(self.bookmarks_file)), SEARCH_INDEX_DIR)
+
+    def set_search_index(self, index):
+        if index is None or index.fingerprint != self.fingerprint:
+            return False
+        self.search_index = index
+        return True
+
+    def get_search_candidates(self, search_text, options=PLAIN_SEARCH):
+        # Pages worth running search_for on; pages edited since the index was
+        # built are always included. The index holds casefolded words, so it
+        # cannot narrow regex or accent-folded queries.
+        if not self.doc:
+            return []
+        pages = range(len(self.doc))
+        if self.search_index is None or options.regex or options.ignore_accents:
+            return list(pages)
+        candidates = self.search_index.candidate_pages(search_text)
+        if candidates is None:
+            return list(pages)
+        return [
+            i for i in pages
+            if self._source_pages[i] is None or self._page_revisions[i] != 0
+            or self._source_pages[i] in candidates
+        ]
+
     #  Search Operations
     def search_text(self, search_text):
         if not self.doc:
             return []
 
-        self.clear_search()
-        self.last_search_text = search_text
+        self.clear_search(search_text)
 
-        for page_num in range(len(self.doc)):
-            page = self.doc[page_num]
+        for page_num in self.get_search_candidates(search_text):
             try:
-                instances = page.search_for(search_text)
-                for rect in instances:
-                    self.search_results.append({
-                        'page': page_num,
-                        'rect': rect,
-                        'text': search_text,
-                        'annot': None
-                    })
+                page, textpage = self.get_page_textpage(page_num)
+                instances = page.search_for(search_text, textpage=textpage)
+                self.search_results.add_page(page_num, instances)
             except Exception as e:
                 print(f"Error searching page {page_num}: {e}")
 
@@ -462,6 +796,81 @@ class PDFModel:
 
         return self.search_results
 
+    def begin_search(self, search_text, workers=1, options=PLAIN_SEARCH):
+        # Job for a background scan: its own source and the pages to scan,
+        # starting at the current page so nearby hits come first. Large
+        # literal scans may be split across up to `workers` processes.
+        if not self.doc:
+            self.clear_search(search_text)
+            return None
+        unsaved = not self.file_path or self._modified
+        source_key = self.get_search_source_key()
+        pages = self.get_refined_pages(search_text, options, source_key)
+        self.clear_search(search_text)
+        if pages is None:
+            pages = self.get_search_candidates(search_text, options)
+        self._running_search = (search_text, options, source_key)
+        start = bisect_left(pages, self.current_page)
+        if options != PLAIN_SEARCH or len(pages) < PARALLEL_SEARCH_MIN_PAGES:
+            workers = 1
+        return {
+            'text': search_text,
+            'options': options,
+            'pages': pages[start:] + pages[:start],
+            'path': None if unsaved else self.file_path,
+            'stream': self._search_stream(source_key) if unsaved else None,
+            'source_key': source_key,
+            'workers': workers,
+        }
+
+    def get_search_source_key(self):
+        # Same key while neither the file nor the unsaved edits change
+        unsaved = not self.file_path or self._modified
+        return (self.file_path, self.source_version, self._edit_count if unsaved else 0)
+
+    def add_page_texts(self, source_key, texts):
+        # Plain text a background search extracted, so extraction right after it reuses it
+        if not self.doc or source_key != self.get_search_source_key():
+            return False
+        for page_num, text in texts.items():
+            if 0 <= page_num < len(self.doc):
+                self.text_cache.put_text(page_num, text)
+        return True
+
+    def get_refined_pages(self, search_text, options, source_key):
+        # When search_text extends the last completed query, its hits can only be on
+        # pages that query hit. Not so for regexes or whole words ("the" -> "them").
+        if self._finished_search is None or options.regex or options.whole_word:
+            return None
+        text, finished_options, finished_key = self._finished_search
+        if finished_options != options or finished_key != source_key or not search_text.startswith(text):
+            return None
+        return list(dict.fromkeys(self.search_results.pages))
+
+    def finish_search(self, completed):
+        # Only a scan that covered all its pages can seed a refinement
+        self._finished_search = self._running_search if completed else None
+        self._running_search = None
+
+    def _search_stream(self, source_key):
+        # Snapshot of the unsaved document, reused until it changes again
+        if self._search_snapshot is None or self._search_snapshot[0] != source_key:
+            self._search_snapshot = (source_key, self.doc.tobytes())
+        return self._search_snapshot[1]
+
+    def add_search_results(self, page_num, hits):
+        # Streamed hits of one page, inserted in page order; returns True for the first hits.
+        # A hit is a fitz.Rect from search_for or a list of line rects from the search engine.
+        if not hits:
+            return False
+        pos = self.search_results.add_page(page_num, hits)
+        if self.current_search_index < 0:
+            self.current_search_index = pos
+            return True
+        if pos <= self.current_search_index:
+            self.current_search_index += len(hits)
+        return False
+
     def get_search_result_count(self):
         return len(self.search_results)
 
@@ -474,10 +883,6 @@ class PDFModel:
         if not self.search_results:
             return None
 
-        if 0 <= self.current_search_index < len(self.search_results):
-            old_match = self.search_results[self.current_search_index]
-            self._delete_annotation(old_match)
-
         self.current_search_index = (self.current_search_index + 1) % len(self.search_results)
         return self.search_results[self.current_search_index]
 
@@ -485,78 +890,102 @@ class PDFModel:
         if not self.search_results:
             return None
 
-        if 0 <= self.current_search_index < len(self.search_results):
-            old_match = self.search_results[self.current_search_index]
-            self._delete_annotation(old_match)
-
         self.current_search_index = (self.current_search_index - 1) % len(self.search_results)
         return self.search_results[self.current_search_index]
 
-    def highlight_search_match(self, match):
-        if not match or match['page'] >= len(self.doc):
-            return None
-
-        page = self.doc[match['page']]
-        try:
-            if match.get('annot'):
-                self._delete_annotation(match)
-
-            annot = page.add_highlight_annot(match['rect'])
-            annot.set_colors(fill=(0, 1, 0))
-            annot.set_opacity(0.4)
-            annot.update()
+    def get_page_search_rects(self, page_num):
+        # Highlighting is done by the view's overlay; the document is never touched
+        return self.search_results.page_line_rects(page_num)
 
-            match['annot'] = annot
-            return annot
-        except Exception as e:
-            print(f"Error highlighting match: {e}")
-            return None
-
-    def clear_search_highlights(self):
-        for match in self.search_results:
-            self._delete_annotation(match)
-
-    def clear_search(self):
-        self.clear_search_highlights()
-        self.search_results = []
+    def clear_search(self, search_text=""):
+        self.search_results = SearchResults(search_text)
         self.current_search_index = -1
-        self.last_search_text = ""
-
-    def _delete_annotation(self, match):
-        if match.get('annot'):
-            try:
-                page = self.doc[match['page']]
-                page.delete_annot(match['annot'])
-                match['annot'] = None
-            except:
-                pass
-
-    def save(self):
-        if not self.doc or not self.file_path:
+        self.last_search_text = search_text
+        self._running_search = None
+        self._finished_search = None
+
+    def needs_save(self, new_path=None):
+        # Save As always writes; Save only when something changed since the file was read
+        return bool(self.doc) and (new_path is not None or not self.file_path or self._modified)
+
+    def begin_save(self, new_path=None, profile=None):
+        # Job for a background writer: a snapshot of the document, where it goes and
+        # the save profile (SAVE_PROFILE for Save, SAVE_AS_PROFILE for Save As by default).
+        # Edits are refused from here until finish_save. None when there is nothing to do.
+        target = new_path or self.file_path
+        if not self.doc or not target or self.saving or not self.needs_save(new_path):
+            return None
+        profile = profile or (SAVE_AS_PROFILE if new_path else SAVE_PROFILE)
+        get_profile(profile)  # an unknown name raises before anything is snapshotted
+        if self.doc.needs_pass and needs_rewrite(profile):
+            # Rewriting profiles reopen the snapshot, which the writer cannot do
+            # without the password; the bytes are written as they are instead
+            profile = 'fast'
+        if new_path and not new_path.lower().endswith(".pdf"):
+            target += ".pdf"
+        started = time.perf_counter()
+        data = self.doc.tobytes(encryption=fitz.PDF_ENCRYPT_KEEP)
+        input_bytes = os.path.getsize(self.file_path) if self.file_path and os.path.exists(self.file_path) else len(data)
+        self.saving = True
+        return {
+            'target': os.path.abspath(target),
+            'data': data,
+            'profile': profile,
+            'dirty_pages': len(self.get_dirty_pages()),
+            'input_bytes': input_bytes,
+            'output_bytes': None,
+            'started': started,
+        }
+
+    def finish_save(self, job, ok):
+        # The document is reopened from the written file so memory matches disk again.
+        # If that fails the open document is kept as it is, still unsaved, and
+        # job['error'] says why.
+        self.saving = False
+        if not ok:
             return False
         try:
-            self.doc.save(self.file_path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
-            print(f"Saved to: {self.file_path}")
-            return True
+            doc = fitz.open(job['target'])
+            output_bytes = job['output_bytes'] if job['output_bytes'] is not None else os.path.getsize(job['target'])
         except Exception as e:
-            print(f"Error saving: {e}")
+            print(f"Error reopening {job['target']} after saving: {e}")
+            job['error'] = f"The file was written but cannot be read back: {e}"
             return False
+        if doc.needs_pass:
+            # Cannot be reopened without the password; the open document is the same content
+            doc.close()
+        else:
+            self.doc.close()
+            self.doc = doc
+        self.file_path = job['target']
+        self._reset_source_pages()
+        self.current_page = min(self.current_page, len(self.doc) - 1)
+        self.last_save_report = save_report(job['profile'], job['input_bytes'], output_bytes,
+                                            time.perf_counter() - job['started'])
+        print(f"Saved to: {self.file_path} ({format_report(self.last_save_report)})")
+        return True
 
-    def save_as(self, new_path):
-        if not self.doc or not new_path:
+    def save(self, profile=None):
+        if not self.doc or not self.file_path:
             return False
+        return self._save_now(self.begin_save(profile=profile))
 
-        if not new_path.lower().endswith(".pdf"):
-            new_path += ".pdf"
+    def save_as(self, new_path, profile=None):
+        if not self.doc or not new_path:
+            return False
+        return self._save_now(self.begin_save(new_path, profile))
 
+    def _save_now(self, job):
+        # Same steps as a background save, on the calling thread
+        if job is None:
+            return not self.saving
         try:
-            self.doc.save(new_path, garbage=4, deflate=True, clean=True)
-            self.file_path = new_path
-            print(f"Saved to: {new_path}")
-            return True
+            job['output_bytes'] = write_snapshot(job['data'], job['target'], job['profile'])
+            ok = True
         except Exception as e:
-            print(f"Error saving as: {e}")
-            return False
+            print(f"Error saving: {e}")
+            ok = False
+        return self.finish_save(job, ok)
 
     #  Export to PDF (specific pages)
     def export_pages(self, page_indices, output_path):
@@ -597,9 +1026,9 @@ class PDFModel:
         if not self.doc:
             return ""
 
-        page = self.doc[self.current_page]
         try:
-            text = page.get_text("text", clip=rect)
+            _, textpage = self.get_page_textpage(self.current_page)
+            text = textpage.extractTextbox(rect)
             return text.strip()
         except Exception as e:
             print(f"Error extracting text: {e}")
@@ -614,8 +1043,7 @@ class PDFModel:
             return ""
 
         try:
-            page = self.doc[page_num]
-            text = page.get_text("text")
+            text = self.get_page_text(page_num)
             return text.strip()
         except Exception as e:
             print(f"Error extracting text from page {page_num}: {e}")
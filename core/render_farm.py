@@ -0,0 +1,189 @@
+import argparse
+import os
+import queue
+import weakref
+from multiprocessing import shared_memory
+
+import pymupdf as fitz
+from core.document_pool import DocumentPool, worker_cancelled, worker_document
+
+
+def _create_shared_memory(size):
+    # The parent owns the block's lifetime, so the worker must not track it
+    try:
+        return shared_memory.SharedMemory(create=True, size=size, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+
+def _render_task(args):
+    page_index, zoom, alpha = args
+    if worker_cancelled():
+        return page_index, None
+
+    page = worker_document()[page_index]
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=alpha, annots=True)
+    samples = pix.samples_mv
+    shm = _create_shared_memory(max(1, len(samples)))
+    shm.buf[:len(samples)] = samples
+    info = (shm.name, pix.width, pix.height, pix.stride, pix.n)
+    shm.close()
+    return page_index, info
+
+
+class RenderedPage:
+    """Pixmap bytes of one page, living in shared memory until release()."""
+
+    def __init__(self, page, name, width, height, stride, n):
+        self.page = page
+        self.width = width
+        self.height = height
+        self.stride = stride
+        self.n = n
+        self._shm = shared_memory.SharedMemory(name=name)
+        self.samples = self._shm.buf[:stride * height]
+
+    def tobytes(self):
+        return bytes(self.samples)
+
+    def release(self):
+        if self._shm is None:
+            return
+        self.samples.release()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _release_result(result):
+    # Unlinks the block of a page nobody will take any more
+    if result is None or result[1] is None:
+        return
+    try:
+        RenderedPage(result[0], *result[1]).release()
+    except Exception as e:
+        print(f"Error releasing rendered page {result[0]}: {e}")
+
+
+class RenderFarm(DocumentPool):
+    """Rasterizes pages of one PDF file across worker processes.
+
+    At most max_in_flight pages (2 per worker by default) are rendering,
+    waiting in shared memory or in the caller's hands at any time, so a slow
+    consumer holds back the workers instead of letting every page pile up.
+    """
+
+    def __init__(self, path, workers=None, max_in_flight=None):
+        super().__init__(path, workers)
+        self.max_in_flight = max(1, max_in_flight or 2 * self.workers)
+        self._renders = weakref.WeakSet()  # open render() generators, closed by close()
+
+    def render(self, page_indices, zoom=1.0, alpha=False, ordered=True):
+        """Yield a RenderedPage per page; the caller releases each one.
+
+        If the caller stops early (break, exception, close()), the pages still
+        in flight are cancelled and their shared memory is unlinked, together
+        with the page handed out last.
+        """
+        self.start()
+        self._cancel.clear()
+        renders = self._render(list(page_indices), zoom, alpha, ordered)
+        self._renders.add(renders)
+        return renders
+
+    def _render(self, pages, zoom, alpha, ordered):
+        results = queue.Queue()  # (task number, result, error), filled by the pool's callbacks
+        submitted = taken = 0
+        arrived = {}  # task number -> (result, error), results waiting for their turn when ordered
+        rendered = None
+        completed = False
+
+        def submit():
+            nonlocal submitted
+            while submitted < len(pages) and submitted - taken < self.max_in_flight:
+                n = submitted
+                self._pool.apply_async(
+                    _render_task, ((pages[n], zoom, alpha),),
+                    callback=lambda result, n=n: results.put((n, result, None)),
+                    error_callback=lambda error, n=n: results.put((n, None, error)),
+                )
+                submitted += 1
+
+        try:
+            while taken < len(pages):
+                # Refilled only once the caller is done with the page handed out last
+                submit()
+                if ordered:
+                    while taken not in arrived:
+                        n, result, error = results.get()
+                        arrived[n] = (result, error)
+                    result, error = arrived.pop(taken)
+                else:
+                    _, result, error = results.get()
+                taken += 1
+                if error is not None:
+                    raise error
+                page_index, info = result
+                if info is None:
+                    continue
+                rendered = RenderedPage(page_index, *info)
+                if self._cancel.is_set():
+                    # Drain pages finished before the cancel so no block is leaked
+                    rendered.release()
+                    rendered = None
+                    continue
+                yield rendered
+                rendered = None
+            completed = True
+        finally:
+            if not completed:
+                self._cancel.set()
+                if rendered is not None:
+                    rendered.release()
+                # Tasks still running return at once now that the farm is cancelled
+                for result, _ in arrived.values():
+                    _release_result(result)
+                for _ in range(submitted - taken - len(arrived)):
+                    _, result, _ = results.get()
+                    _release_result(result)
+
+    def close(self):
+        for renders in list(self._renders):
+            renders.close()
+        super().close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render PDF pages to PNG files on several processes")
+    parser.add_argument("pdf")
+    parser.add_argument("output_dir")
+    parser.add_argument("--zoom", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    with fitz.open(args.pdf) as doc:
+        page_count = len(doc)
+
+    with RenderFarm(args.pdf, args.workers) as farm:
+        for rendered in farm.render(range(page_count), zoom=args.zoom, ordered=False):
+            with rendered:
+                pix = fitz.Pixmap(fitz.csRGB, rendered.width, rendered.height, rendered.tobytes(), False)
+                pix.save(os.path.join(args.output_dir, f"page_{rendered.page + 1:05d}.png"))
+    print(f"Rendered {page_count} pages to: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
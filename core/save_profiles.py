@@ -0,0 +1,117 @@
+import argparse
+import os
+import sys
+import time
+
+import pymupdf as fitz
+
+IMAGE_DPI_THRESHOLD = 200
+IMAGE_DPI_TARGET = 150
+IMAGE_QUALITY = 75
+
+# Named trade-offs between save speed and file size:
+#   fast      the document as it is in memory: no garbage collection, no clean
+#             pass, streams left as they are
+#   balanced  unused objects dropped, duplicates merged, streams deflated and
+#             content streams cleaned; what Save As always did
+#   smallest  balanced plus object streams, font subsetting and images above
+#             IMAGE_DPI_THRESHOLD resampled to IMAGE_DPI_TARGET
+SAVE_PROFILES = {
+    'fast': {},
+    'balanced': {
+        'options': {'garbage': 4, 'deflate': True, 'clean': True},
+    },
+    'smallest': {
+        'options': {'garbage': 4, 'deflate': True, 'clean': True, 'use_objstms': True},
+        'subset_fonts': True,
+        'images': {'dpi_threshold': IMAGE_DPI_THRESHOLD, 'dpi_target': IMAGE_DPI_TARGET, 'quality': IMAGE_QUALITY},
+    },
+}
+SAVE_PROFILE = 'fast'  # default for Save, which rewrites the open file
+SAVE_AS_PROFILE = 'balanced'  # default for Save As
+
+
+def get_profile(name):
+    try:
+        return SAVE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown save profile: {name} (choose from {', '.join(SAVE_PROFILES)})") from None
+
+
+def needs_rewrite(name):
+    # fast writes the snapshot bytes unchanged; every other profile reopens and saves them
+    return bool(get_profile(name))
+
+
+def apply_profile(doc, name, path, stage=None):
+    """Save doc to path with the profile's options, after its in-place steps."""
+    profile = get_profile(name)
+    if profile.get('images'):
+        if stage:
+            stage("images")
+        doc.rewrite_images(**profile['images'])
+    if profile.get('subset_fonts'):
+        if stage:
+            stage("fonts")
+        doc.subset_fonts()
+    if stage:
+        stage("compress")
+    doc.save(path, encryption=fitz.PDF_ENCRYPT_KEEP, **profile.get('options', {}))
+
+
+def save_report(profile, input_bytes, output_bytes, elapsed):
+    return {'profile': profile, 'input_bytes': input_bytes, 'output_bytes': output_bytes, 'elapsed': elapsed}
+
+
+def format_report(report):
+    ratio = report['output_bytes'] / report['input_bytes'] * 100 if report['input_bytes'] else 100.0
+    return (f"{report['profile']}: {_format_size(report['input_bytes'])} -> {_format_size(report['output_bytes'])} "
+            f"({ratio:.0f}%) in {report['elapsed']:.2f} s")
+
+
+def _format_size(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def main(argv=None):
+    # python -m core.save_profiles [--profile NAME] [--out FOLDER] FILE...
+    from core.atomic_save import write_snapshot
+
+    parser = argparse.ArgumentParser(prog="python -m core.save_profiles",
+                                     description="Rewrite PDFs with a save profile")
+    parser.add_argument("--profile", choices=list(SAVE_PROFILES), default=SAVE_AS_PROFILE)
+    parser.add_argument("--out", help="write to this folder instead of replacing the files")
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+
+    total_in = total_out = failed = 0
+    started = time.perf_counter()
+    for path in args.files:
+        target = os.path.join(args.out, os.path.basename(path)) if args.out else path
+        try:
+            t0 = time.perf_counter()
+            with open(path, 'rb') as f:
+                data = f.read()
+            write_snapshot(data, target, args.profile)
+            report = save_report(args.profile, len(data), os.path.getsize(target), time.perf_counter() - t0)
+        except Exception as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        total_in += report['input_bytes']
+        total_out += report['output_bytes']
+        print(f"{path}: {format_report(report)}")
+    if len(args.files) > 1:
+        print(format_report(save_report(f"{args.profile}, {len(args.files) - failed} files",
+                                        total_in, total_out, time.perf_counter() - started)))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
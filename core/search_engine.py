@@ -0,0 +1,219 @@
+from array import array
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
+import re
+import threading
+import unicodedata
+import pymupdf as fitz
+from core.text_cache import TEXTPAGE_FLAGS
+
+DEFAULT_LAYER_CHARS = 8 * 1024 * 1024  # character layers kept, about 16 bytes of boxes per char
+
+SearchOptions = namedtuple(
+    'SearchOptions', ['regex', 'match_case', 'whole_word', 'ignore_accents'],
+    defaults=(False, False, False, False)
+)
+PLAIN_SEARCH = SearchOptions()
+
+# Letters whose accent is a stroke rather than a combining mark, so NFKD keeps it
+_STROKE_FOLDS = {
+    'đ': 'd', 'Đ': 'D', 'ø': 'o', 'Ø': 'O', 'ł': 'l', 'Ł': 'L', 'ħ': 'h', 'Ħ': 'H',
+}
+_STROKE_TABLE = str.maketrans(_STROKE_FOLDS)
+
+
+def fold_strokes(text):
+    """text with stroke letters replaced, the part of folding NFKD-based tools miss."""
+    return text.translate(_STROKE_TABLE)
+
+
+def fold_char(c):
+    folded = _STROKE_FOLDS.get(c)
+    if folded is not None:
+        return folded
+    return ''.join(ch for ch in unicodedata.normalize('NFKD', c) if not unicodedata.combining(ch))
+
+
+class _FoldTable(dict):
+    # str.translate table filled on first sight of each code point
+    def __init__(self):
+        super().__init__()
+        self.uneven = set()  # chars folding to other than exactly one char
+
+    def __missing__(self, code):
+        folded = fold_char(chr(code))
+        if len(folded) != 1:
+            self.uneven.add(chr(code))
+        self[code] = folded
+        return folded
+
+
+_fold_table = _FoldTable()
+
+
+def fold_accents(text):
+    """Accent-folded copy of text, and for each folded char the index of its source char.
+
+    The index map is None when every char folded to exactly one char.
+    """
+    if text.isascii():
+        return text, None
+    folded = text.translate(_fold_table)
+    if not any(c in text for c in _fold_table.uneven):
+        return folded, None
+    origin = array('I')
+    for i, c in enumerate(text):
+        origin.extend([i] * len(_fold_table[ord(c)]))
+    return folded, origin
+
+
+@lru_cache(maxsize=64)
+def compile_query(query, options):
+    """Compiled pattern for query under options; raises re.error for a bad regex."""
+    if options.ignore_accents:
+        query = fold_accents(query)[0]
+    if options.regex:
+        pattern = query
+    else:
+        # Spaces in a literal query match any run of whitespace, line breaks included
+        pattern = r'\s+'.join(re.escape(part) for part in query.split())
+    if options.whole_word:
+        pattern = rf'(?<!\w)(?:{pattern})(?!\w)'
+    return re.compile(pattern, 0 if options.match_case else re.IGNORECASE)
+
+
+class PageTextLayer:
+    """Characters of one page in reading order, with a box per character.
+
+    Lines are separated by '\\n'. boxes holds x0, y0, x1, y1 of every
+    character in unrotated page coordinates, zeros for the separators.
+    """
+
+    def __init__(self, text, boxes):
+        self.text = text
+        self.boxes = boxes
+        self._folded = None
+
+    @classmethod
+    def from_textpage(cls, textpage):
+        chars = []
+        boxes = array('f')
+        for block in textpage.extractRAWDICT()['blocks']:
+            for line in block.get('lines', ()):
+                for span in line['spans']:
+                    for ch in span['chars']:
+                        chars.append(ch['c'])
+                        boxes.extend(ch['bbox'])
+                chars.append('\n')
+                boxes.extend((0, 0, 0, 0))
+        return cls(''.join(chars), boxes)
+
+    def __len__(self):
+        return len(self.text)
+
+    def folded(self):
+        if self._folded is None:
+            self._folded = fold_accents(self.text)
+        return self._folded
+
+    def find(self, pattern, ignore_accents=False):
+        """Line rects of every match of pattern, one list of (x0, y0, x1, y1) per match.
+
+        Plain tuples rather than fitz objects: a broad regex can match tens of
+        thousands of times and building fitz objects would cost more than the scan.
+        """
+        text, origin = self.folded() if ignore_accents else (self.text, None)
+        matches = []
+        for m in pattern.finditer(text):
+            start, end = m.span()
+            if start == end:
+                continue
+            if origin is not None:
+                start, end = origin[start], origin[end - 1] + 1
+            rects = self.line_rects(start, end)
+            if rects:
+                matches.append(rects)
+        return matches
+
+    def line_rects(self, start, end):
+        # One rect per line the character range touches, bounds taken over array slices
+        rects = []
+        boxes = self.boxes
+        while start < end:
+            stop = self.text.find('\n', start, end)
+            if stop == -1:
+                stop = end
+            if stop > start:
+                k0, k1 = 4 * start, 4 * stop
+                rects.append((
+                    min(boxes[k0:k1:4]), min(boxes[k0 + 1:k1:4]),
+                    max(boxes[k0 + 2:k1:4]), max(boxes[k0 + 3:k1:4])
+                ))
+            start = stop + 1
+        return rects
+
+
+class SearchEngine:
+    """Regex and folded search over cached character layers of one document.
+
+    The engine owns its own fitz handle; callers hold `lock` while using it,
+    so one search thread at a time works on it.
+    """
+
+    def __init__(self, max_chars=DEFAULT_LAYER_CHARS):
+        self.lock = threading.Lock()
+        self.max_chars = max_chars
+        self.current_chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.doc = None
+        self.source_key = None
+        self._layers = OrderedDict()  # page number -> PageTextLayer
+
+    def open(self, source_key, path=None, stream=None):
+        # Layers are kept while the source stays the same
+        if self.doc is not None and source_key is not None and source_key == self.source_key:
+            return
+        self.close()
+        self.doc = fitz.open(path) if path else fitz.open(stream=stream, filetype="pdf")
+        self.source_key = source_key
+
+    def page_layer(self, page_num, texts=None):
+        # Pages extracted here also put their plain text in texts, when given
+        layer = self._layers.get(page_num)
+        if layer is not None:
+            self._layers.move_to_end(page_num)
+            self.hits += 1
+            return layer
+        self.misses += 1
+        textpage = self.doc[page_num].get_textpage(flags=TEXTPAGE_FLAGS)
+        layer = PageTextLayer.from_textpage(textpage)
+        if texts is not None:
+            texts[page_num] = textpage.extractText()
+        if len(layer) <= self.max_chars:
+            self._layers[page_num] = layer
+            self.current_chars += len(layer)
+            while self.current_chars > self.max_chars:
+                _, evicted = self._layers.popitem(last=False)
+                self.current_chars -= len(evicted)
+        return layer
+
+    def search_page(self, page_num, pattern, options, texts=None):
+        return self.page_layer(page_num, texts).find(pattern, options.ignore_accents)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'pages': len(self._layers),
+            'chars': self.current_chars,
+            'max_chars': self.max_chars,
+        }
+
+    def close(self):
+        self._layers.clear()
+        self.current_chars = 0
+        if self.doc is not None:
+            self.doc.close()
+            self.doc = None
+        self.source_key = None
@@ -0,0 +1,129 @@
+from array import array
+import gzip
+import json
+import os
+import pymupdf as fitz
+from core.text_cache import TEXTPAGE_FLAGS
+
+SEARCH_INDEX_VERSION = 2
+SEARCH_INDEX_DIR = "pdf_search_index"
+MAX_INDEX_FILES = 100  # oldest index files beyond this are deleted on save
+
+
+def normalize_token(text):
+    return text.casefold()
+
+
+def query_tokens(query):
+    return [normalize_token(t) for t in query.split()]
+
+
+def index_path(directory, fingerprint):
+    return os.path.join(directory, f"{fingerprint}.json.gz")
+
+
+class SearchIndex:
+    """Inverted index of the words of one PDF file.
+
+    postings maps a normalized token to the ascending array of pages it
+    occurs on. The index only narrows a search down to candidate pages;
+    hits and their rects come from searching those pages. Page numbers
+    are pages of the file the index was built from.
+    """
+
+    def __init__(self, fingerprint, page_count):
+        self.fingerprint = fingerprint
+        self.page_count = page_count
+        self.postings = {}
+        self._match_cache = {}
+
+    @classmethod
+    def build(cls, path, fingerprint, cancelled=None, progress=None):
+        """Index every page of path; returns None when cancelled() turns true."""
+        with fitz.open(path) as doc:
+            index = cls(fingerprint, len(doc))
+            for page_num in range(len(doc)):
+                if cancelled and cancelled():
+                    return None
+                words = doc[page_num].get_text("words", flags=TEXTPAGE_FLAGS)
+                index.add_page(page_num, words)
+                if progress:
+                    progress(page_num + 1, len(doc))
+        return index
+
+    def add_page(self, page_num, words):
+        # Pages are added in ascending order, so each array stays sorted
+        for token in {normalize_token(w[4]) for w in words}:
+            postings = self.postings.get(token)
+            if postings is None:
+                postings = self.postings[token] = array('I')
+            postings.append(page_num)
+        self._match_cache = {}
+
+    def pages_with(self, fragment):
+        # Pages holding a word that contains fragment, i.e. where search_for may hit
+        pages = self._match_cache.get(fragment)
+        if pages is None:
+            pages = set()
+            for token, postings in self.postings.items():
+                if fragment in token:
+                    pages.update(postings)
+            self._match_cache[fragment] = pages
+        return pages
+
+    def candidate_pages(self, query):
+        """Pages that can contain query, or None when the index cannot narrow it down."""
+        tokens = query_tokens(query)
+        if not tokens:
+            return None
+        pages = None
+        for token in sorted(tokens, key=len, reverse=True):
+            found = self.pages_with(token)
+            pages = found if pages is None else pages & found
+            if not pages:
+                break
+        return pages
+
+    #  Persistence
+    def save(self, path):
+        data = {
+            'version': SEARCH_INDEX_VERSION,
+            'fingerprint': self.fingerprint,
+            'page_count': self.page_count,
+            'postings': {token: postings.tolist() for token, postings in self.postings.items()},
+        }
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        self._prune(directory)
+
+    @classmethod
+    def load(cls, path, fingerprint):
+        """Index stored at path, or None when missing, unreadable or for another file."""
+        if not fingerprint or not os.path.exists(path):
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SEARCH_INDEX_VERSION or data.get('fingerprint') != fingerprint:
+                return None
+            index = cls(fingerprint, data['page_count'])
+            index.postings = {token: array('I', postings) for token, postings in data['postings'].items()}
+            os.utime(path)  # keeps recently used indexes out of pruning
+            return index
+        except Exception as e:
+            print(f"Error loading search index {path}: {e}")
+            return None
+
+    @staticmethod
+    def _prune(directory):
+        try:
+            files = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".json.gz")]
+            files.sort(key=os.path.getmtime, reverse=True)
+            for stale in files[MAX_INDEX_FILES:]:
+                os.remove(stale)
+        except OSError as e:
+            print(f"Error pruning search indexes: {e}")
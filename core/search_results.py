@@ -0,0 +1,78 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class SearchResults:
+    """Matches of one query in page order, stored as parallel arrays.
+
+    pages holds the page of every match and rects its bounding box as four
+    float32s in unrotated page coordinates, about 20 bytes per match. Only
+    matches running over several lines keep their per-line rects, keyed by
+    (page, number of the match on its page). Match dicts are built on
+    access, so only the matches actually looked at become objects.
+    """
+
+    def __init__(self, text=""):
+        self.text = text
+        self.pages = array('I')
+        self.rects = array('f')
+        self._lines = {}
+
+    def __len__(self):
+        return len(self.pages)
+
+    def __getitem__(self, i):
+        n = len(self.pages)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("search result index out of range")
+        page = self.pages[i]
+        rect = tuple(self.rects[4 * i:4 * i + 4])
+        lines = self._lines.get((page, i - bisect_left(self.pages, page))) if self._lines else None
+        return {'page': page, 'rect': rect, 'rects': list(lines) if lines else [rect], 'text': self.text}
+
+    def __iter__(self):
+        for i in range(len(self.pages)):
+            yield self[i]
+
+    def add_page(self, page_num, hits):
+        """Insert the hits of one page after any earlier pages; returns their first index.
+
+        A hit is one rect (fitz.Rect or 4-tuple) or a list of line rects.
+        """
+        pos = bisect_right(self.pages, page_num)
+        ordinal = pos - bisect_left(self.pages, page_num)  # hits already stored for this page
+        rects = array('f')
+        for k, hit in enumerate(hits):
+            if isinstance(hit, list):
+                if len(hit) > 1:
+                    self._lines[(page_num, ordinal + k)] = tuple(tuple(r) for r in hit)
+                    rects.extend((min(r[0] for r in hit), min(r[1] for r in hit),
+                                  max(r[2] for r in hit), max(r[3] for r in hit)))
+                    continue
+                hit = hit[0]
+            rects.extend(tuple(hit))
+        self.pages[pos:pos] = array('I', [page_num]) * len(hits)
+        self.rects[4 * pos:4 * pos] = rects
+        return pos
+
+    def page_range(self, page_num):
+        """(start, stop) indexes of the matches on page_num."""
+        return bisect_left(self.pages, page_num), bisect_right(self.pages, page_num)
+
+    def page_line_rects(self, page_num):
+        # Every line rect on one page, for highlighting, without building match dicts
+        start, stop = self.page_range(page_num)
+        rects = []
+        for i in range(start, stop):
+            lines = self._lines.get((page_num, i - start)) if self._lines else None
+            if lines:
+                rects.extend(lines)
+            else:
+                rects.append(tuple(self.rects[4 * i:4 * i + 4]))
+        return rects
+
+    def nbytes(self):
+        return (self.pages.itemsize * len(self.pages) + self.rects.itemsize * len(self.rects)
+                + sum(16 * len(lines) for lines in self._lines.values()))
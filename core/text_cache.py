@@ -0,0 +1,103 @@
+from collections import OrderedDict
+import pymupdf as fitz
+
+
+DEFAULT_TEXT_CACHE_PAGES = 64
+DEFAULT_TEXT_CACHE_CHARS = 64 * 1024 * 1024
+
+# One text layer serves display, search and extraction: dehyphenated,
+# ligatures expanded, whitespace kept, clipped to the mediabox
+TEXTPAGE_FLAGS = fitz.TEXTFLAGS_SEARCH
+
+
+class TextPageCache:
+    """LRU cache of per-page text layers.
+
+    TextPage objects are heavy, so at most max_pages of them are kept. The
+    plain text of every layer built is much smaller and is kept separately
+    under a character budget, so extraction after a full search still finds
+    every page.
+    """
+
+    def __init__(self, max_pages=DEFAULT_TEXT_CACHE_PAGES, max_chars=DEFAULT_TEXT_CACHE_CHARS):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.current_chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.text_hits = 0
+        self.text_misses = 0
+        # page index -> (fitz.Page, fitz.TextPage); the TextPage only holds a
+        # weak reference to its page, so the page is kept alive here
+        self._textpages = OrderedDict()
+        self._texts = OrderedDict()  # page index -> plain text
+
+    def get(self, idx):
+        entry = self._textpages.get(idx)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._textpages.move_to_end(idx)
+        self.hits += 1
+        return entry
+
+    def put(self, idx, page, textpage):
+        self._textpages.pop(idx, None)
+        self._textpages[idx] = (page, textpage)
+        while len(self._textpages) > self.max_pages:
+            self._textpages.popitem(last=False)
+        self.put_text(idx, textpage.extractText())
+
+    def get_text(self, idx):
+        text = self._texts.get(idx)
+        if text is None:
+            self.text_misses += 1
+            return None
+        self._texts.move_to_end(idx)
+        self.text_hits += 1
+        return text
+
+    def put_text(self, idx, text):
+        # Also fed by background searches, which extract text on their own handles
+        old = self._texts.pop(idx, None)
+        if old is not None:
+            self.current_chars -= len(old)
+        if len(text) > self.max_chars:
+            return
+        self._texts[idx] = text
+        self.current_chars += len(text)
+        while self.current_chars > self.max_chars and self._texts:
+            _, evicted = self._texts.popitem(last=False)
+            self.current_chars -= len(evicted)
+
+    def discard(self, idx):
+        self._textpages.pop(idx, None)
+        text = self._texts.pop(idx, None)
+        if text is not None:
+            self.current_chars -= len(text)
+
+    def clear(self):
+        self._textpages.clear()
+        self._texts.clear()
+        self.current_chars = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.text_hits = 0
+        self.text_misses = 0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'text_hits': self.text_hits,
+            'text_misses': self.text_misses,
+            'pages': len(self._textpages),
+            'max_pages': self.max_pages,
+            'text_pages': len(self._texts),
+            'chars': self.current_chars,
+        }
+
+    def __len__(self):
+        return len(self._textpages)
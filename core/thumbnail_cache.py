@@ -0,0 +1,98 @@
+import sqlite3
+import time
+
+DEFAULT_THUMBNAIL_CACHE_BYTES = 200 * 1024 * 1024
+
+
+class ThumbnailCache:
+    """On-disk PNG thumbnails keyed by (document fingerprint, page, rotation)."""
+
+    def __init__(self, db_path="pdf_thumbnails.sqlite", max_bytes=DEFAULT_THUMBNAIL_CACHE_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._pending = []
+        self.conn = None
+        try:
+            self.conn = sqlite3.connect(db_path)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS thumbnails ("
+                " fingerprint TEXT NOT NULL,"
+                " page INTEGER NOT NULL,"
+                " rotation INTEGER NOT NULL,"
+                " data BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " PRIMARY KEY (fingerprint, page, rotation))"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS thumbnails_last_access ON thumbnails (last_access)"
+            )
+            self.conn.commit()
+        except Exception as e:
+            print(f"Error opening thumbnail cache: {e}")
+            self.conn = None
+
+    def load_document(self, fingerprint):
+        # All thumbnails of one document in a single query, touched as a group
+        if not self.conn or not fingerprint:
+            return {}
+        try:
+            rows = self.conn.execute(
+                "SELECT page, rotation, data FROM thumbnails WHERE fingerprint = ?",
+                (fingerprint,)
+            ).fetchall()
+            if rows:
+                self.conn.execute(
+                    "UPDATE thumbnails SET last_access = ? WHERE fingerprint = ?",
+                    (time.time(), fingerprint)
+                )
+                self.conn.commit()
+            return {(page, rotation): data for page, rotation, data in rows}
+        except Exception as e:
+            print(f"Error reading thumbnail cache: {e}")
+            return {}
+
+    def put(self, fingerprint, page, rotation, data):
+        if not self.conn or not fingerprint:
+            return
+        self._pending.append((fingerprint, page, rotation, data, len(data), time.time()))
+        if len(self._pending) >= 64:
+            self.flush()
+
+    def flush(self):
+        if not self.conn or not self._pending:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?, ?, ?, ?)",
+                    self._pending
+                )
+            self._pending = []
+            self._enforce_size_cap()
+        except Exception as e:
+            print(f"Error writing thumbnail cache: {e}")
+            self._pending = []
+
+    def _enforce_size_cap(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently used rows until the cache is back under the cap
+        excess = total - self.max_bytes
+        doomed = []
+        for rowid, size in self.conn.execute("SELECT rowid, size FROM thumbnails ORDER BY last_access"):
+            doomed.append((rowid,))
+            excess -= size
+            if excess <= 0:
+                break
+        with self.conn:
+            self.conn.executemany("DELETE FROM thumbnails WHERE rowid = ?", doomed)
+
+    def close(self):
+        if self.conn:
+            self.flush()
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,178 @@
+from PyQt5.QtWidgets import QWidget, QLabel
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QPixmap
+from utils.qt_image import pixmap_to_qimage
+from bisect import bisect_right
+
+PAGE_SPACING = 12
+BUFFER_PAGES = 1  # pages kept alive above and below the viewport
+
+
+class ContinuousViewWidget(QWidget):
+    current_page_changed = pyqtSignal(int)
+
+    def __init__(self, pdf_model, scroll_area, prefetcher=None, parent=None):
+        super().__init__(parent)
+        self.pdf_model = pdf_model
+        self.scroll_area = scroll_area
+        self.prefetcher = prefetcher
+        self.zoom = 1.0
+        self.page_sizes = []
+        self.page_offsets = []
+        self.content_width = 0
+        self.slots = {}  # page index -> QLabel, only for pages near the viewport
+        self._free_slots = []
+        self._pending = []
+        self._unfilled = set()
+        self._current_page = -1
+        self._render_timer = QTimer(self)
+        self._render_timer.setInterval(0)
+        self._render_timer.timeout.connect(self._render_next_pending)
+        if prefetcher:
+            prefetcher.page_rendered.connect(self._on_page_rendered)
+
+    def set_document(self, zoom):
+        # Layout comes from page.rect alone, nothing is rendered here
+        self.zoom = zoom
+        self.page_sizes = []
+        self.page_offsets = []
+        y = PAGE_SPACING
+        for i in range(self.pdf_model.get_page_count()):
+            w, h = self.pdf_model.get_page_pixel_size(i, zoom)
+            self.page_sizes.append((w, h))
+            self.page_offsets.append(y)
+            y += h + PAGE_SPACING
+
+        self.content_width = max((w for w, _ in self.page_sizes), default=0) + 2 * PAGE_SPACING
+        self.setMinimumSize(self.content_width, y)
+        self.clear_slots()
+        self._current_page = -1
+        self.update_visible()
+
+    def reset(self):
+        self.clear_slots()
+        self.page_sizes = []
+        self.page_offsets = []
+        self._current_page = -1
+
+    def layout_matches(self, zoom):
+        if self.zoom != zoom or len(self.page_sizes) != self.pdf_model.get_page_count():
+            return False
+        # A rotation changes the page size without changing the page count
+        idx = self.pdf_model.current_page
+        return self.page_sizes[idx] == self.pdf_model.get_page_pixel_size(idx, zoom)
+
+    def clear_slots(self):
+        for idx in list(self.slots):
+            self._release_slot(idx)
+        self._pending = []
+        self._unfilled = set()
+
+    def reload_page(self, idx):
+        # Re-fetch a live page, e.g. after an annotation edit
+        if idx in self.slots:
+            self._fill_slot(idx, self.slots[idx])
+
+    def visible_range(self):
+        if not self.page_offsets:
+            return 0, -1
+        top = self.scroll_area.verticalScrollBar().value()
+        bottom = top + self.scroll_area.viewport().height()
+        first = max(0, bisect_right(self.page_offsets, top) - 1)
+        last = max(first, bisect_right(self.page_offsets, bottom) - 1)
+        return first, last
+
+    def update_visible(self):
+        first, last = self.visible_range()
+        if last < first:
+            return
+        keep_first = max(0, first - BUFFER_PAGES)
+        keep_last = min(len(self.page_sizes) - 1, last + BUFFER_PAGES)
+
+        released = [idx for idx in self.slots if idx < keep_first or idx > keep_last]
+        for idx in released:
+            self._release_slot(idx)
+
+        # Visible pages are queued before the buffer pages
+        order = list(range(first, last + 1)) + [
+            i for i in range(keep_first, keep_last + 1) if i < first or i > last
+        ]
+        if released:
+            # Drop renders queued for pages that scrolled away
+            self._pending = []
+            if self.prefetcher:
+                self.prefetcher.cancel()
+        for idx in order:
+            if idx not in self.slots:
+                self._acquire_slot(idx)
+            elif released and idx in self._unfilled:
+                self._queue_render(idx)
+
+        top = self.scroll_area.verticalScrollBar().value()
+        center = top + self.scroll_area.viewport().height() // 2
+        current = max(0, bisect_right(self.page_offsets, center) - 1)
+        if current != self._current_page:
+            self._current_page = current
+            self.current_page_changed.emit(current)
+
+    def scroll_to_page(self, idx):
+        if 0 <= idx < len(self.page_offsets):
+            self._current_page = idx
+            self.scroll_area.verticalScrollBar().setValue(self.page_offsets[idx] - PAGE_SPACING)
+            self.update_visible()
+
+    def page_geometry(self, idx):
+        w, h = self.page_sizes[idx]
+        x = max(PAGE_SPACING, (self.width() - w) // 2)
+        return x, self.page_offsets[idx], w, h
+
+    def _acquire_slot(self, idx):
+        slot = self._free_slots.pop() if self._free_slots else QLabel(self)
+        slot.setAlignment(Qt.AlignCenter)
+        slot.setStyleSheet("background: #e0e0e0;")
+        slot.setGeometry(*self.page_geometry(idx))
+        slot.clear()
+        slot.show()
+        self.slots[idx] = slot
+
+        if self.pdf_model.is_page_cached(idx, self.zoom):
+            self._fill_slot(idx, slot)
+        else:
+            self._unfilled.add(idx)
+            self._queue_render(idx)
+
+    def _queue_render(self, idx):
+        if not (self.prefetcher and self.prefetcher.submit(idx, self.zoom, priority=1)):
+            self._pending.append(idx)
+            self._render_timer.start()
+
+    def _release_slot(self, idx):
+        self._unfilled.discard(idx)
+        slot = self.slots.pop(idx)
+        slot.clear()
+        slot.hide()
+        self._free_slots.append(slot)
+
+    def _fill_slot(self, idx, slot):
+        pix = self.pdf_model.get_pixmap_by_index(idx, self.zoom, cached=True)
+        if pix:
+            slot.setPixmap(QPixmap.fromImage(pixmap_to_qimage(pix)))
+            self._unfilled.discard(idx)
+
+    def _render_next_pending(self):
+        # One page per event loop turn keeps scrolling responsive
+        while self._pending:
+            idx = self._pending.pop(0)
+            if idx in self.slots:
+                self._fill_slot(idx, self.slots[idx])
+                return
+        self._render_timer.stop()
+
+    def _on_page_rendered(self, idx, zoom):
+        if zoom == self.zoom and idx in self.slots:
+            self._fill_slot(idx, self.slots[idx])
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        for idx, slot in self.slots.items():
+            slot.setGeometry(*self.page_geometry(idx))
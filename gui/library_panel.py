@@ -0,0 +1,144 @@
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QLabel,
+    QTreeWidget, QTreeWidgetItem, QFileDialog, QHeaderView
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+from gui.threads.library_indexer import LibraryIndexThread
+from core.library_index import LibraryIndex, LIBRARY_INDEX_DB
+import os
+
+HIT_ROLE = Qt.UserRole
+
+
+class LibraryPanel(QWidget):
+    """Search across every PDF of an indexed folder."""
+    open_requested = pyqtSignal(str, int)  # path, page index
+
+    def __init__(self, db_path=LIBRARY_INDEX_DB, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.index_thread = None
+        self.library = None
+        try:
+            self.library = LibraryIndex(db_path)
+        except Exception as e:
+            print(f"Error opening library index: {e}")
+
+        self.setup_ui()
+        folders = self.library.folders() if self.library else []
+        if folders:
+            self.folder_input.setText(folders[0])
+        self.show_library_stats()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        folder_layout = QHBoxLayout()
+        self.folder_input = QLineEdit()
+        self.folder_input.setPlaceholderText("Folder of PDFs...")
+        btn_browse = QPushButton("Browse...")
+        btn_browse.clicked.connect(self.choose_folder)
+        self.btn_index = QPushButton("Index")
+        self.btn_index.clicked.connect(self.toggle_indexing)
+        folder_layout.addWidget(self.folder_input)
+        folder_layout.addWidget(btn_browse)
+        folder_layout.addWidget(self.btn_index)
+        layout.addLayout(folder_layout)
+
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText('Search all documents, "exact phrase", prefix*')
+        self.query_input.returnPressed.connect(self.run_query)
+        layout.addWidget(self.query_input)
+
+        self.results = QTreeWidget()
+        self.results.setHeaderLabels(["Document", "Page", "Match"])
+        self.results.setRootIsDecorated(False)
+        self.results.setWordWrap(True)
+        self.results.header().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.results.itemActivated.connect(self.on_result_activated)
+        layout.addWidget(self.results)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666;")
+        layout.addWidget(self.status_label)
+
+    def show_library_stats(self):
+        if not self.library:
+            self.status_label.setText("Library index unavailable")
+            return
+        stats = self.library.stats()
+        self.status_label.setText(f"{stats['documents']} documents, {stats['pages']} pages indexed")
+
+    def choose_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Library Folder", self.folder_input.text())
+        if folder:
+            self.folder_input.setText(folder)
+            self.start_indexing()
+
+    #  Indexing
+    def toggle_indexing(self):
+        if self.index_thread is not None:
+            self.stop_indexing()
+        else:
+            self.start_indexing()
+
+    def start_indexing(self):
+        folder = self.folder_input.text().strip()
+        if not folder or not os.path.isdir(folder):
+            self.status_label.setText("Choose a folder to index")
+            return
+        self.stop_indexing()
+        # Only files changed since the last crawl are read again
+        self.index_thread = LibraryIndexThread(self.db_path, folder)
+        self.index_thread.progress.connect(self.on_index_progress)
+        self.index_thread.index_done.connect(self.on_index_done)
+        self.index_thread.start()
+        self.btn_index.setText("Stop")
+
+    def stop_indexing(self):
+        if self.index_thread is not None:
+            self.index_thread.requestInterruption()
+            self.index_thread.wait()
+            self.index_thread = None
+            self.btn_index.setText("Index")
+            self.show_library_stats()
+
+    def on_index_progress(self, done, total, path):
+        self.status_label.setText(f"Indexing {done}/{total}: {os.path.basename(path)}")
+
+    def on_index_done(self, stats):
+        if self.sender() is not self.index_thread:
+            return
+        self.index_thread = None
+        self.btn_index.setText("Index")
+        self.show_library_stats()
+        if stats:
+            changed = ", ".join(f"{count} {name}" for name, count in stats.items() if count and name != 'unchanged')
+            self.status_label.setText(f"{self.status_label.text()} ({changed or 'no changes'})")
+            if self.query_input.text().strip():
+                self.run_query()
+
+    #  Queries
+    def run_query(self):
+        self.results.clear()
+        query = self.query_input.text().strip()
+        if not query or not self.library:
+            return
+        hits = self.library.search(query)
+        for hit in hits:
+            item = QTreeWidgetItem([os.path.basename(hit.path), str(hit.page + 1), hit.snippet])
+            item.setToolTip(0, f"{hit.title}\n{hit.path}")
+            item.setData(0, HIT_ROLE, (hit.path, hit.page))
+            self.results.addTopLevelItem(item)
+        self.results.resizeColumnToContents(0)
+        self.status_label.setText(f"{len(hits)} matching pages" if hits else "No matches found")
+
+    def on_result_activated(self, item, column):
+        path, page = item.data(0, HIT_ROLE)
+        self.open_requested.emit(path, page)
+
+    def shutdown(self):
+        self.stop_indexing()
+        if self.library:
+            self.library.close()
+            self.library = None
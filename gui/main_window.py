@@ -1,18 +1,52 @@
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QImage, QPixmap, QIcon, QFont
+from PyQt5.QtCore import Qt, QSize, QTimer, QPoint, QRect, QRectF
+from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor
 from PyQt5.QtWidgets import (
     QMainWindow, QToolBar, QAction, QFileDialog, QLabel, QVBoxLayout,
     QWidget, QScrollArea, QMessageBox, QInputDialog, QLineEdit,
-    QHBoxLayout, QListWidget, QListWidgetItem, QSplitter
+    QHBoxLayout, QListWidget, QListWidgetItem, QSplitter, QProgressDialog,
+    QApplication, QSpinBox, QCheckBox, QDockWidget, QProgressBar, QComboBox
 )
 from PyQt5.QtPrintSupport import QPrinter, QPrintDialog
 from .pdf_view_widget import PDFViewWidget
+from .continuous_view_widget import ContinuousViewWidget
+from .library_panel import LibraryPanel
 from .dialogs.export_dialog import ExportDialog
 from .dialogs.translate_dialog import TranslateDialog
 from .dialogs.summarize_dialog import SummarizeDialog
+from .threads.prefetch_worker import PagePrefetcher
+from .threads.thumbnail_loader import ThumbnailLoader
+from .threads.index_builder import SearchIndexThread
+from .threads.search_thread import SearchThread
+from .threads.save_thread import SaveThread
 from core.pdf_model import PDFModel
+from core.thumbnail_cache import ThumbnailCache
+from core.page_events import PAGES_INSERTED, PAGES_REMOVED
+from core.render_farm import RenderFarm
+from core.search_engine import SearchEngine, PLAIN_SEARCH, compile_query
+from core.save_profiles import SAVE_PROFILES, SAVE_PROFILE, SAVE_AS_PROFILE, format_report
+from utils.qt_image import pixmap_to_qimage, buffer_to_qimage
 import pymupdf as fitz
+import logging
 import os
+import re
+import time
+
+THUMBNAIL_ZOOM = 0.15
+THUMBNAIL_LOOKAHEAD = 12  # rows rendered ahead of the visible ones
+THUMBNAIL_RENDERED_ROLE = Qt.UserRole
+SEARCH_AS_YOU_TYPE_DELAY_MS = 250  # pause in typing before a live search starts
+SEARCH_AS_YOU_TYPE_MIN_CHARS = 2  # shorter queries wait for Enter
+BOOKMARK_FLUSH_INTERVAL_MS = 2000  # page turns in between are written out together
+PREFETCH_DEPTH = 2  # pages rendered ahead of and behind the current one
+OPEN_DEFERRED_WORK_MS = 200  # thumbnails and indexing start by then even if no paint was seen
+MIN_ZOOM, MAX_ZOOM = 0.2, 16.0
+
+log = logging.getLogger(__name__)
+
+
+def new_render_timings():
+    # Progressive render times of the open document, summed over its pages
+    return {'pages': 0, 'first_paint_ms': 0.0, 'sharp_ms': 0.0, 'slowest': (0, 0.0)}
 
 
 class MainWindow(QMainWindow):
@@ -26,10 +60,42 @@ class MainWindow(QMainWindow):
         self.search_result_label = None
         self.dialog_prev_btn = None
         self.dialog_next_btn = None
+        self.continuous_action = None
+        self._pending_scroll = None
+        self._open_pending = None
         self.setWindowTitle("PDF Editor Pro")
         self.showMaximized()
         self.annotation_mode = None
+        self.view_mode = "single"
         self.pdf_model = PDFModel()
+        self.prefetcher = PagePrefetcher(self.pdf_model, depth=PREFETCH_DEPTH)
+        self.prefetcher.page_rendered.connect(self.on_page_rendered)
+        self.progressive_render = None
+        self.render_timings = new_render_timings()
+        self.thumbnail_loader = ThumbnailLoader(self.pdf_model, THUMBNAIL_ZOOM)
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self._placeholder_icons = {}
+        self.thumbnail_cache = ThumbnailCache()
+        self._disk_thumbnails = {}
+        self.index_thread = None
+        self.search_thread = None
+        self.search_generation = 0
+        self.save_thread = None
+        self.save_job = None
+        self.edit_actions = []
+        self.search_workers = os.cpu_count() or 1
+        self.search_options = PLAIN_SEARCH
+        self.search_engine = SearchEngine()
+        self._finishing_search_threads = set()
+        self.live_search_timer = QTimer(self)
+        self.live_search_timer.setSingleShot(True)
+        self.live_search_timer.setInterval(SEARCH_AS_YOU_TYPE_DELAY_MS)
+        self.live_search_timer.timeout.connect(self.run_live_search)
+        self.bookmark_timer = QTimer(self)
+        self.bookmark_timer.setInterval(BOOKMARK_FLUSH_INTERVAL_MS)
+        self.bookmark_timer.timeout.connect(self.flush_session)
+        self.bookmark_timer.start()
+        self.pdf_model.add_change_listener(self.on_pages_changed)
 
         self._setup_ui()
         self.setup_toolbar()
@@ -38,14 +104,23 @@ class MainWindow(QMainWindow):
     def _setup_ui(self):
         # PDF view
         self.pdf_view = PDFViewWidget(annotation_callback=self.annotation_rect)
+        self.pdf_view.page_painted.connect(self.on_page_painted)
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setWidget(self.pdf_view)
 
+        # Continuous view, swapped into the scroll area on demand
+        self.continuous_view = ContinuousViewWidget(self.pdf_model, self.scroll_area, self.prefetcher)
+        self.continuous_view.current_page_changed.connect(self.on_continuous_page_changed)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.on_view_scrolled)
+        self.scroll_area.horizontalScrollBar().rangeChanged.connect(self.apply_pending_scroll)
+        self.scroll_area.verticalScrollBar().rangeChanged.connect(self.apply_pending_scroll)
+
         # Thumbnail panel
         self.list_widget = QListWidget()
         self.list_widget.setFixedWidth(350)
         self.list_widget.itemClicked.connect(self.on_thumbnail_clicked)
+        self.list_widget.verticalScrollBar().valueChanged.connect(self.request_visible_thumbnails)
 
         # Splitter
         self.splitter = QSplitter(Qt.Horizontal)
@@ -58,6 +133,14 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.splitter)
         self.setCentralWidget(container)
 
+        # Library search, across every PDF of an indexed folder
+        self.library_panel = LibraryPanel()
+        self.library_panel.open_requested.connect(self.open_library_hit)
+        self.library_dock = QDockWidget("Library", self)
+        self.library_dock.setWidget(self.library_panel)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.library_dock)
+        self.library_dock.hide()
+
     def setup_toolbar(self):
         tb = QToolBar("Toolbar")
         tb.setIconSize(QSize(32, 32))
@@ -67,19 +150,22 @@ class MainWindow(QMainWindow):
         font = QFont()
         font.setPointSize(10)
 
-        def add_action(name, icon_path, callback, shortcut=None):
+        def add_action(name, icon_path, callback, shortcut=None, edit=False):
             action = QAction(QIcon(icon_path), name, self)
             action.triggered.connect(callback)
             action.setFont(font)
             if shortcut:
                 action.setShortcut(shortcut)
+            if edit:
+                # Disabled while a save is running
+                self.edit_actions.append(action)
             tb.addAction(action)
             return action
 
         # File operations
         add_action("Open", "icons/open.png", self.open_pdf, "Ctrl+O")
-        add_action("Save", "icons/save.png", self.save_pdf, "Ctrl+S")
-        add_action("Save As", "icons/save_as.png", self.save_as_pdf, "Ctrl+Shift+S")
+        add_action("Save", "icons/save.png", self.save_pdf, "Ctrl+S", edit=True)
+        add_action("Save As", "icons/save_as.png", self.save_as_pdf, "Ctrl+Shift+S", edit=True)
         add_action("Print", "icons/print.png", self.print_pdf, "Ctrl+P")
         add_action("Export", "icons/export.png", self.show_export_dialog, "Ctrl+E")
         tb.addSeparator()
@@ -93,35 +179,38 @@ class MainWindow(QMainWindow):
         add_action("Zoom In", "icons/zoom_in.png", self.zoom_in, "Ctrl++")
         add_action("Zoom Out", "icons/zoom_out.png", self.zoom_out, "Ctrl+-")
         add_action("Reset", "icons/reset.png", self.reset, "Ctrl+0")
+        self.continuous_action = add_action("Continuous", "icons/continuous.png", self.toggle_continuous_mode)
+        self.continuous_action.setCheckable(True)
         tb.addSeparator()
 
         # Rotation
-        add_action("Rotate Left", "icons/rotate_left.png", self.rotate_left, "Ctrl+L")
-        add_action("Rotate Right", "icons/rotate_right.png", self.rotate_right, "Ctrl+R")
-        add_action("Rotate 180", "icons/rotate_180.png", self.rotate_180)
+        add_action("Rotate Left", "icons/rotate_left.png", self.rotate_left, "Ctrl+L", edit=True)
+        add_action("Rotate Right", "icons/rotate_right.png", self.rotate_right, "Ctrl+R", edit=True)
+        add_action("Rotate 180", "icons/rotate_180.png", self.rotate_180, edit=True)
         tb.addSeparator()
 
         # Annotations
-        add_action("Highlight", "icons/highlight.png", lambda: self.set_annotation_mode("highlight"))
-        add_action("Underline", "icons/underline.png", lambda: self.set_annotation_mode("underline"))
-        add_action("Strikeout", "icons/strikeout.png", lambda: self.set_annotation_mode("strikeout"))
-        add_action("Note", "icons/note.png", lambda: self.set_annotation_mode("note"))
-        add_action("Add Text", "icons/text.png", lambda: self.set_annotation_mode("text"))
-        add_action("Remove Text", "icons/remove_text.png", lambda: self.set_annotation_mode("remove_text"))
-        add_action("Erase", "icons/erase.png", lambda: self.set_annotation_mode("erase"))
+        add_action("Highlight", "icons/highlight.png", lambda: self.set_annotation_mode("highlight"), edit=True)
+        add_action("Underline", "icons/underline.png", lambda: self.set_annotation_mode("underline"), edit=True)
+        add_action("Strikeout", "icons/strikeout.png", lambda: self.set_annotation_mode("strikeout"), edit=True)
+        add_action("Note", "icons/note.png", lambda: self.set_annotation_mode("note"), edit=True)
+        add_action("Add Text", "icons/text.png", lambda: self.set_annotation_mode("text"), edit=True)
+        add_action("Remove Text", "icons/remove_text.png", lambda: self.set_annotation_mode("remove_text"), edit=True)
+        add_action("Erase", "icons/erase.png", lambda: self.set_annotation_mode("erase"), edit=True)
         add_action("Select", "icons/select.png", lambda: self.set_annotation_mode(None))
         tb.addSeparator()
 
         # Page operations
-        add_action("Delete Page", "icons/delete.png", self.delete_page)
-        add_action("Delete Multiple", "icons/delete_multiple.png", self.delete_multiple_pages)
-        add_action("Add Page", "icons/add.png", self.show_add_page_dialog)
-        add_action("Insert After", "icons/add.png", self.insert_page_after)
-        add_action("Insert Before", "icons/add.png", self.insert_page_before)
+        add_action("Delete Page", "icons/delete.png", self.delete_page, edit=True)
+        add_action("Delete Multiple", "icons/delete_multiple.png", self.delete_multiple_pages, edit=True)
+        add_action("Add Page", "icons/add.png", self.show_add_page_dialog, edit=True)
+        add_action("Insert After", "icons/add.png", self.insert_page_after, edit=True)
+        add_action("Insert Before", "icons/add.png", self.insert_page_before, edit=True)
         tb.addSeparator()
 
         # Search & AI
         add_action("Search", "icons/search.png", self.show_search_dialog, "Ctrl+F")
+        add_action("Library", "icons/library.png", self.show_library_panel, "Ctrl+Shift+F")
         add_action("Translate", "icons/translate.png", lambda: self.set_annotation_mode("translate"))
         add_action("Summarize", "icons/summarize.png", self.show_summarize_dialog, "Ctrl+Shift+A")
 
@@ -143,6 +232,20 @@ class MainWindow(QMainWindow):
         lay.setContentsMargins(0, 0, 0, 0)
         lay.addWidget(self.status_label)
         lay.addStretch()
+        self.save_profile_box = QComboBox()
+        self.save_profile_box.addItem("Save: default", None)
+        for name in SAVE_PROFILES:
+            self.save_profile_box.addItem(f"Save: {name}", name)
+        self.save_profile_box.setToolTip(
+            f"Speed vs. size of saved files. Default is {SAVE_PROFILE} for Save, {SAVE_AS_PROFILE} for Save As.\n"
+            "fast: written as is; balanced: unused objects removed, streams compressed;\n"
+            "smallest: also object streams, font subsets and downsampled images (slowest)")
+        lay.addWidget(self.save_profile_box)
+        self.save_progress = QProgressBar()
+        self.save_progress.setRange(0, 0)
+        self.save_progress.setFixedWidth(120)
+        self.save_progress.hide()
+        lay.addWidget(self.save_progress)
         lay.addWidget(self.page_input)
         self.statusBar().addPermanentWidget(container)
 
@@ -150,28 +253,246 @@ class MainWindow(QMainWindow):
     def open_pdf(self):
         path, _ = QFileDialog.getOpenFileName(self, "Open PDF", "", "PDF Files (*.pdf)")
         if path:
-            self.pdf_model.load_pdf(path)
-            self.load_thumbnails()
-            self.show_page()
-            self.setWindowTitle(f"PDF Editor Pro - {os.path.basename(path)}")
+            self.open_file(path)
+
+    def open_file(self, path, page=None):
+        # Opens at page when given, otherwise where the last session left off
+        if self.save_thread is not None:
+            self.statusBar().showMessage("Wait for the save to finish", 3000)
+            return False
+        self.save_session()
+        self.prefetcher.cancel()
+        self.cancel_search()
+        self.stop_search_index()
+        self.continuous_view.reset()
+        # Old thumbnails must not serve as previews for the new document
+        self.thumbnail_loader.reset()
+        self.list_widget.clear()
+        self.pdf_model.load_pdf(path)
+        self.render_timings = new_render_timings()
+        state = self.pdf_model.get_session_state()
+        if page is not None and 0 <= page < self.pdf_model.get_page_count():
+            self.pdf_model.current_page = page
+            state.pop('scroll', None)
+        self.restore_view_state(state)
+
+        # The restored viewport is painted first; thumbnails and indexing wait for it
+        self._open_pending = state
+        self.show_page()
+        QTimer.singleShot(OPEN_DEFERRED_WORK_MS, self.finish_open)
+        self.setWindowTitle(f"PDF Editor Pro - {os.path.basename(path)}")
+
+        last_page = self.pdf_model.current_page + 1
+        if page is None and last_page > 1:
+            self.statusBar().showMessage(f"Opened at last read page: {last_page}", 3000)
+        return True
 
-            last_page = self.pdf_model.current_page + 1
-            if last_page > 1:
-                self.statusBar().showMessage(f"Opened at last read page: {last_page}", 3000)
+    def finish_open(self):
+        state = self._open_pending
+        if state is None:
+            return
+        self._open_pending = None
+        self.apply_pending_scroll()
+        self._pending_scroll = None
+        self.load_thumbnails()
+        # Laid out now so that selecting the current row does not scroll later on
+        self.list_widget.doItemsLayout()
+        self.update_thumbnail_selection()
+        thumbnail_scroll = state.get('thumbnail_scroll')
+        if isinstance(thumbnail_scroll, int):
+            self.list_widget.verticalScrollBar().setValue(thumbnail_scroll)
+        search = state.get('search')
+        if isinstance(search, str) and search and not self.pdf_model.last_search_text:
+            # Only the query comes back; F3 or the dialog runs it
+            self.pdf_model.last_search_text = search
+        self.start_search_index()
+
+    #  Session State
+    def capture_session_state(self):
+        return {
+            'zoom': self.pdf_view.zoom,
+            'view_mode': self.view_mode,
+            'scroll': [self.scroll_area.horizontalScrollBar().value(), self.scroll_area.verticalScrollBar().value()],
+            'thumbnail_scroll': self.list_widget.verticalScrollBar().value(),
+            'search': self.pdf_model.last_search_text,
+        }
+
+    def save_session(self):
+        # Not while a document is still opening: its view is not restored yet
+        if self.pdf_model.doc and self._open_pending is None:
+            self.pdf_model.save_session_state(self.capture_session_state())
+
+    def flush_session(self):
+        self.save_session()
+        self.pdf_model.flush_bookmarks()
+
+    def restore_view_state(self, state):
+        # Zoom, view mode and scroll offsets, applied before anything is rendered
+        zoom = state.get('zoom')
+        if isinstance(zoom, (int, float)) and MIN_ZOOM <= zoom <= MAX_ZOOM:
+            self.pdf_view.zoom = zoom
+        mode = state.get('view_mode')
+        if mode in ("single", "continuous") and mode != self.view_mode:
+            self.set_view_mode(mode)
+        scroll = state.get('scroll')
+        if isinstance(scroll, list) and len(scroll) == 2 and all(isinstance(v, int) for v in scroll):
+            self._pending_scroll = tuple(scroll)
+
+    def apply_pending_scroll(self, *args):
+        # Scroll ranges grow as the restored page is laid out; applied once they are large enough
+        if self._pending_scroll is None:
+            return
+        h, v = self._pending_scroll
+        hbar, vbar = self.scroll_area.horizontalScrollBar(), self.scroll_area.verticalScrollBar()
+        hbar.setValue(h)
+        vbar.setValue(v)
+        if hbar.maximum() >= h and vbar.maximum() >= v:
+            self._pending_scroll = None
+
+    def show_library_panel(self):
+        self.library_dock.show()
+        self.library_dock.raise_()
+        self.library_panel.query_input.setFocus()
+
+    def open_library_hit(self, path, page):
+        if not os.path.exists(path):
+            self.statusBar().showMessage(f"File not found: {path}", 3000)
+            return
+        same_file = self.pdf_model.file_path and os.path.abspath(self.pdf_model.file_path) == path
+        if not same_file:
+            try:
+                if not self.open_file(path, page):
+                    return
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Cannot open file:\n{e}")
+                return
+        if not 0 <= page < self.pdf_model.get_page_count():
+            # Indexed before pages were deleted; the library catches up on its next update
+            self.statusBar().showMessage(
+                f"{os.path.basename(path)} has no page {page + 1} any more, the library index is out of date", 5000)
+            return
+        if same_file and page != self.pdf_model.current_page:
+            self.pdf_model.current_page = page
+            self.show_page()
+        self.statusBar().showMessage(f"{os.path.basename(path)}, page {page + 1}", 3000)
 
     def load_thumbnails(self):
+        self.thumbnail_loader.reset()
         self.list_widget.clear()
         if not self.pdf_model.doc:
             return
 
+        self.thumbnail_cache.flush()
+        self._disk_thumbnails = self.thumbnail_cache.load_document(self.pdf_model.fingerprint)
+
+        # Rows start with placeholders sized from the page geometry, no rendering
+        self.list_widget.setUpdatesEnabled(False)
         for i in range(self.pdf_model.get_page_count()):
-            pix = self.pdf_model.get_pixmap_by_index(i, zoom=0.15)
-            if pix:
-                img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-                icon = QIcon(QPixmap.fromImage(img))
-                item = QListWidgetItem(icon, f"Page {i + 1}")
-                item.setToolTip(f"Page {i + 1}")
-                self.list_widget.addItem(item)
+            self.list_widget.addItem(self.create_thumbnail_item(i))
+        self.list_widget.setUpdatesEnabled(True)
+        QTimer.singleShot(0, self.request_visible_thumbnails)
+
+    def create_thumbnail_item(self, idx):
+        width, height = self.pdf_model.get_page_pixel_size(idx, THUMBNAIL_ZOOM)
+        item = QListWidgetItem(self.placeholder_icon(width, height), f"Page {idx + 1}")
+        item.setToolTip(f"Page {idx + 1}")
+        item.setData(THUMBNAIL_RENDERED_ROLE, False)
+        return item
+
+    def placeholder_icon(self, width, height):
+        icon = self._placeholder_icons.get((width, height))
+        if icon is None:
+            pixmap = QPixmap(max(1, width), max(1, height))
+            pixmap.fill(QColor("#e0e0e0"))
+            icon = self._placeholder_icons[(width, height)] = QIcon(pixmap)
+        return icon
+
+    def visible_thumbnail_rows(self):
+        count = self.list_widget.count()
+        if not count:
+            return []
+        viewport = self.list_widget.viewport().rect()
+        first_index = self.list_widget.indexAt(QPoint(0, 0))
+        first = first_index.row() if first_index.isValid() else 0
+        last = first
+        while last + 1 < count:
+            rect = self.list_widget.visualItemRect(self.list_widget.item(last + 1))
+            if rect.top() > viewport.bottom():
+                break
+            last += 1
+        return list(range(first, last + 1))
+
+    def request_visible_thumbnails(self):
+        visible = self.visible_thumbnail_rows()
+        if not visible:
+            return
+        first, last = visible[0], visible[-1]
+        count = self.list_widget.count()
+        # Visible rows first, then the rows just below and just above them
+        rows = visible + list(range(last + 1, min(count, last + 1 + THUMBNAIL_LOOKAHEAD)))
+        rows += list(range(max(0, first - THUMBNAIL_LOOKAHEAD), first))
+        rows = [r for r in rows if not self.list_widget.item(r).data(THUMBNAIL_RENDERED_ROLE)]
+        rows = [r for r in rows if not self.load_disk_thumbnail(r)]
+        if rows:
+            self.thumbnail_loader.request(rows)
+
+    def on_pages_changed(self, event):
+        if event.kind in (PAGES_INSERTED, PAGES_REMOVED):
+            # Queued page renders refer to the old page numbers
+            self.prefetcher.cancel()
+        # Row-level thumbnail updates instead of rebuilding the whole list
+        if not self.list_widget.count():
+            return
+
+        if event.kind == PAGES_INSERTED:
+            for idx in event.indices:
+                self.list_widget.insertItem(idx, self.create_thumbnail_item(idx))
+        elif event.kind == PAGES_REMOVED:
+            for idx in reversed(event.indices):
+                self.list_widget.takeItem(idx)
+        else:
+            for idx in event.indices:
+                item = self.list_widget.item(idx)
+                if item:
+                    width, height = self.pdf_model.get_page_pixel_size(idx, THUMBNAIL_ZOOM)
+                    item.setIcon(self.placeholder_icon(width, height))
+                    item.setData(THUMBNAIL_RENDERED_ROLE, False)
+
+        if event.kind in (PAGES_INSERTED, PAGES_REMOVED):
+            # Queued renders refer to the old row numbers
+            self.thumbnail_loader.reset()
+            for row in range(event.indices[0], self.list_widget.count()):
+                self.list_widget.item(row).setText(f"Page {row + 1}")
+                self.list_widget.item(row).setToolTip(f"Page {row + 1}")
+        QTimer.singleShot(0, self.request_visible_thumbnails)
+
+    def load_disk_thumbnail(self, idx):
+        key = self.pdf_model.get_source_page_key(idx)
+        data = self._disk_thumbnails.get(key) if key else None
+        if not data:
+            return False
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data, "PNG"):
+            return False
+        item = self.list_widget.item(idx)
+        item.setIcon(QIcon(pixmap))
+        item.setData(THUMBNAIL_RENDERED_ROLE, True)
+        return True
+
+    def on_thumbnail_ready(self, idx, pix, generation):
+        if generation != self.thumbnail_loader.generation:
+            return
+        item = self.list_widget.item(idx)
+        if item is None:
+            return
+        item.setIcon(QIcon(QPixmap.fromImage(pixmap_to_qimage(pix))))
+        item.setData(THUMBNAIL_RENDERED_ROLE, True)
+
+        key = self.pdf_model.get_source_page_key(idx)
+        if key and key not in self._disk_thumbnails:
+            data = pix.tobytes("png")
+            self._disk_thumbnails[key] = data
+            self.thumbnail_cache.put(self.pdf_model.fingerprint, key[0], key[1], data)
 
     def on_thumbnail_clicked(self, item: QListWidgetItem):
         index = self.list_widget.row(item)
@@ -201,36 +522,183 @@ class MainWindow(QMainWindow):
             self.status_label.setText("No file")
             return
 
-        pix = self.pdf_model.get_current_page_pixmap(self.pdf_view.zoom)
-        if pix:
+        if self.view_mode == "continuous":
+            self.show_continuous_page()
+            return
+
+        idx = self.pdf_model.current_page
+        zoom = self.pdf_view.zoom
+        width, height = self.pdf_model.get_page_pixel_size(idx, zoom)
+        tiled = self.pdf_view.needs_tiling(width, height)
+        if not self.is_progressive_render(idx, zoom):
+            self.progressive_render = None
+        if tiled:
+            # Only the tiles under the viewport are rendered, on demand
+            text_rects, page_rect = self.pdf_model.get_text_regions()
+            self.pdf_view.set_text_regions(text_rects, page_rect)
+            self.pdf_view.show_tiled(
+                width, height,
+                lambda tx, ty, size: self.pdf_model.get_tile_pixmap(idx, zoom, tx, ty, size)
+            )
+        elif not self.pdf_model.is_page_cached(idx, zoom):
+            # Show an upscaled thumbnail now, swap in the sharp render when ready
+            self.progressive_render = {
+                'page': idx, 'zoom': zoom, 'start': time.perf_counter(),
+                'first_paint': None, 'sharp': False
+            }
             text_rects, page_rect = self.pdf_model.get_text_regions()
             self.pdf_view.set_text_regions(text_rects, page_rect)
-            self.pdf_view.show_page(pix)
+            self.pdf_view.show_preview(self.get_preview_pixmap(idx), width, height)
+        else:
+            pix = self.pdf_model.get_current_page_pixmap(zoom)
+            if pix:
+                text_rects, page_rect = self.pdf_model.get_text_regions()
+                self.pdf_view.set_text_regions(text_rects, page_rect)
+                self.pdf_view.show_page(pix)
+                if self.is_progressive_render(idx, zoom):
+                    self.progressive_render['sharp'] = True
+
+        self.update_page_status()
+        if tiled:
+            self.prefetcher.cancel()
+        else:
+            self.prefetcher.schedule(idx, zoom)
+            if self.is_progressive_render(idx, zoom) and not self.progressive_render['sharp']:
+                self.request_sharp_render(idx, zoom)
+
+        # Re-highlight search matches on the new page
+        self.update_search_overlay()
 
+    def update_page_status(self):
         rotation = self.pdf_model.get_page_rotation()
         self.status_label.setText(
             f"Page {self.pdf_model.current_page + 1}/{self.pdf_model.get_page_count()} | Rotation: {rotation}°"
         )
+        self.update_render_stats()
         self.update_thumbnail_selection()
 
-        # Re-highlight current search match if on same page
-        current_match = self.pdf_model.get_current_search_match()
-        if current_match and current_match['page'] == self.pdf_model.current_page:
-            page = self.pdf_model.get_current_page()
-            if page:
-                scale_x = self.pdf_view.displayed_width / page.rect.width
-                scale_y = self.pdf_view.displayed_height / page.rect.height
-
-                pdf_rect = current_match['rect']
-                from PyQt5.QtCore import QRectF
-                view_rect = QRectF(
-                    pdf_rect.x0 * scale_x,
-                    pdf_rect.y0 * scale_y,
-                    pdf_rect.width * scale_x,
-                    pdf_rect.height * scale_y
-                )
-
-                self.pdf_view.highlight_search_rect(view_rect)
+    # ===== Continuous View =====
+    def toggle_continuous_mode(self, checked):
+        self.set_view_mode("continuous" if checked else "single")
+        self.show_page()
+
+    def set_view_mode(self, mode):
+        self.view_mode = mode
+        self.continuous_action.setChecked(mode == "continuous")
+        self.scroll_area.takeWidget()
+        if mode == "continuous":
+            self.prefetcher.cancel()
+            self.scroll_area.setWidget(self.continuous_view)
+            self.continuous_view.reset()
+        else:
+            self.continuous_view.reset()
+            self.scroll_area.setWidget(self.pdf_view)
+
+    def show_continuous_page(self):
+        idx = self.pdf_model.current_page
+        zoom = self.pdf_view.zoom
+        if not self.continuous_view.layout_matches(zoom):
+            self.continuous_view.set_document(zoom)
+        else:
+            self.continuous_view.reload_page(idx)
+
+        first, last = self.continuous_view.visible_range()
+        if not first <= idx <= last:
+            self.continuous_view.scroll_to_page(idx)
+        self.update_page_status()
+
+    def on_view_scrolled(self, value):
+        if self.view_mode == "continuous":
+            self.continuous_view.update_visible()
+
+    def on_continuous_page_changed(self, idx):
+        if idx != self.pdf_model.current_page:
+            self.pdf_model.current_page = idx
+            self.pdf_model.save_bookmark(self.pdf_model.file_path, idx)
+        self.update_page_status()
+
+    # ===== Progressive Rendering =====
+    def get_preview_pixmap(self, idx):
+        item = self.list_widget.item(idx)
+        if item and item.data(THUMBNAIL_RENDERED_ROLE):
+            sizes = item.icon().availableSizes()
+            if sizes:
+                return item.icon().pixmap(sizes[-1])
+
+        pix = self.pdf_model.get_pixmap_by_index(idx, zoom=THUMBNAIL_ZOOM)
+        return QPixmap.fromImage(pixmap_to_qimage(pix))
+
+    def is_progressive_render(self, idx, zoom):
+        state = self.progressive_render
+        return bool(state) and state['page'] == idx and state['zoom'] == zoom
+
+    def request_sharp_render(self, idx, zoom):
+        # Pages that differ from the file on disk are rendered here once the preview has painted
+        if not self.prefetcher.submit(idx, zoom, priority=1):
+            self.progressive_render['render_after_paint'] = True
+
+    def on_page_rendered(self, idx, zoom):
+        self.refine_page(idx, zoom)
+
+    def refine_page(self, idx, zoom):
+        if (self.is_progressive_render(idx, zoom) and not self.progressive_render['sharp']
+                and self.pdf_model.current_page == idx and self.pdf_view.zoom == zoom):
+            self.pdf_model.get_current_page_pixmap(zoom)
+            self.show_page()
+
+    def on_page_painted(self):
+        if self._open_pending is not None:
+            QTimer.singleShot(0, self.finish_open)
+        state = self.progressive_render
+        if not state:
+            return
+        elapsed = (time.perf_counter() - state['start']) * 1000
+        if not state['sharp']:
+            if state['first_paint'] is None:
+                state['first_paint'] = elapsed
+                if state.get('render_after_paint'):
+                    idx, zoom = state['page'], state['zoom']
+                    QTimer.singleShot(0, lambda: self.refine_page(idx, zoom))
+            return
+        first_paint = state['first_paint'] if state['first_paint'] is not None else elapsed
+        self.progressive_render = None
+        log.debug("Page %d: first paint %.1f ms, sharp %.1f ms", state['page'] + 1, first_paint, elapsed)
+        timings = self.render_timings
+        timings['pages'] += 1
+        timings['first_paint_ms'] += first_paint
+        timings['sharp_ms'] += elapsed
+        if elapsed > timings['slowest'][1]:
+            timings['slowest'] = (state['page'], elapsed)
+        self.update_render_stats()
+
+    def update_render_stats(self):
+        stats = self.prefetcher.stats()
+        text = self.pdf_model.get_text_cache_stats()
+        self.status_label.setToolTip(
+            f"Render cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['prefetch_hits']} served from prefetch ({stats['prefetch_ratio']:.0%}), "
+            f"{stats['bytes'] // (1024 * 1024)}/{stats['max_bytes'] // (1024 * 1024)} MB\n"
+            f"Text cache: {text['hits']} hits, {text['misses']} misses, "
+            f"{text['pages']}/{text['max_pages']} text pages, {text['text_pages']} pages of plain text"
+            + self.format_render_timings()
+        )
+
+    def format_render_timings(self):
+        timings = self.render_timings
+        if not timings['pages']:
+            return ""
+        pages = timings['pages']
+        slowest_page, slowest_ms = timings['slowest']
+        return (f"\nPage renders: {pages}, first paint {timings['first_paint_ms'] / pages:.1f} ms "
+                f"and sharp {timings['sharp_ms'] / pages:.1f} ms on average, "
+                f"slowest page {slowest_page + 1} ({slowest_ms:.1f} ms)")
+
+    def set_search_option(self, name, enabled):
+        self.search_options = self.search_options._replace(**{name: enabled})
+
+    def set_search_workers(self, workers):
+        # Processes used to scan large documents; 1 keeps search on a single thread
+        self.search_workers = max(1, workers)
 
     # ===== Navigation =====
     def next_page(self):
@@ -271,7 +739,6 @@ class MainWindow(QMainWindow):
         current_rotation = self.pdf_model.get_page_rotation()
         new_rotation = (current_rotation - 90) % 360
         if self.pdf_model.rotate_current_page(new_rotation):
-            self.load_thumbnails()
             self.show_page()
             self.statusBar().showMessage(f"Rotated page to {new_rotation}°", 2000)
 
@@ -281,7 +748,6 @@ class MainWindow(QMainWindow):
         current_rotation = self.pdf_model.get_page_rotation()
         new_rotation = (current_rotation + 90) % 360
         if self.pdf_model.rotate_current_page(new_rotation):
-            self.load_thumbnails()
             self.show_page()
             self.statusBar().showMessage(f"Rotated page to {new_rotation}°", 2000)
 
@@ -291,7 +757,6 @@ class MainWindow(QMainWindow):
         current_rotation = self.pdf_model.get_page_rotation()
         new_rotation = (current_rotation + 180) % 360
         if self.pdf_model.rotate_current_page(new_rotation):
-            self.load_thumbnails()
             self.show_page()
             self.statusBar().showMessage(f"Rotated page to {new_rotation}°", 2000)
 
@@ -299,21 +764,71 @@ class MainWindow(QMainWindow):
     def save_pdf(self):
         if not self.pdf_model.file_path:
             return self.save_as_pdf()
-        if self.pdf_model.save():
-            QMessageBox.information(self, "Success", "File saved!")
-            return None
-        else:
-            QMessageBox.critical(self, "Error", "Cannot save file!")
+        if not self.pdf_model.needs_save():
+            self.statusBar().showMessage("No changes to save", 3000)
             return None
+        self.start_save()
+        return None
 
     def save_as_pdf(self):
         path, _ = QFileDialog.getSaveFileName(self, "Save As", "", "PDF Files (*.pdf)")
         if path:
-            if self.pdf_model.save_as(path):
-                QMessageBox.information(self, "Success", f"Saved to:\n{path}")
-                self.setWindowTitle(f"PDF Editor Pro - {os.path.basename(path)}")
-            else:
-                QMessageBox.critical(self, "Error", "Cannot save file!")
+            self.start_save(path)
+
+    def start_save(self, new_path=None):
+        # The document is snapshotted here; compressing and writing run in SaveThread
+        if self.save_thread is not None:
+            return
+        job = self.pdf_model.begin_save(new_path, self.save_profile_box.currentData())
+        if job is None:
+            QMessageBox.critical(self, "Error", "Cannot save file!")
+            return
+        job['save_as'] = new_path is not None
+        self.save_job = job
+        self.set_editing_enabled(False)
+        self.save_progress.show()
+        self.save_profile_box.setEnabled(False)
+        self.statusBar().showMessage(f"Saving {os.path.basename(job['target'])} ({job['profile']})...")
+        self.save_thread = SaveThread(job)
+        self.save_thread.stage.connect(self.on_save_stage)
+        self.save_thread.save_done.connect(self.on_save_done)
+        self.save_thread.start()
+
+    def on_save_stage(self, stage):
+        labels = {"compress": "Compressing", "write": "Writing", "sync": "Flushing to disk", "replace": "Replacing file"}
+        self.statusBar().showMessage(f"Saving: {labels.get(stage, stage)}...")
+
+    def on_save_done(self, ok, error):
+        job, self.save_job = self.save_job, None
+        self.save_thread.wait()
+        self.save_thread = None
+        self.save_progress.hide()
+        try:
+            saved = self.pdf_model.finish_save(job, ok)
+        finally:
+            self.save_profile_box.setEnabled(True)
+            self.set_editing_enabled(True)
+        self.statusBar().clearMessage()
+        if not saved:
+            error = error or job.get('error')
+            QMessageBox.critical(self, "Error", f"Cannot save file!\n{error}" if error else "Cannot save file!")
+            return
+        # Reopened from the saved file: pages are rendered and indexed from it again
+        self.show_page()
+        self.start_search_index()
+        report = format_report(self.pdf_model.last_save_report)
+        self.statusBar().showMessage(f"Saved {report}", 10000)
+        if job['save_as']:
+            self.setWindowTitle(f"PDF Editor Pro - {os.path.basename(job['target'])}")
+            QMessageBox.information(self, "Success", f"Saved to:\n{job['target']}\n\n{report}")
+        else:
+            QMessageBox.information(self, "Success", f"File saved!\n\n{report}")
+
+    def set_editing_enabled(self, enabled):
+        if not enabled and self.annotation_mode is not None:
+            self.set_annotation_mode(None)
+        for action in self.edit_actions:
+            action.setEnabled(enabled)
 
     def print_pdf(self):
         if not self.pdf_model.doc:
@@ -329,29 +844,51 @@ class MainWindow(QMainWindow):
             self._do_print(printer)
 
     def _do_print(self, printer):
+        source_path, temporary = None, False
         try:
             from PyQt5.QtGui import QPainter
+            page_count = self.pdf_model.get_page_count()
+            source_path, temporary = self.pdf_model.create_render_source()
+
+            progress = QProgressDialog("Rendering pages...", "Cancel", 0, page_count, self)
+            progress.setWindowTitle("Print PDF")
+            progress.setWindowModality(Qt.WindowModal)
+
             painter = QPainter()
             painter.begin(printer)
-
-            for i in range(self.pdf_model.get_page_count()):
-                if i > 0:
-                    printer.newPage()
-
-                pix = self.pdf_model.get_pixmap_by_index(i, zoom=2.0)
-                if pix:
-                    img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-                    target_rect = printer.pageRect()
-                    scaled_img = QPixmap.fromImage(img).scaled(
-                        target_rect.width(), target_rect.height(),
-                        Qt.KeepAspectRatio, Qt.SmoothTransformation
-                    )
-                    painter.drawPixmap(0, 0, scaled_img)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+
+            # Pages are rasterized in parallel worker processes, in page order
+            with RenderFarm(source_path) as farm:
+                for done, rendered in enumerate(farm.render(range(page_count), zoom=2.0), start=1):
+                    with rendered:
+                        if done > 1:
+                            printer.newPage()
+                        # Drawn straight from shared memory, scaled by the painter
+                        img = buffer_to_qimage(rendered.samples, rendered.width, rendered.height,
+                                               rendered.stride, rendered.n)
+                        target_rect = printer.pageRect()
+                        size = img.size().scaled(target_rect.width(), target_rect.height(), Qt.KeepAspectRatio)
+                        painter.drawImage(QRect(0, 0, size.width(), size.height()), img)
+                        del img
+
+                    progress.setValue(done)
+                    QApplication.processEvents()
+                    if progress.wasCanceled():
+                        farm.cancel()
+                cancelled = farm.cancelled
 
             painter.end()
-            QMessageBox.information(self, "Success", "Document printed successfully!")
+            progress.close()
+            if cancelled:
+                self.statusBar().showMessage("Printing cancelled", 3000)
+            else:
+                QMessageBox.information(self, "Success", "Document printed successfully!")
         except Exception as e:
             QMessageBox.critical(self, "Print Error", f"Error printing: {e}")
+        finally:
+            if temporary and source_path and os.path.exists(source_path):
+                os.remove(source_path)
 
     def show_export_dialog(self):
         if not self.pdf_model.doc:
@@ -464,7 +1001,6 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.Yes:
             if self.pdf_model.delete_current_page():
-                self.load_thumbnails()
                 self.show_page()
 
     def delete_multiple_pages(self):
@@ -491,7 +1027,6 @@ class MainWindow(QMainWindow):
 
             if nums:
                 self.pdf_model.delete_pages(nums)
-                self.load_thumbnails()
                 self.show_page()
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Invalid input: {e}")
@@ -543,7 +1078,6 @@ class MainWindow(QMainWindow):
             else:
                 self.pdf_model.current_page = position
 
-            self.load_thumbnails()
             self.show_page()
             self.statusBar().showMessage(f"Added page at position {position + 1}", 2000)
 
@@ -572,7 +1106,6 @@ class MainWindow(QMainWindow):
             return
 
         if self.pdf_model.insert_page_after_current():
-            self.load_thumbnails()
             self.show_page()
             self.statusBar().showMessage(f"Inserted page after page {self.pdf_model.current_page}", 2000)
 
@@ -582,7 +1115,6 @@ class MainWindow(QMainWindow):
             return
 
         if self.pdf_model.insert_page_before_current():
-            self.load_thumbnails()
             self.show_page()
             self.statusBar().showMessage(f"Inserted page before page {self.pdf_model.current_page + 2}", 2000)
 
@@ -593,7 +1125,7 @@ class MainWindow(QMainWindow):
         dialog = QDialog(self)
         dialog.setWindowTitle("Search PDF")
         dialog.setModal(False)  # Non-modal để có thể tương tác với PDF
-        dialog.setFixedSize(400, 150)
+        dialog.setFixedSize(480, 180)
 
         layout = QVBoxLayout()
 
@@ -605,10 +1137,28 @@ class MainWindow(QMainWindow):
         self.search_input.setPlaceholderText("Enter text to search...")
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_input)
+        workers_spin = QSpinBox()
+        workers_spin.setRange(1, max(1, os.cpu_count() or 1))
+        workers_spin.setValue(self.search_workers)
+        workers_spin.setPrefix("Processes: ")
+        workers_spin.setToolTip("Large documents are split across this many processes")
+        workers_spin.valueChanged.connect(self.set_search_workers)
+        search_layout.addWidget(workers_spin)
         layout.addLayout(search_layout)
 
+        # Match options
+        options_layout = QHBoxLayout()
+        for name, label in (('match_case', "Match case"), ('whole_word', "Whole word"),
+                            ('ignore_accents', "Ignore accents"), ('regex', "Regex")):
+            checkbox = QCheckBox(label)
+            checkbox.setChecked(getattr(self.search_options, name))
+            checkbox.toggled.connect(lambda checked, name=name: self.set_search_option(name, checked))
+            options_layout.addWidget(checkbox)
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+
         # Result label
-        self.search_result_label = QLabel("Enter text and click Search")
+        self.search_result_label = QLabel("Type to search, results appear as you type")
         self.search_result_label.setStyleSheet("color: #666; font-style: italic;")
         layout.addWidget(self.search_result_label)
 
@@ -643,10 +1193,12 @@ class MainWindow(QMainWindow):
 
         # Connect Enter key
         self.search_input.returnPressed.connect(lambda: self.perform_search(dialog))
+        self.search_input.textEdited.connect(self.on_search_query_edited)
 
         dialog.show()
 
     def perform_search(self, dialog):
+        self.live_search_timer.stop()
         search_text = self.search_input.text().strip()
 
         if not search_text:
@@ -659,48 +1211,156 @@ class MainWindow(QMainWindow):
             self.search_result_label.setStyleSheet("color: #d9534f;")
             return
 
-        self.search_result_label.setText("Searching...")
-        self.search_result_label.setStyleSheet("color: #0275d8;")
-        dialog.repaint()
+        self.start_search(search_text)
+
+    def set_search_navigation_enabled(self, enabled):
+        self.find_prev_action.setEnabled(enabled)
+        self.find_next_action.setEnabled(enabled)
+        if self.dialog_prev_btn:
+            self.dialog_prev_btn.setEnabled(enabled)
+            self.dialog_next_btn.setEnabled(enabled)
+
+    def set_search_label(self, text, style):
+        if self.search_result_label:
+            self.search_result_label.setText(text)
+            self.search_result_label.setStyleSheet(style)
+
+    #  Streaming Search
+    def start_search(self, search_text):
+        # Any scan still running is cancelled; hits arrive page by page
+        self.cancel_search()
+        self.search_generation += 1
+        try:
+            compile_query(search_text, self.search_options)
+        except re.error as e:
+            self.set_search_label(f"Invalid regular expression: {e}", "color: #d9534f;")
+            return
+        job = self.pdf_model.begin_search(search_text, self.search_workers, self.search_options)
+        self.set_search_navigation_enabled(False)
+        self.update_search_overlay()
+        if job is None:
+            return
+
+        self.set_search_label("Searching...", "color: #0275d8;")
+        self.statusBar().showMessage("Searching...")
+        self.search_thread = SearchThread(job, self.search_generation, self.search_engine)
+        self.search_thread.page_results.connect(self.on_search_page_results)
+        self.search_thread.progress.connect(self.on_search_progress)
+        self.search_thread.page_texts.connect(self.on_search_page_texts)
+        self.search_thread.search_done.connect(self.on_search_done)
+        self.search_thread.start()
+
+    def cancel_search(self, wait=False):
+        thread = self.search_thread
+        if thread is None:
+            return
+        self.search_thread = None
+        thread.requestInterruption()
+        if wait:
+            thread.wait()
+            return
+        self._release_search_thread(thread)
+
+    def _release_search_thread(self, thread):
+        # Kept referenced until run() returns; its signals are ignored by generation
+        self._finishing_search_threads.add(thread)
+        thread.finished.connect(lambda: self._finishing_search_threads.discard(thread))
+
+    def on_search_query_edited(self, text):
+        # The running scan is for an older query; a new one starts once typing pauses
+        if self.search_thread is not None:
+            self.cancel_search()
+            self.search_generation += 1
+        self.live_search_timer.start()
+
+    def run_live_search(self):
+        if not self.search_input or not self.pdf_model.doc:
+            return
+        search_text = self.search_input.text().strip()
+        if len(search_text) >= SEARCH_AS_YOU_TYPE_MIN_CHARS:
+            self.start_search(search_text)
+            return
+        # Too short to search: drop the old results rather than leave them showing
+        self.pdf_model.clear_search()
+        self.set_search_navigation_enabled(False)
+        self.update_search_overlay()
+        self.set_search_label("Type to search, results appear as you type", "color: #666; font-style: italic;")
+
+    def on_search_page_results(self, generation, page_num, rects):
+        if generation != self.search_generation:
+            return
+        if self.pdf_model.add_search_results(page_num, rects):
+            # First hit: show it right away, the scan goes on in the background
+            self.set_search_navigation_enabled(True)
+            self.highlight_current_search_match()
+        elif page_num == self.pdf_model.current_page:
+            self.update_search_overlay()
+        self.update_search_status(searching=True)
+
+    def on_search_page_texts(self, source_key, texts):
+        # Kept even from an older generation: the text is valid while the source is the same
+        self.pdf_model.add_page_texts(source_key, texts)
 
-        results = self.pdf_model.search_text(search_text)
+    def on_search_progress(self, generation, scanned, total):
+        if generation == self.search_generation and not self.pdf_model.get_search_result_count():
+            self.set_search_label(f"Searching... {scanned}/{total} pages", "color: #0275d8;")
 
-        if results:
-            total = self.pdf_model.get_search_result_count()
-            self.search_result_label.setText(f"Found {total} match{'es' if total > 1 else ''}")
-            self.search_result_label.setStyleSheet("color: #5cb85c; font-weight: bold;")
+    def on_search_done(self, generation, completed):
+        if generation != self.search_generation:
+            return
+        # search_done is emitted from inside run(), which may not have returned yet
+        if self.search_thread is not None:
+            self._release_search_thread(self.search_thread)
+            self.search_thread = None
+        self.pdf_model.finish_search(completed)
+        total = self.pdf_model.get_search_result_count()
+        if total:
+            self.statusBar().showMessage(f"Found {total} match{'es' if total > 1 else ''}", 3000)
+            self.update_search_status(searching=False)
+        elif completed:
+            self.statusBar().showMessage("No matches found", 3000)
+            self.set_search_label("No matches found", "color: #d9534f;")
 
-            self.highlight_current_search_match()
-            self.find_prev_action.setEnabled(True)
-            self.find_next_action.setEnabled(True)
-            self.dialog_prev_btn.setEnabled(True)
-            self.dialog_next_btn.setEnabled(True)
-        else:
-            self.search_result_label.setText("No matches found")
-            self.search_result_label.setStyleSheet("color: #d9534f;")
-            self.find_prev_action.setEnabled(False)
-            self.find_next_action.setEnabled(False)
-            self.dialog_prev_btn.setEnabled(False)
-            self.dialog_next_btn.setEnabled(False)
+    def update_search_status(self, searching=False):
+        total = self.pdf_model.get_search_result_count()
+        match = self.pdf_model.get_current_search_match()
+        if not match:
+            return
+        more = "+" if searching else ""
+        current_idx = self.pdf_model.current_search_index
+        self.statusBar().showMessage(f"Match {current_idx + 1}/{total}{more} on page {match['page'] + 1}")
+        self.set_search_label(
+            f"Match {current_idx + 1} of {total}{more} (Page {match['page'] + 1})",
+            "color: #5cb85c; font-weight: bold;"
+        )
+
+    def start_search_index(self):
+        # Loads the stored index of this file, or builds one on a separate handle
+        self.stop_search_index()
+        if not self.pdf_model.file_path or not self.pdf_model.fingerprint:
+            return
+        self.index_thread = SearchIndexThread(
+            self.pdf_model.file_path, self.pdf_model.fingerprint, self.pdf_model.get_search_index_dir()
+        )
+        self.index_thread.index_ready.connect(self.on_search_index_ready)
+        self.index_thread.start()
+
+    def stop_search_index(self):
+        if self.index_thread is not None:
+            self.index_thread.requestInterruption()
+            self.index_thread.wait()
+            self.index_thread = None
+
+    def on_search_index_ready(self, index):
+        if self.pdf_model.set_search_index(index):
+            self.statusBar().showMessage("Search index ready", 2000)
 
     def search_text(self, search_text):
         if not self.pdf_model.doc:
             self.statusBar().showMessage("No PDF loaded", 2000)
             return
 
-        self.statusBar().showMessage("Searching...", 1000)
-        results = self.pdf_model.search_text(search_text)
-
-        if results:
-            total = self.pdf_model.get_search_result_count()
-            self.statusBar().showMessage(f"Found {total} match{'es' if total > 1 else ''}", 3000)
-            self.highlight_current_search_match()
-            self.find_prev_action.setEnabled(True)
-            self.find_next_action.setEnabled(True)
-        else:
-            self.statusBar().showMessage("No matches found", 3000)
-            self.find_prev_action.setEnabled(False)
-            self.find_next_action.setEnabled(False)
+        self.start_search(search_text)
 
     def highlight_current_search_match(self):
         match = self.pdf_model.get_current_search_match()
@@ -712,44 +1372,41 @@ class MainWindow(QMainWindow):
             self.pdf_model.current_page = match['page']
             self.show_page()
 
-        # Highlight in model (for persistence)
-        self.pdf_model.highlight_search_match(match)
-
-        # Get page and scale factors
-        page = self.pdf_model.get_current_page()
-        if page:
-            scale_x = self.pdf_view.displayed_width / page.rect.width
-            scale_y = self.pdf_view.displayed_height / page.rect.height
-
-            # Convert PDF rect to view coordinates
-            pdf_rect = match['rect']
-            from PyQt5.QtCore import QRectF
-            view_rect = QRectF(
-                pdf_rect.x0 * scale_x,
-                pdf_rect.y0 * scale_y,
-                pdf_rect.width * scale_x,
-                pdf_rect.height * scale_y
-            )
-
-            # Highlight immediately on view
-            self.pdf_view.highlight_search_rect(view_rect)
-
-            # Scroll to make visible
+        # Only the overlay changes, nothing is re-rendered
+        view_rect = self.update_search_overlay()
+        if view_rect is not None:
             self.scroll_to_rect(view_rect)
 
-        # Update status
-        total = self.pdf_model.get_search_result_count()
-        current_idx = self.pdf_model.current_search_index
-        self.statusBar().showMessage(
-            f"Match {current_idx + 1}/{total} on page {match['page'] + 1}"
-        )
+        self.update_search_status(searching=self.search_thread is not None)
 
-        # Update search dialog if exists
-        if hasattr(self, 'search_result_label') and self.search_result_label:
-            self.search_result_label.setText(
-                f"Match {current_idx + 1} of {total} (Page {match['page'] + 1})"
-            )
-            self.search_result_label.setStyleSheet("color: #5cb85c; font-weight: bold;")
+    def page_rect_to_view(self, page, rect):
+        # Search rects are unrotated page coordinates; the view shows the rotated page
+        r = fitz.Rect(rect) * page.rotation_matrix
+        scale_x = self.pdf_view.displayed_width / page.rect.width
+        scale_y = self.pdf_view.displayed_height / page.rect.height
+        return QRectF(r.x0 * scale_x, r.y0 * scale_y, r.width * scale_x, r.height * scale_y)
+
+    def update_search_overlay(self):
+        # Returns the view rect of the current match when it is on the displayed page
+        page = self.pdf_model.get_current_page()
+        if not page or self.view_mode != "single":
+            return None
+        idx = self.pdf_model.current_page
+        current = self.pdf_model.get_current_search_match()
+        self.pdf_view.set_overlay('search', [
+            self.page_rect_to_view(page, rect) for rect in self.pdf_model.get_page_search_rects(idx)
+        ])
+
+        current_rect = None
+        if current and current['page'] == idx:
+            # A match running over several lines is drawn line by line
+            current_rect = self.page_rect_to_view(page, current['rect'])
+            self.pdf_view.set_overlay('search_current', [
+                self.page_rect_to_view(page, rect) for rect in current['rects']
+            ])
+        else:
+            self.pdf_view.clear_overlay('search_current')
+        return current_rect
 
     def scroll_to_rect(self, rect):
         """Scroll to make the rect visible in the center of viewport"""
@@ -776,6 +1433,11 @@ class MainWindow(QMainWindow):
         v_scrollbar.setValue(max(0, scroll_y))
 
     def find_next(self):
+        if not self.pdf_model.get_search_result_count() and self.pdf_model.last_search_text:
+            # A query restored from the last session has not been run yet
+            if self.search_thread is None:
+                self.start_search(self.pdf_model.last_search_text)
+            return
         match = self.pdf_model.next_search_result()
         if match:
             self.highlight_current_search_match()
@@ -790,4 +1452,23 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Warning", "No PDF file loaded!")
             return
         dialog = SummarizeDialog(self, self.pdf_model)
-        dialog.exec_()
\ No newline at end of file
+        dialog.exec_()
+
+    def closeEvent(self, event):
+        if self.save_thread is not None:
+            # Let the write finish so the file on disk ends up with the saved changes
+            self.save_thread.wait()
+        self.live_search_timer.stop()
+        self.cancel_search(wait=True)
+        for thread in list(self._finishing_search_threads):
+            thread.wait()
+        self.search_engine.close()
+        self.stop_search_index()
+        self.library_panel.shutdown()
+        self.prefetcher.shutdown()
+        self.thumbnail_loader.shutdown()
+        self.thumbnail_cache.close()
+        self.bookmark_timer.stop()
+        self.save_session()
+        self.pdf_model.flush_bookmarks()
+        super().closeEvent(event)
@@ -1,9 +1,25 @@
 from PyQt5.QtWidgets import QLabel, QRubberBand
-from PyQt5.QtCore import Qt, QPoint, QRect, QSize
-from PyQt5.QtGui import QPixmap, QImage, QCursor, QPainter, QColor, QPen
+from PyQt5.QtCore import Qt, QPoint, QRect, QRectF, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QCursor, QPainter, QColor, QPen
+from utils.qt_image import pixmap_to_qimage
+from utils.spatial_index import RectGridIndex
+
+# Pages larger than this many pixels at the current zoom are rendered as tiles
+TILED_RENDER_MIN_PIXELS = 6_000_000
+TILE_SIZE = 512
+TILE_MARGIN = 1  # extra rings of tiles rendered around the viewport
+
+# Overlay layers are painted in this order, later layers on top
+OVERLAY_LAYERS = ('search', 'search_current')
+OVERLAY_STYLES = {
+    'search': (QColor(255, 230, 0, 80), None),
+    'search_current': (QColor(0, 255, 0, 100), QColor(0, 200, 0)),
+}
 
 
 class PDFViewWidget(QLabel):
+    page_painted = pyqtSignal()  # first paint after new content was set
+
     def __init__(self, parent=None, annotation_callback=None):
         super().__init__(parent)
         self.setAlignment(Qt.AlignCenter)
@@ -17,7 +33,18 @@ class PDFViewWidget(QLabel):
         self.displayed_height = 0
         self.text_rects = []
         self.page_rect = None
+        self._text_index = None
+        self._text_index_size = None
         self.current_pixmap = None  # Lưu pixmap hiện tại
+        self.current_image = None  # QImage over the fitz samples, painted directly
+        self.tile_provider = None
+        self.tile_size = TILE_SIZE
+        self.overlays = {}  # layer -> list of QRectF in page pixel coordinates
+        self._pending_tiles = []
+        self._tile_timer = QTimer(self)
+        self._tile_timer.setInterval(0)
+        self._tile_timer.timeout.connect(self._render_pending_tile)
+        self._notify_paint = False
 
     def set_selection_mode(self, enabled):
         self.selection_mode = enabled
@@ -61,7 +88,7 @@ class PDFViewWidget(QLabel):
             self.rubberBand.deleteLater()
             self.rubberBand = None
             if rubber_rect.width() > 10 and rubber_rect.height() > 10:
-                if not self.pixmap():
+                if not self.has_content():
                     return
                 pixmap_w = self.displayed_width
                 pixmap_h = self.displayed_height
@@ -89,64 +116,209 @@ class PDFViewWidget(QLabel):
         super().mouseReleaseEvent(event)
 
     def is_position_in_text(self, pos):
+        return self.text_region_at(pos) >= 0
+
+    def text_region_at(self, pos):
+        # Index into text_rects of the region under pos (widget coordinates), or -1
+        index = self.text_index()
+        if index is None:
+            return -1
+        offset_x, offset_y = self._page_offset()
+        return index.item_at(pos.x() - offset_x, pos.y() - offset_y)
+
+    def text_index(self):
+        # Grid over the text rects in view pixels, rebuilt only when the page or its size changes
         if not self.text_rects or not self.page_rect:
-            return False
-        sx = self.displayed_width / self.page_rect.width
-        sy = self.displayed_height / self.page_rect.height
-        for r in self.text_rects:
-            wr = QRect(int(r.x0 * sx), int(r.y0 * sy),
-                       max(1, int(r.width * sx)), max(1, int(r.height * sy)))
-            if wr.contains(pos):
-                return True
-        return False
+            return None
+        size = (self.displayed_width, self.displayed_height)
+        if self._text_index is None or self._text_index_size != size:
+            sx = self.displayed_width / self.page_rect.width
+            sy = self.displayed_height / self.page_rect.height
+            rects = [(r.x0 * sx, r.y0 * sy, max(r.x1 * sx, r.x0 * sx + 1), max(r.y1 * sy, r.y0 * sy + 1))
+                     for r in self.text_rects]
+            self._text_index = RectGridIndex(rects, *size)
+            self._text_index_size = size
+        return self._text_index
 
     def set_text_regions(self, rects, page_rect):
         self.text_rects = rects
         self.page_rect = page_rect
+        self._text_index = None
 
     def show_page(self, pixmap):
+        self._stop_tiling()
+        self.overlays = {}
         if not pixmap:
             self.clear()
             self.current_pixmap = None
             return
-        img = QImage(pixmap.samples, pixmap.width, pixmap.height, pixmap.stride, QImage.Format_RGB888)
-        qpixmap = QPixmap.fromImage(img)
 
-        # LƯU pixmap vào biến
-        self.current_pixmap = qpixmap
+        # The image shares the fitz samples; paintEvent draws it without conversion copies
+        self.current_pixmap = None
+        self.current_image = pixmap_to_qimage(pixmap)
+        self._set_display_size(self.current_image.width(), self.current_image.height())
+
+    def show_preview(self, qpixmap, width, height):
+        # Low resolution stand-in, stretched to the final page size
+        self._stop_tiling()
+        self.overlays = {}
+        self.current_image = None
+        self.current_pixmap = qpixmap.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self._set_display_size(width, height)
 
-        self.setPixmap(qpixmap)
-        self.displayed_width = qpixmap.width()
-        self.displayed_height = qpixmap.height()
-        self.setMinimumSize(qpixmap.size())
+    def has_content(self):
+        return bool(self.current_image or self.current_pixmap or self.tile_provider)
+
+    def _set_display_size(self, width, height):
+        super().clear()
+        self.displayed_width = width
+        self.displayed_height = height
+        self.setMinimumSize(width, height)
         self.updateGeometry()
+        self._notify_paint = True
         self.update()
 
-    def highlight_search_rect(self, rect):
-        if not self.current_pixmap or rect is None or rect.isEmpty():
-            return
+    #  Tiled Rendering
+    @staticmethod
+    def needs_tiling(width, height):
+        return width * height > TILED_RENDER_MIN_PIXELS
+
+    def show_tiled(self, width, height, tile_provider):
+        # tile_provider(tx, ty, tile_size) returns the fitz.Pixmap of one tile
+        self._stop_tiling()
+        super().clear()
+        self.overlays = {}
+        self.current_pixmap = None
+        self.current_image = None
+        self.tile_provider = tile_provider
+        self.displayed_width = width
+        self.displayed_height = height
+        self.setMinimumSize(width, height)
+        self.updateGeometry()
+        self._notify_paint = True
+        self.update()
 
-        pixmap_copy = self.current_pixmap.copy()
+    def _stop_tiling(self):
+        self.tile_provider = None
+        self._pending_tiles = []
+        self._tile_timer.stop()
 
-        painter = QPainter(pixmap_copy)
-        painter.setRenderHint(QPainter.Antialiasing)
+    def _page_offset(self):
+        return (max(0, (self.width() - self.displayed_width) // 2),
+                max(0, (self.height() - self.displayed_height) // 2))
 
-        highlight_color = QColor(0, 255, 0, 100)  # Green with alpha
-        painter.fillRect(rect, highlight_color)
+    def _tile_range(self, rect, margin=0):
+        ts = self.tile_size
+        cols = (self.displayed_width + ts - 1) // ts
+        rows = (self.displayed_height + ts - 1) // ts
+        x0 = max(0, rect.left() // ts - margin)
+        y0 = max(0, rect.top() // ts - margin)
+        x1 = min(cols - 1, rect.right() // ts + margin)
+        y1 = min(rows - 1, rect.bottom() // ts + margin)
+        return [(tx, ty) for ty in range(y0, y1 + 1) for tx in range(x0, x1 + 1)]
 
-        # Draw border
-        pen = QPen(QColor(0, 200, 0), 2)
-        painter.setPen(pen)
-        painter.drawRect(rect)
+    def paintEvent(self, event):
+        if not self.tile_provider:
+            super().paintEvent(event)
+            if self.current_image or self.current_pixmap:
+                offset_x, offset_y = self._page_offset()
+                painter = QPainter(self)
+                if self.current_image:
+                    painter.drawImage(offset_x, offset_y, self.current_image)
+                else:
+                    painter.drawPixmap(offset_x, offset_y, self.current_pixmap)
+                self._paint_overlays(painter, offset_x, offset_y)
+                painter.end()
+            self._emit_page_painted()
+            return
+
+        offset_x, offset_y = self._page_offset()
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.palette().window())
 
+        # Only tiles intersecting the exposed area are rendered here
+        exposed = event.rect().translated(-offset_x, -offset_y)
+        for tx, ty in self._tile_range(exposed):
+            pix = self.tile_provider(tx, ty, self.tile_size)
+            if pix is None or pix.width == 0 or pix.height == 0:
+                continue
+            painter.drawImage(offset_x + pix.x, offset_y + pix.y, pixmap_to_qimage(pix))
+
+        self._paint_overlays(painter, offset_x, offset_y)
         painter.end()
+        self._emit_page_painted()
+
+        # Warm the ring of tiles around the viewport while the event loop is idle
+        visible = self.visibleRegion().boundingRect().translated(-offset_x, -offset_y)
+        self._pending_tiles = self._tile_range(visible, TILE_MARGIN)
+        self._tile_timer.start()
+
+    def _emit_page_painted(self):
+        if self._notify_paint:
+            self._notify_paint = False
+            self.page_painted.emit()
+
+    def _render_pending_tile(self):
+        if not self.tile_provider or not self._pending_tiles:
+            self._tile_timer.stop()
+            return
+        tx, ty = self._pending_tiles.pop(0)
+        self.tile_provider(tx, ty, self.tile_size)
+
+    #  Overlay Layer
+    def set_overlay(self, layer, rects):
+        # Highlights are painted over the page; neither the image nor the PDF changes
+        if layer not in OVERLAY_STYLES:
+            raise ValueError(f"Unknown overlay layer: {layer}")
+        rects = [QRectF(r) for r in rects if r is not None and not r.isEmpty()]
+        old = self.overlays.pop(layer, [])
+        if rects:
+            self.overlays[layer] = rects
+        self._update_overlay_area(old + rects)
 
-        self.setPixmap(pixmap_copy)
+    def clear_overlay(self, layer=None):
+        if layer is None:
+            old = [r for rects in self.overlays.values() for r in rects]
+            self.overlays = {}
+        else:
+            old = self.overlays.pop(layer, [])
+        self._update_overlay_area(old)
+
+    def highlight_search_rect(self, rect):
+        self.set_overlay('search_current', [rect])
+
+    def _update_overlay_area(self, rects):
+        if not rects:
+            return
+        offset_x, offset_y = self._page_offset()
+        area = QRectF(rects[0])
+        for r in rects[1:]:
+            area = area.united(r)
+        # Pad for the border pen and antialiasing
+        self.update(area.toAlignedRect().adjusted(-2, -2, 2, 2).translated(offset_x, offset_y))
+
+    def _paint_overlays(self, painter, offset_x, offset_y):
+        if not self.overlays:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.translate(offset_x, offset_y)
+        for layer in sorted(self.overlays, key=OVERLAY_LAYERS.index):
+            fill, border = OVERLAY_STYLES[layer]
+            painter.setPen(QPen(border, 2) if border else Qt.NoPen)
+            painter.setBrush(fill)
+            for rect in self.overlays[layer]:
+                painter.drawRect(rect)
+        painter.restore()
 
     def clear(self):
+        self._stop_tiling()
         super().clear()
         self.current_pixmap = None
+        self.current_image = None
+        self.overlays = {}
         self.text_rects = []
         self.page_rect = None
+        self._text_index = None
         self.displayed_width = 0
         self.displayed_height = 0
\ No newline at end of file
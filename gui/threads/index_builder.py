@@ -0,0 +1,36 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.search_index import SearchIndex, index_path
+
+
+class SearchIndexThread(QThread):
+    index_ready = pyqtSignal(object)  # SearchIndex
+    progress = pyqtSignal(int, int)  # pages indexed, page count
+
+    def __init__(self, path, fingerprint, index_dir):
+        super().__init__()
+        self.path = path
+        self.fingerprint = fingerprint
+        self.index_dir = index_dir
+
+    def run(self):
+        # Works on its own fitz handle; the GUI document is never touched here
+        stored = index_path(self.index_dir, self.fingerprint)
+        index = SearchIndex.load(stored, self.fingerprint)
+        if index is None:
+            try:
+                index = SearchIndex.build(
+                    self.path, self.fingerprint,
+                    cancelled=self.isInterruptionRequested,
+                    progress=self.progress.emit
+                )
+            except Exception as e:
+                print(f"Error building search index: {e}")
+                return
+            if index is None:
+                return
+            try:
+                index.save(stored)
+            except Exception as e:
+                print(f"Error saving search index: {e}")
+        if not self.isInterruptionRequested():
+            self.index_ready.emit(index)
@@ -0,0 +1,24 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.library_index import LibraryIndex
+
+
+class LibraryIndexThread(QThread):
+    progress = pyqtSignal(int, int, str)  # files checked, file count, current path
+    index_done = pyqtSignal(object)  # change counts, None when cancelled or failed
+
+    def __init__(self, db_path, folder):
+        super().__init__()
+        self.db_path = db_path
+        self.folder = folder
+
+    def run(self):
+        # SQLite connections are per thread, so the crawl opens its own
+        try:
+            with LibraryIndex(self.db_path) as library:
+                stats = library.update(
+                    self.folder, cancelled=self.isInterruptionRequested, progress=self.progress.emit
+                )
+        except Exception as e:
+            print(f"Error indexing library {self.folder}: {e}")
+            stats = None
+        self.index_done.emit(stats)
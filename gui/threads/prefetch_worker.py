@@ -0,0 +1,98 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import pymupdf as fitz
+import threading
+
+
+_thread_state = threading.local()
+
+
+def _worker_document(path, source_version):
+    # Each pool thread keeps its own fitz handle, reopened when the file changes
+    docs = getattr(_thread_state, 'docs', None)
+    if docs is None:
+        docs = _thread_state.docs = {}
+
+    key = (path, source_version)
+    doc = docs.get(key)
+    if doc is None:
+        for stale in list(docs):
+            if stale[0] == path:
+                docs.pop(stale).close()
+        doc = docs[key] = fitz.open(path)
+    return doc
+
+
+def render_job(job):
+    doc = _worker_document(job['path'], job['source_version'])
+    page = doc[job['source_page']]
+    if page.rotation != job['rotation']:
+        page.set_rotation(job['rotation'])
+    mat = fitz.Matrix(job['zoom'], job['zoom'])
+    return page.get_pixmap(matrix=mat, colorspace=fitz.csRGB, annots=True)
+
+
+class PageRenderTask(QRunnable):
+    def __init__(self, prefetcher, generation, page_index, job):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.generation = generation
+        self.page_index = page_index
+        self.job = job
+
+    def run(self):
+        if self.prefetcher.generation != self.generation:
+            return
+        try:
+            pixmap = render_job(self.job)
+        except Exception as e:
+            print(f"Error prefetching page {self.page_index}: {e}")
+            return
+
+        # Pages may have been inserted or removed while rendering
+        if self.prefetcher.generation != self.generation:
+            return
+        self.prefetcher.cache.put(self.job['key'], pixmap, prefetched=True)
+        self.prefetcher.page_rendered.emit(self.page_index, self.job['zoom'])
+
+
+class PagePrefetcher(QObject):
+    page_rendered = pyqtSignal(int, float)  # page_index, zoom
+
+    def __init__(self, pdf_model, depth=2, max_threads=None):
+        super().__init__()
+        self.pdf_model = pdf_model
+        self.cache = pdf_model.page_cache
+        self.depth = depth
+        self.generation = 0
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads or min(4, QThreadPool.globalInstance().maxThreadCount()))
+
+    def cancel(self):
+        self.generation += 1
+        self.pool.clear()
+
+    def schedule(self, center, zoom):
+        # Jumping elsewhere drops every queued render of the previous neighbourhood
+        self.cancel()
+        count = self.pdf_model.get_page_count()
+        for distance in range(1, self.depth + 1):
+            for idx in (center + distance, center - distance):
+                if 0 <= idx < count:
+                    self.submit(idx, zoom)
+
+    def submit(self, idx, zoom, priority=0):
+        job = self.pdf_model.get_prefetch_job(idx, zoom)
+        if job is None:
+            return False
+        self.pool.start(PageRenderTask(self, self.generation, idx, job), priority)
+        return True
+
+    def stats(self):
+        stats = self.cache.stats()
+        lookups = stats['hits'] + stats['misses']
+        stats['prefetch_ratio'] = stats['prefetch_hits'] / lookups if lookups else 0.0
+        return stats
+
+    def shutdown(self):
+        self.cancel()
+        self.pool.waitForDone()
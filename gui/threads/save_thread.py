@@ -0,0 +1,24 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from core.atomic_save import write_snapshot
+
+
+class SaveThread(QThread):
+    stage = pyqtSignal(str)  # images, fonts, compress, write, sync, replace
+    save_done = pyqtSignal(bool, str)  # saved, error message
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+
+    def run(self):
+        # Only the snapshot bytes are used here; the GUI document is never touched
+        try:
+            self.job['output_bytes'] = write_snapshot(self.job['data'], self.job['target'], self.job['profile'],
+                                                      stage=self.stage.emit)
+        except Exception as e:
+            print(f"Error saving {self.job['target']}: {e}")
+            self.save_done.emit(False, str(e))
+            return
+        finally:
+            self.job['data'] = None
+        self.save_done.emit(True, "")
@@ -0,0 +1,139 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+import pymupdf as fitz
+import os
+import tempfile
+from core.parallel_search import ParallelSearch
+from core.search_engine import PLAIN_SEARCH, compile_query
+from core.text_cache import TEXTPAGE_FLAGS
+
+PROGRESS_EVERY_PAGES = 25
+
+
+class SearchThread(QThread):
+    page_results = pyqtSignal(int, int, list)  # generation, page_index, [fitz.Rect] or [[line rect]]
+    progress = pyqtSignal(int, int, int)  # generation, pages scanned, pages to scan
+    search_done = pyqtSignal(int, bool)  # generation, completed (False when cancelled)
+    # source key, {page_index: plain text} of pages extracted while scanning, for the model's text cache
+    page_texts = pyqtSignal(object, dict)
+
+    def __init__(self, job, generation, engine=None):
+        super().__init__()
+        self.job = job
+        self.generation = generation
+        self.engine = engine
+
+    def run(self):
+        if self.job.get('options', PLAIN_SEARCH) != PLAIN_SEARCH and self.engine is not None:
+            self._run_engine()
+            return
+        if self.job.get('workers', 1) > 1:
+            self._run_parallel()
+            return
+
+        # Scans on its own handle: the file on disk, or a snapshot of unsaved edits
+        try:
+            if self.job['path']:
+                doc = fitz.open(self.job['path'])
+            else:
+                doc = fitz.open(stream=self.job['stream'], filetype="pdf")
+        except Exception as e:
+            print(f"Error opening document for search: {e}")
+            self.search_done.emit(self.generation, False)
+            return
+
+        text = self.job['text']
+        pages = self.job['pages']
+        texts = {}
+        with doc:
+            for scanned, page_num in enumerate(pages, 1):
+                if self.isInterruptionRequested():
+                    self._emit_texts(texts)
+                    self.search_done.emit(self.generation, False)
+                    return
+                try:
+                    page = doc[page_num]
+                    textpage = page.get_textpage(flags=TEXTPAGE_FLAGS)
+                    rects = page.search_for(text, textpage=textpage)
+                    texts[page_num] = textpage.extractText()
+                except Exception as e:
+                    print(f"Error searching page {page_num}: {e}")
+                    rects = []
+                if rects:
+                    self.page_results.emit(self.generation, page_num, rects)
+                if rects or scanned % PROGRESS_EVERY_PAGES == 0:
+                    self.progress.emit(self.generation, scanned, len(pages))
+                if len(texts) >= PROGRESS_EVERY_PAGES:
+                    texts = self._emit_texts(texts)
+        self._emit_texts(texts)
+        self.search_done.emit(self.generation, True)
+
+    def _emit_texts(self, texts):
+        if texts:
+            self.page_texts.emit(self.job['source_key'], texts)
+        return {}
+
+    def _run_parallel(self):
+        # Worker processes open the document by path, so a snapshot goes to a temp file
+        path, temp_path = self.job['path'], None
+        try:
+            if path is None:
+                fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(self.job['stream'])
+                path = temp_path
+
+            pages = self.job['pages']
+            completed = True
+            scanned = 0
+            with ParallelSearch(path, self.job['workers']) as search:
+                # Shards finish in any order; the model inserts hits by page
+                for shard_pages, hits, texts in search.search_shards(self.job['text'], pages, keep_text=True):
+                    self._emit_texts(texts)
+                    if self.isInterruptionRequested():
+                        search.cancel()
+                        completed = False
+                        break
+                    for page_num, rects in hits:
+                        self.page_results.emit(self.generation, page_num, [fitz.Rect(r) for r in rects])
+                    scanned += shard_pages
+                    self.progress.emit(self.generation, scanned, len(pages))
+            self.search_done.emit(self.generation, completed)
+        except Exception as e:
+            print(f"Error in parallel search: {e}")
+            self.search_done.emit(self.generation, False)
+        finally:
+            if temp_path:
+                os.remove(temp_path)
+
+    def _run_engine(self):
+        # Regex / whole-word / folded matching over the engine's cached character layers
+        options = self.job['options']
+        pages = self.job['pages']
+        texts = {}
+        with self.engine.lock:
+            try:
+                pattern = compile_query(self.job['text'], options)
+                self.engine.open(self.job['source_key'], self.job['path'], self.job['stream'])
+            except Exception as e:
+                print(f"Error starting search: {e}")
+                self.search_done.emit(self.generation, False)
+                return
+
+            for scanned, page_num in enumerate(pages, 1):
+                if self.isInterruptionRequested():
+                    self._emit_texts(texts)
+                    self.search_done.emit(self.generation, False)
+                    return
+                try:
+                    matches = self.engine.search_page(page_num, pattern, options, texts)
+                except Exception as e:
+                    print(f"Error searching page {page_num}: {e}")
+                    matches = []
+                if matches:
+                    self.page_results.emit(self.generation, page_num, matches)
+                if matches or scanned % PROGRESS_EVERY_PAGES == 0:
+                    self.progress.emit(self.generation, scanned, len(pages))
+                if len(texts) >= PROGRESS_EVERY_PAGES:
+                    texts = self._emit_texts(texts)
+        self._emit_texts(texts)
+        self.search_done.emit(self.generation, True)
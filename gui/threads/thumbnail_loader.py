@@ -0,0 +1,71 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from gui.threads.prefetch_worker import render_job
+
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, loader, generation, page_index, job):
+        super().__init__()
+        self.loader = loader
+        self.generation = generation
+        self.page_index = page_index
+        self.job = job
+
+    def run(self):
+        if self.loader.generation != self.generation:
+            return
+        try:
+            pixmap = render_job(self.job)
+        except Exception as e:
+            print(f"Error rendering thumbnail {self.page_index}: {e}")
+            return
+        if self.loader.generation == self.generation:
+            self.loader.thumbnail_ready.emit(self.page_index, pixmap, self.generation)
+
+
+class ThumbnailLoader(QObject):
+    thumbnail_ready = pyqtSignal(int, object, int)  # page_index, fitz.Pixmap, generation
+
+    def __init__(self, pdf_model, zoom, max_threads=2):
+        super().__init__()
+        self.pdf_model = pdf_model
+        self.zoom = zoom
+        self.generation = 0
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self._pending = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._render_next_pending)
+
+    def reset(self):
+        self.generation += 1
+        self.pool.clear()
+        self._pending = []
+        self._timer.stop()
+
+    def request(self, rows):
+        # rows are in priority order; anything queued earlier is replaced
+        self.pool.clear()
+        self._pending = []
+        for order, idx in enumerate(rows):
+            job = self.pdf_model.get_render_job(idx, self.zoom)
+            if job is None:
+                self._pending.append(idx)
+            else:
+                self.pool.start(ThumbnailTask(self, self.generation, idx, job), len(rows) - order)
+        if self._pending:
+            self._timer.start()
+
+    def _render_next_pending(self):
+        # Edited pages are rendered from the live document, one per event loop turn
+        if not self._pending:
+            self._timer.stop()
+            return
+        idx = self._pending.pop(0)
+        pixmap = self.pdf_model.get_pixmap_by_index(idx, zoom=self.zoom)
+        if pixmap:
+            self.thumbnail_ready.emit(idx, pixmap, self.generation)
+
+    def shutdown(self):
+        self.reset()
+        self.pool.waitForDone()
@@ -0,0 +1,27 @@
+import pymupdf as fitz
+import pytest
+
+
+def make_pdf(path, pages=5, text="page {n}", **save_options):
+    doc = fitz.open()
+    for n in range(pages):
+        doc.new_page().insert_text((72, 72), text.format(n=n))
+    doc.save(path, **save_options)
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    return make_pdf(tmp_path / "sample.pdf")
+
+
+@pytest.fixture
+def model(tmp_path, monkeypatch, sample_pdf):
+    # PDFModel keeps its bookmark file in the working directory
+    monkeypatch.chdir(tmp_path)
+    from core.pdf_model import PDFModel
+    model = PDFModel()
+    model.load_pdf(sample_pdf)
+    yield model
+    model.doc.close()
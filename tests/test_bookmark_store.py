@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+import core.bookmark_store as bookmark_store
+from core.bookmark_store import BookmarkStore, BOOKMARKS_VERSION
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "bookmarks.json")
+
+
+def test_updates_stay_in_memory_until_flush(path):
+    store = BookmarkStore(path)
+    for page in range(100):
+        store.set("fp", "/docs/a.pdf", page)
+    assert store.writes == 0 and store.dirty
+    assert store.flush()
+    assert store.writes == 1
+    assert store.flush() and store.writes == 1  # nothing changed since
+    store.set("fp", "/docs/a.pdf", 99)
+    assert not store.dirty
+
+
+def test_flush_round_trip(path):
+    store = BookmarkStore(path)
+    store.set("fp", "/docs/a.pdf", 7)
+    store.set_state("fp", "/docs/a.pdf", {'zoom': 1.5})
+    store.flush()
+    reloaded = BookmarkStore(path)
+    assert reloaded.get("fp") == 7
+    assert reloaded.get_state("fp") == {'zoom': 1.5}
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['version'] == BOOKMARKS_VERSION
+
+
+def test_failed_flush_keeps_old_file_and_stays_dirty(path, monkeypatch):
+    store = BookmarkStore(path)
+    store.set("fp", "/docs/a.pdf", 1)
+    store.flush()
+    with open(path, 'rb') as f:
+        before = f.read()
+
+    def broken_dump(*args, **kwargs):
+        raise OSError("disk full")
+
+    store.set("fp", "/docs/a.pdf", 2)
+    monkeypatch.setattr(bookmark_store.json, "dump", broken_dump)
+    assert not store.flush()
+    assert store.dirty
+    with open(path, 'rb') as f:
+        assert f.read() == before
+
+
+def test_new_content_at_same_path_inherits_the_entry(path):
+    store = BookmarkStore(path)
+    store.set("old", "/docs/a.pdf", 12)
+    assert store.get("new", "/docs/a.pdf") == 12  # saved file, new fingerprint
+    store.set("new", "/docs/a.pdf", 13)
+    assert "old" not in store.entries
+    assert store.get("new") == 13
+
+
+def test_legacy_format_is_read_and_converted(path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"/docs/a.pdf": 4, "/docs/b.pdf": 9}, f)
+    store = BookmarkStore(path)
+    assert store.get("fp", "/docs/a.pdf") == 4
+    store.set_state("fp", "/docs/a.pdf", {'zoom': 2.0})
+    assert store.get("fp") == 4
+    store.flush()
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['legacy'] == {"/docs/b.pdf": 9}
+
+
+def test_flush_keeps_most_recent_entries(path, monkeypatch):
+    monkeypatch.setattr(bookmark_store, "MAX_BOOKMARKS", 2)
+    store = BookmarkStore(path)
+    for n in range(3):
+        store.set(f"fp{n}", f"/docs/{n}.pdf", n)
+        store.entries[f"fp{n}"]['updated'] = n
+    store.flush()
+    assert sorted(store.entries) == ["fp1", "fp2"]
@@ -0,0 +1,78 @@
+import os
+import sqlite3
+
+import pytest
+
+from core.library_index import LibraryIndex, fts_query
+from tests.conftest import make_pdf
+
+
+def test_words_and_phrases_are_quoted():
+    assert fts_query('alpha "beta gamma"') == '"alpha" "beta gamma"'
+
+
+def test_query_syntax_in_input_is_literal():
+    assert fts_query('NOT a-b (c) OR') == '"NOT" "a-b" "(c)" "OR"'
+    assert fts_query('say"hi') == '"say""hi"'
+
+
+def test_trailing_star_keeps_prefix_meaning():
+    assert fts_query('photo*') == '"photo"*'
+    assert fts_query('"photo*"') == '"photo*"'
+
+
+def test_empty_terms_are_dropped():
+    assert fts_query('  ""  *  ') == ''
+
+
+@pytest.fixture
+def library(tmp_path):
+    try:
+        library = LibraryIndex(str(tmp_path / "library.sqlite"))
+    except sqlite3.OperationalError as e:
+        pytest.skip(f"SQLite without FTS5: {e}")
+    yield library
+    library.close()
+
+
+def test_index_search_and_incremental_update(tmp_path, library):
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    make_pdf(folder / "a.pdf", pages=3, text="alpha page {n}")
+    make_pdf(folder / "b.pdf", pages=2, text="beta crème brûlée {n}")
+
+    stats = library.update(str(folder))
+    assert (stats['added'], stats['failed']) == (2, 0)
+    assert library.stats() == {'documents': 2, 'pages': 5}
+
+    hits = library.search("alpha page")
+    assert {hit.page for hit in hits} == {0, 1, 2}
+    assert all(os.path.basename(hit.path) == "a.pdf" for hit in hits)
+    assert library.search("creme brulee")  # accents folded
+
+    os.rename(folder / "a.pdf", folder / "moved.pdf")
+    os.remove(folder / "b.pdf")
+    stats = library.update(str(folder))
+    assert (stats['moved'], stats['removed'], stats['added']) == (1, 1, 0)
+    assert os.path.basename(library.search("alpha")[0].path) == "moved.pdf"
+    assert library.search("beta") == []
+
+
+def test_unreadable_update_keeps_indexed_text(tmp_path, library):
+    folder = tmp_path / "pdfs"
+    folder.mkdir()
+    path = folder / "a.pdf"
+    make_pdf(path, pages=2, text="alpha page {n}")
+    library.update(str(folder))
+
+    path.write_bytes(b"not a pdf at all")
+    stats = library.update(str(folder))
+    assert (stats['failed'], stats['updated']) == (1, 0)
+    assert library.stats() == {'documents': 1, 'pages': 2}
+    assert {hit.page for hit in library.search("alpha")} == {0, 1}
+
+    # Still marked stale, so the next scan tries again once the file is fixed
+    make_pdf(path, pages=1, text="gamma page {n}")
+    stats = library.update(str(folder))
+    assert stats['updated'] == 1
+    assert library.search("alpha") == [] and library.search("gamma")
@@ -0,0 +1,63 @@
+from core.page_cache import PageCache
+
+
+class FakePixmap:
+    def __init__(self, nbytes):
+        self.stride = nbytes
+        self.height = 1
+
+
+def test_evicts_least_recently_used_over_budget():
+    cache = PageCache(max_bytes=300)
+    for key in "abc":
+        cache.put(key, FakePixmap(100))
+    cache.get("a")  # a is now the most recently used
+    cache.put("d", FakePixmap(100))
+    assert not cache.contains("b")
+    assert all(cache.contains(k) for k in "acd")
+    assert cache.stats()['bytes'] == 300
+
+
+def test_oversized_pixmap_is_not_kept():
+    cache = PageCache(max_bytes=100)
+    cache.put("a", FakePixmap(50))
+    cache.put("big", FakePixmap(101))
+    assert cache.contains("a") and not cache.contains("big")
+
+
+def test_replacing_a_key_updates_byte_count():
+    cache = PageCache(max_bytes=1000)
+    cache.put("a", FakePixmap(100))
+    cache.put("a", FakePixmap(40))
+    assert cache.stats()['bytes'] == 40 and len(cache) == 1
+
+
+def test_shrinking_budget_evicts():
+    cache = PageCache(max_bytes=1000)
+    for key in "abcd":
+        cache.put(key, FakePixmap(100))
+    cache.set_max_bytes(250)
+    assert [cache.contains(k) for k in "abcd"] == [False, False, True, True]
+
+
+def test_prefetched_hit_counted_once():
+    cache = PageCache(max_bytes=1000)
+    cache.put("pre", FakePixmap(10), prefetched=True)
+    cache.put("own", FakePixmap(10))
+    cache.get("pre")
+    cache.get("pre")
+    cache.get("own")
+    cache.get("missing")
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['prefetch_hits']) == (3, 1, 1)
+    cache.reset_stats()
+    assert cache.stats()['hits'] == 0
+
+
+def test_evicted_prefetch_is_not_counted():
+    cache = PageCache(max_bytes=10)
+    cache.put("pre", FakePixmap(10), prefetched=True)
+    cache.put("other", FakePixmap(10))
+    cache.put("pre", FakePixmap(10))
+    cache.get("pre")
+    assert cache.stats()['prefetch_hits'] == 0
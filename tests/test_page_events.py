@@ -0,0 +1,67 @@
+import pymupdf as fitz
+import pytest
+
+from core.page_events import PAGES_INSERTED, PAGES_MODIFIED, PAGES_REMOVED, PAGES_ROTATED, PageChange
+
+
+@pytest.fixture
+def events(model):
+    received = []
+    model.add_change_listener(received.append)
+    return received
+
+
+def test_rotations(model, events):
+    model.current_page = 2
+    model.rotate_current_page(90)
+    model.rotate_all_pages(90)
+    assert events == [PageChange(PAGES_ROTATED, [2]), PageChange(PAGES_ROTATED, [0, 1, 2, 3, 4])]
+
+
+def test_annotation_edit_and_delete(model, events):
+    model.current_page = 1
+    rect = fitz.Rect(50, 50, 150, 100)
+    assert model.add_highlight_annotation(rect)
+    assert model.erase_annotation(point=fitz.Point(100, 75))
+    assert not model.erase_annotation(point=fitz.Point(400, 400))  # nothing there, no event
+    assert events == [PageChange(PAGES_MODIFIED, [1]), PageChange(PAGES_MODIFIED, [1])]
+
+
+def test_page_insert_and_delete(model, events):
+    model.current_page = 1
+    model.insert_page_after_current()
+    model.delete_pages([4, 0, 4])
+    model.current_page = 3
+    model.delete_current_page()
+    assert events == [
+        PageChange(PAGES_INSERTED, [2]),
+        PageChange(PAGES_REMOVED, [0, 4]),  # positions before the removal, once each
+        PageChange(PAGES_REMOVED, [3]),
+    ]
+    assert model.get_page_count() == 3
+
+
+def test_failing_listener_does_not_stop_the_others(model, events, capsys):
+    def broken(event):
+        raise RuntimeError("listener bug")
+
+    later = []
+    model.change_listeners.insert(0, broken)
+    model.add_change_listener(later.append)
+    model.rotate_current_page(90)
+    assert events == later == [PageChange(PAGES_ROTATED, [0])]
+    assert "listener bug" in capsys.readouterr().out
+
+
+def test_removed_listener_gets_nothing(model, events):
+    model.remove_change_listener(events.append)
+    model.rotate_current_page(90)
+    assert events == []
+
+
+def test_erasing_annotations_in_a_rect(model, events):
+    model.add_highlight_annotation(fitz.Rect(50, 50, 150, 100))
+    model.add_highlight_annotation(fitz.Rect(50, 200, 150, 250))
+    assert model.erase_annotations_in_rect(fitz.Rect(0, 0, 300, 300)) == 2
+    assert model.clear_all_annotations_on_page() == 0
+    assert events == [PageChange(PAGES_MODIFIED, [0])] * 3
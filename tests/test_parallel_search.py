@@ -0,0 +1,20 @@
+from core.parallel_search import shard_pages
+
+
+def test_shards_are_contiguous_and_keep_order():
+    pages = [5, 6, 7, 0, 1, 2, 3]  # scan order wrapping around the current page
+    shards = shard_pages(pages, 3)
+    assert [p for shard in shards for p in shard] == pages
+    assert [len(s) for s in shards] == [3, 2, 2]
+
+
+def test_never_more_shards_than_pages():
+    assert shard_pages([1, 2], 8) == [[1], [2]]
+
+
+def test_at_least_one_shard():
+    assert shard_pages(range(4), 0) == [[0, 1, 2, 3]]
+
+
+def test_no_pages_no_shards():
+    assert shard_pages([], 4) == []
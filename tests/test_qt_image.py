@@ -0,0 +1,41 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import pymupdf as fitz
+from PyQt5.QtGui import QColor, QImage
+
+from utils.qt_image import buffer_to_qimage, pixmap_to_qimage
+
+
+@pytest.fixture
+def red_page():
+    doc = fitz.open()
+    page = doc.new_page(width=40, height=40)
+    page.draw_rect(fitz.Rect(0, 0, 40, 40), color=None, fill=(1, 0, 0))
+    yield page
+    doc.close()
+
+
+@pytest.mark.parametrize("colorspace, alpha, fmt", [
+    (fitz.csRGB, False, QImage.Format_RGB888),
+    (fitz.csRGB, True, QImage.Format_RGBA8888_Premultiplied),
+    (fitz.csGRAY, False, QImage.Format_Grayscale8),
+])
+def test_format_follows_colorspace(red_page, colorspace, alpha, fmt):
+    img = pixmap_to_qimage(red_page.get_pixmap(colorspace=colorspace, alpha=alpha))
+    assert img.format() == fmt
+
+
+def test_cmyk_pixmap_is_converted_to_rgb(red_page):
+    img = pixmap_to_qimage(red_page.get_pixmap(colorspace=fitz.csCMYK))
+    assert img.format() == QImage.Format_RGB888
+    color = QColor(img.pixel(10, 10))
+    # CMYK red does not round-trip exactly, but must stay red rather than
+    # being read as RGBX samples
+    assert color.red() > 200 and color.green() < 80 and color.blue() < 80
+
+
+def test_unsupported_buffer_layout_is_rejected():
+    with pytest.raises(ValueError):
+        buffer_to_qimage(bytes(16), 2, 2, 8, n=4, alpha=False)
@@ -0,0 +1,37 @@
+def test_key_changes_when_page_is_edited(model):
+    key = model.render_cache_key(0, 1.0)
+    assert model.add_highlight_annotation((72, 60, 200, 80))
+    assert model.render_cache_key(0, 1.0) != key
+
+
+def test_inserted_page_does_not_reuse_old_key(model):
+    old_first = model.render_cache_key(0, 1.0)
+    model.add_new_page(0)
+    assert model.render_cache_key(0, 1.0) != old_first
+    assert model.render_cache_key(1, 1.0) != old_first
+
+
+def test_late_render_of_removed_layout_misses(model):
+    # A render started before the delete stores under the old key and must not be served
+    stale_key = model.render_cache_key(1, 1.0)
+    model.delete_pages([0])
+    model.page_cache.put(stale_key, _FakePixmap())
+    assert not model.is_page_cached(0, 1.0)
+    assert not model.is_page_cached(1, 1.0)
+
+
+def test_key_is_stable_without_changes(model):
+    assert model.render_cache_key(2, 1.5) == model.render_cache_key(2, 1.5)
+    assert model.render_cache_key(2, 1.5) != model.render_cache_key(2, 2.0)
+
+
+def test_prefetch_job_skips_edited_and_inserted_pages(model):
+    assert model.get_render_job(0, 1.0) is not None
+    model.add_new_page(0)
+    assert model.get_render_job(0, 1.0) is None
+    assert model.get_render_job(1, 1.0)['source_page'] == 0
+
+
+class _FakePixmap:
+    stride = 4
+    height = 1
@@ -0,0 +1,68 @@
+import pymupdf as fitz
+import pytest
+
+ZOOM = 1.5
+TILE_SIZE = 128
+
+
+@pytest.fixture
+def drawn_model(model, tmp_path):
+    # Text, vector art and an annotation on every page, each page turned differently
+    path = str(tmp_path / "drawn.pdf")
+    doc = fitz.open()
+    for n, rotation in enumerate((0, 90, 180, 270)):
+        page = doc.new_page(width=300, height=200)
+        page.insert_text((20, 40), f"page {n} crème brûlée", fontsize=14)
+        page.draw_circle((150, 120), 50, color=(0, 0, 1), fill=(1, 0.5, 0), width=3)
+        page.draw_line((0, 0), (300, 200), color=(1, 0, 0), width=2)
+        page.add_highlight_annot(page.search_for("crème")[0])
+        page.set_rotation(rotation)
+    doc.save(path)
+    doc.close()
+    model.doc.close()
+    model.load_pdf(path)
+    return model
+
+
+def reference(model, idx, clip=None):
+    page = model.doc[idx]
+    return page.get_pixmap(matrix=fitz.Matrix(ZOOM, ZOOM), clip=clip, colorspace=fitz.csRGB, annots=True)
+
+
+@pytest.mark.parametrize("idx", range(4))
+def test_display_list_render_matches_get_pixmap(drawn_model, idx):
+    expected = reference(drawn_model, idx)
+    for _ in range(2):  # the second render replays the cached display list
+        pixmap = drawn_model._render_page(idx, ZOOM)
+        assert pixmap.irect == expected.irect
+        assert pixmap.samples == expected.samples
+    assert idx in drawn_model._display_lists
+
+
+@pytest.mark.parametrize("idx", range(4))
+def test_tiles_match_get_pixmap(drawn_model, idx):
+    full = reference(drawn_model, idx)
+    stitched = fitz.Pixmap(fitz.csRGB, full.irect, False)
+    stitched.clear_with(0)
+    page_rect = drawn_model.doc[idx].rect
+    for ty in range(-(-full.height // TILE_SIZE)):
+        for tx in range(-(-full.width // TILE_SIZE)):
+            tile = drawn_model.get_tile_pixmap(idx, ZOOM, tx, ty, TILE_SIZE)
+            clip = fitz.Rect(tx, ty, tx + 1, ty + 1) * (TILE_SIZE / ZOOM) & page_rect
+            expected = reference(drawn_model, idx, clip)
+            assert tile.irect == expected.irect
+            assert tile.samples == expected.samples
+            stitched.copy(tile, tile.irect)
+
+    # MuPDF antialiases edges a little differently when it renders with a clip,
+    # so the stitched page is only close to the full render, and every pixel
+    # is covered
+    diffs = [abs(a - b) for a, b in zip(stitched.samples, full.samples) if a != b]
+    assert len(diffs) < len(full.samples) // 50
+    assert max(diffs, default=0) < 64
+
+
+def test_rotating_again_renders_the_new_orientation(drawn_model):
+    drawn_model._render_page(1, ZOOM)
+    drawn_model.doc[1].set_rotation(0)
+    assert drawn_model._render_page(1, ZOOM).samples == reference(drawn_model, 1).samples
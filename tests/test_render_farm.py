@@ -0,0 +1,82 @@
+import os
+import time
+
+import pytest
+
+from core.render_farm import RenderFarm
+from tests.conftest import make_pdf
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs POSIX shared memory in /dev/shm")
+
+
+def shm_blocks():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    return make_pdf(tmp_path / "farm.pdf", pages=12)
+
+
+def test_renders_every_page_in_order(pdf):
+    before = shm_blocks()
+    with RenderFarm(pdf, workers=2) as farm:
+        pages = []
+        for rendered in farm.render(range(12), zoom=0.5):
+            with rendered:
+                assert len(rendered.tobytes()) == rendered.stride * rendered.height
+                pages.append(rendered.page)
+    assert pages == list(range(12))
+    assert shm_blocks() == before
+
+
+def test_exception_in_consumer_leaks_no_blocks(pdf):
+    before = shm_blocks()
+    with pytest.raises(RuntimeError):
+        with RenderFarm(pdf, workers=2) as farm:
+            for rendered in farm.render(range(12), zoom=0.5):
+                raise RuntimeError("printer error")
+    assert shm_blocks() == before
+
+
+def test_break_leaks_no_blocks(pdf):
+    before = shm_blocks()
+    with RenderFarm(pdf, workers=2) as farm:
+        for rendered in farm.render(range(12), zoom=0.5, ordered=False):
+            break
+    assert shm_blocks() == before
+
+
+def test_cancel_stops_yielding(pdf):
+    before = shm_blocks()
+    with RenderFarm(pdf, workers=2) as farm:
+        seen = 0
+        for rendered in farm.render(range(12), zoom=0.5):
+            with rendered:
+                seen += 1
+                farm.cancel()
+        assert farm.cancelled
+    assert seen == 1
+    assert shm_blocks() == before
+
+
+def test_slow_consumer_keeps_blocks_bounded(tmp_path):
+    pdf = make_pdf(tmp_path / "long.pdf", pages=30)
+    before = shm_blocks()
+    peak = 0
+    with RenderFarm(pdf, workers=2) as farm:
+        for rendered in farm.render(range(30), zoom=0.5):
+            with rendered:
+                time.sleep(0.02)  # workers would otherwise run far ahead
+                peak = max(peak, len(shm_blocks() - before))
+    assert peak <= farm.max_in_flight
+    assert shm_blocks() == before
+
+
+def test_unordered_render_yields_every_page(pdf):
+    with RenderFarm(pdf, workers=3, max_in_flight=2) as farm:
+        pages = []
+        for rendered in farm.render(range(12), zoom=0.5, ordered=False):
+            with rendered:
+                pages.append(rendered.page)
+    assert sorted(pages) == list(range(12))
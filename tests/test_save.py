@@ -0,0 +1,84 @@
+import os
+
+import pymupdf as fitz
+import pytest
+
+from core.atomic_save import write_snapshot
+from tests.conftest import make_pdf
+
+
+def test_save_writes_edits_and_reopens(model):
+    model.rotate_current_page(90)
+    assert model.needs_save()
+    assert model.save()
+    assert not model.is_modified()
+    with fitz.open(model.file_path) as doc:
+        assert doc[0].rotation == 90
+    assert model.last_save_report['profile'] == 'fast'
+
+
+def test_unmodified_document_needs_no_save(model):
+    assert not model.needs_save()
+    assert model.begin_save() is None
+
+
+def test_edits_are_refused_while_saving(model):
+    model.rotate_current_page(90)
+    job = model.begin_save()
+    assert not model.can_edit()
+    assert not model.rotate_current_page(180)
+    write_snapshot(job['data'], job['target'], job['profile'])
+    assert model.finish_save(job, True)
+    assert model.can_edit()
+
+
+def test_unreadable_file_after_save_keeps_document(model):
+    model.rotate_current_page(90)
+    job = model.begin_save()
+    doc = model.doc
+    with open(job['target'], 'wb') as f:
+        f.write(b"not a pdf")  # replaced by something else after the save
+    job['output_bytes'] = 9
+    assert not model.finish_save(job, True)
+    assert "cannot be read back" in job['error']
+    assert model.doc is doc and model.is_modified()
+    assert model.can_edit()
+
+
+def test_failed_write_leaves_old_file(tmp_path):
+    target = tmp_path / "old.pdf"
+    target.write_bytes(b"old content")
+    with pytest.raises(Exception):
+        write_snapshot(b"not a pdf", str(target), 'balanced')
+    assert target.read_bytes() == b"old content"
+    assert os.listdir(tmp_path) == ["old.pdf"]
+
+
+def _encryption(path):
+    with fitz.open(path) as doc:
+        return doc.metadata.get('encryption') if doc.metadata else 'locked'
+
+
+def test_save_as_keeps_owner_password_encryption(model, tmp_path):
+    make_pdf(tmp_path / "locked.pdf", owner_pw="owner", permissions=fitz.PDF_PERM_PRINT,
+             encryption=fitz.PDF_ENCRYPT_AES_256)
+    model.doc.close()
+    model.load_pdf(str(tmp_path / "locked.pdf"))
+    assert model.save_as(str(tmp_path / "copy.pdf"))
+    assert model.last_save_report['profile'] == 'balanced'
+    assert _encryption(tmp_path / "copy.pdf")
+
+
+def test_password_document_falls_back_to_fast(model, tmp_path):
+    path = make_pdf(tmp_path / "secret.pdf", user_pw="user", owner_pw="owner",
+                    encryption=fitz.PDF_ENCRYPT_AES_256)
+    model.doc.close()
+    model.load_pdf(path)
+    assert model.doc.authenticate("user")
+    model.rotate_current_page(90)
+    assert model.save(profile='smallest')
+    assert model.last_save_report['profile'] == 'fast'
+    with fitz.open(path) as doc:
+        assert doc.needs_pass
+        assert doc.authenticate("user")
+        assert doc[0].rotation == 90
@@ -0,0 +1,50 @@
+import os
+
+import pymupdf as fitz
+import pytest
+
+from core.atomic_save import write_snapshot
+from core.save_profiles import SAVE_PROFILES, format_report, get_profile, needs_rewrite, save_report
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        get_profile("tiny")
+
+
+def test_only_fast_writes_bytes_unchanged():
+    assert [name for name in SAVE_PROFILES if not needs_rewrite(name)] == ['fast']
+
+
+def test_report_format():
+    report = save_report('balanced', 2 * 1024 * 1024, 1024 * 1024, 1.234)
+    assert format_report(report) == "balanced: 2.0 MB -> 1.0 MB (50%) in 1.23 s"
+
+
+@pytest.mark.parametrize("profile", list(SAVE_PROFILES))
+def test_every_profile_writes_a_readable_pdf(tmp_path, profile):
+    doc = fitz.open()
+    for n in range(3):
+        doc.new_page().insert_text((72, 72), f"page {n}")
+    data = doc.tobytes()
+    target = str(tmp_path / "out.pdf")
+    size = write_snapshot(data, target, profile)
+    assert size == os.path.getsize(target)
+    with fitz.open(target) as saved:
+        assert [page.get_text().strip() for page in saved] == ["page 0", "page 1", "page 2"]
+    if profile == 'fast':
+        assert size == len(data)
+
+
+@pytest.mark.parametrize("profile", list(SAVE_PROFILES))
+def test_every_profile_keeps_encryption(tmp_path, profile):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "page 0")
+    data = doc.tobytes(owner_pw="owner", permissions=fitz.PDF_PERM_PRINT,
+                       encryption=fitz.PDF_ENCRYPT_AES_256)
+    target = str(tmp_path / "out.pdf")
+    write_snapshot(data, target, profile)
+    with fitz.open(target) as saved:
+        assert saved.metadata['encryption']
+        assert not saved.permissions & fitz.PDF_PERM_MODIFY
+        assert saved[0].get_text().strip() == "page 0"
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from core.search_engine import SearchOptions, PLAIN_SEARCH, compile_query, fold_accents, fold_strokes
+
+
+def test_ascii_is_returned_unchanged():
+    text, origin = fold_accents("plain text")
+    assert text == "plain text" and origin is None
+
+
+def test_one_to_one_folding_has_no_index_map():
+    text, origin = fold_accents("Crème brûlée à Đà Nẵng")
+    assert text == "Creme brulee a Da Nang"
+    assert origin is None
+
+
+def test_expanding_chars_map_back_to_their_source():
+    source = "ﬁne ½"
+    text, origin = fold_accents(source)
+    assert text == "fine 1⁄2"
+    assert len(origin) == len(text)
+    assert [source[i] for i in origin] == ["ﬁ", "ﬁ", "n", "e", " ", "½", "½", "½"]
+
+
+def test_fold_strokes_only_touches_stroke_letters():
+    assert fold_strokes("Łódź đ ø") == "Lódź d o"
+
+
+def test_literal_query_escapes_and_spans_line_breaks():
+    pattern = compile_query("a.b  c", PLAIN_SEARCH)
+    assert pattern.search("A.B\nc")
+    assert not pattern.search("axb c")
+
+
+def test_match_case_and_whole_word():
+    assert compile_query("The", SearchOptions(match_case=True)).search("the") is None
+    whole = compile_query("the", SearchOptions(whole_word=True))
+    assert whole.search("in the end")
+    assert whole.search("then") is None
+
+
+def test_regex_and_accent_folded_query():
+    assert compile_query(r"\d+ pages", SearchOptions(regex=True)).search("120 pages")
+    assert compile_query("café", SearchOptions(ignore_accents=True)).search("cafe au lait")
+
+
+def test_bad_regex_raises():
+    with pytest.raises(re.error):
+        compile_query("(", SearchOptions(regex=True))
@@ -0,0 +1,51 @@
+import gzip
+import json
+
+from core.search_index import SearchIndex, SEARCH_INDEX_VERSION, index_path
+from tests.conftest import make_pdf
+
+
+def words(*texts):
+    return [(0, 0, 10, 10, t, 0, 0, i) for i, t in enumerate(texts)]
+
+
+def test_postings_are_page_level_and_sorted():
+    index = SearchIndex("fp", 3)
+    index.add_page(0, words("Alpha", "beta", "alpha"))
+    index.add_page(2, words("ALPHA"))
+    assert index.postings["alpha"].tolist() == [0, 2]
+    assert index.postings["beta"].tolist() == [0]
+
+
+def test_candidate_pages_intersect_tokens_and_match_fragments():
+    index = SearchIndex("fp", 3)
+    index.add_page(0, words("quick", "brown"))
+    index.add_page(1, words("quick", "fox"))
+    index.add_page(2, words("brownish"))
+    assert index.candidate_pages("quick") == {0, 1}
+    assert index.candidate_pages("Quick brown") == {0}
+    assert index.candidate_pages("rown") == {0, 2}
+    assert index.candidate_pages("missing") == set()
+    assert index.candidate_pages("   ") is None
+
+
+def test_save_and_load_round_trip(tmp_path):
+    pdf = make_pdf(tmp_path / "doc.pdf", pages=4, text="word{n} common")
+    index = SearchIndex.build(pdf, "fp")
+    path = index_path(str(tmp_path / "idx"), "fp")
+    index.save(path)
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['version'] == SEARCH_INDEX_VERSION
+    assert set(data) == {'version', 'fingerprint', 'page_count', 'postings'}
+
+    loaded = SearchIndex.load(path, "fp")
+    assert loaded.candidate_pages("common") == {0, 1, 2, 3}
+    assert loaded.candidate_pages("word2") == {2}
+    assert SearchIndex.load(path, "other") is None
+
+
+def test_build_can_be_cancelled(tmp_path):
+    pdf = make_pdf(tmp_path / "doc.pdf", pages=3)
+    assert SearchIndex.build(pdf, "fp", cancelled=lambda: True) is None
@@ -0,0 +1,74 @@
+import pymupdf as fitz
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from core.search_engine import PLAIN_SEARCH, SearchEngine, SearchOptions
+from gui.threads.search_thread import SearchThread
+from tests.conftest import make_pdf
+
+# "app" hits the first page, the last and some in between; "apple" all but page 4
+PAGE_TEXTS = ["apple one", "cherry", "apple two", "cherry", "happy", "apple three"]
+
+
+@pytest.fixture
+def fruit_model(model, tmp_path):
+    path = str(tmp_path / "fruit.pdf")
+    make_pdf(path, pages=len(PAGE_TEXTS), text="{n}")
+    with fitz.open(path) as doc:
+        for page, text in zip(doc, PAGE_TEXTS):
+            page.insert_text((72, 144), text)
+        doc.saveIncr()
+    model.doc.close()
+    model.load_pdf(path)
+    return model
+
+
+def run_search(model, text, options=PLAIN_SEARCH, completed=True):
+    job = model.begin_search(text, options=options)
+    thread = SearchThread(job, 1, SearchEngine())
+    thread.page_results.connect(lambda generation, page, hits: model.add_search_results(page, hits))
+    thread.run()
+    model.finish_search(completed)
+    return job
+
+
+def test_extended_query_scans_only_pages_the_last_one_hit(fruit_model):
+    run_search(fruit_model, "app")
+    assert fruit_model.get_refined_pages("apple", PLAIN_SEARCH, fruit_model.get_search_source_key()) == [0, 2, 4, 5]
+
+
+def test_refined_pages_start_at_the_current_page(fruit_model):
+    run_search(fruit_model, "app")
+    fruit_model.current_page = 3
+    job = run_search(fruit_model, "apple")
+    assert job['pages'] == [4, 5, 0, 2]
+    assert list(dict.fromkeys(fruit_model.search_results.pages)) == [0, 2, 5]
+
+    # Refines again from the narrower result
+    job = run_search(fruit_model, "apple t")
+    assert job['pages'] == [5, 0, 2]
+
+
+def test_no_refinement_without_a_finished_prefix_query(fruit_model):
+    key = fruit_model.get_search_source_key()
+    assert fruit_model.get_refined_pages("apple", PLAIN_SEARCH, key) is None
+
+    run_search(fruit_model, "app", completed=False)
+    assert fruit_model.get_refined_pages("apple", PLAIN_SEARCH, key) is None
+
+    run_search(fruit_model, "app")
+    assert fruit_model.get_refined_pages("cherry", PLAIN_SEARCH, key) is None
+    assert fruit_model.get_refined_pages("apple", SearchOptions(match_case=True), key) is None
+
+
+@pytest.mark.parametrize("options", [SearchOptions(regex=True), SearchOptions(whole_word=True)])
+def test_regex_and_whole_word_are_never_refined(fruit_model, options):
+    run_search(fruit_model, "app", options)
+    assert fruit_model.get_refined_pages("apple", options, fruit_model.get_search_source_key()) is None
+
+
+def test_edit_after_the_search_scans_every_page(fruit_model):
+    run_search(fruit_model, "app")
+    fruit_model.rotate_current_page(90)
+    assert fruit_model.get_refined_pages("apple", PLAIN_SEARCH, fruit_model.get_search_source_key()) is None
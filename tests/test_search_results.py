@@ -0,0 +1,49 @@
+import pytest
+
+from core.search_results import SearchResults
+
+
+def rect(n):
+    return (n, n, n + 10.0, n + 5.0)
+
+
+def test_hits_added_in_wrapped_scan_order_end_up_in_page_order():
+    results = SearchResults("needle")
+    # Scanning starts at the current page (5) and wraps around to the start
+    assert results.add_page(5, [rect(1), rect(2)]) == 0
+    assert results.add_page(8, [rect(3)]) == 2
+    assert results.add_page(0, [rect(4)]) == 0
+    assert results.add_page(2, [rect(5)]) == 1
+    assert list(results.pages) == [0, 2, 5, 5, 8]
+    assert [m['rect'] for m in results] == [rect(4), rect(5), rect(1), rect(2), rect(3)]
+    assert results[1] == {'page': 2, 'rect': rect(5), 'rects': [rect(5)], 'text': "needle"}
+
+
+def test_negative_and_out_of_range_indexes():
+    results = SearchResults("x")
+    results.add_page(3, [rect(1)])
+    assert results[-1]['page'] == 3
+    with pytest.raises(IndexError):
+        results[1]
+
+
+def test_multi_line_match_keeps_line_rects_after_insertion_before_it():
+    results = SearchResults("split word")
+    lines = [(10.0, 10.0, 50.0, 20.0), (0.0, 22.0, 30.0, 32.0)]
+    results.add_page(4, [rect(1), lines])
+    results.add_page(1, [rect(2)])  # shifts every index, not the per-page ordinal
+    match = results[2]
+    assert match['page'] == 4
+    assert match['rects'] == lines
+    assert match['rect'] == (0.0, 10.0, 50.0, 32.0)
+    assert results.page_line_rects(4) == [rect(1)] + lines
+
+
+def test_page_range_and_size():
+    results = SearchResults("x")
+    results.add_page(2, [rect(1), rect(2)])
+    results.add_page(7, [rect(3)])
+    assert results.page_range(2) == (0, 2)
+    assert results.page_range(5) == (2, 2)
+    assert len(results) == 3
+    assert results.nbytes() == 3 * 4 + 12 * 4
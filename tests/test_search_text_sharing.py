@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from core.search_engine import SearchEngine, SearchOptions
+from gui.threads.search_thread import SearchThread
+
+
+def run_search(model, job):
+    # run() on the calling thread: signals reach the model directly
+    thread = SearchThread(job, 1, SearchEngine())
+    thread.page_texts.connect(model.add_page_texts)
+    thread.run()
+
+
+def assert_extraction_hits_cache(model):
+    model.text_cache.reset_stats()
+    texts = [model.get_page_text(i) for i in range(model.get_page_count())]
+    stats = model.get_text_cache_stats()
+    assert stats['text_hits'] == model.get_page_count()
+    assert stats['text_misses'] == 0
+    assert texts[3].strip() == "page 3"
+
+
+def test_plain_search_fills_text_cache(model):
+    run_search(model, model.begin_search("page"))
+    assert_extraction_hits_cache(model)
+
+
+def test_engine_search_fills_text_cache(model):
+    run_search(model, model.begin_search(r"page \d", options=SearchOptions(regex=True)))
+    assert_extraction_hits_cache(model)
+
+
+def test_parallel_search_fills_text_cache(model):
+    job = model.begin_search("page")
+    job['workers'] = 2
+    run_search(model, job)
+    assert_extraction_hits_cache(model)
+
+
+def test_texts_for_another_source_are_ignored(model):
+    job = model.begin_search("page")
+    model.add_new_page()
+    run_search(model, job)
+    model.text_cache.reset_stats()
+    model.get_page_text(0)
+    assert model.get_text_cache_stats()['text_hits'] == 0
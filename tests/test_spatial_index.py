@@ -0,0 +1,52 @@
+import random
+
+from utils.spatial_index import RectGridIndex
+
+
+def brute_force(rects, x, y):
+    return [i for i, r in enumerate(rects) if r[0] <= x < r[2] and r[1] <= y < r[3]]
+
+
+def test_point_hits_match_brute_force():
+    rng = random.Random(7)
+    rects = []
+    for _ in range(300):
+        x, y = rng.uniform(0, 580), rng.uniform(0, 820)
+        rects.append((x, y, x + rng.uniform(1, 60), y + rng.uniform(1, 14)))
+    index = RectGridIndex(rects, 612, 842)
+    for _ in range(2000):
+        x, y = rng.uniform(0, 612), rng.uniform(0, 842)
+        expected = brute_force(rects, x, y)
+        found = index.item_at(x, y)
+        if expected:
+            assert found in expected
+        else:
+            assert found == -1
+
+
+def test_rect_spanning_cells_is_found_in_each():
+    index = RectGridIndex([(10, 10, 590, 20)], 600, 800, cell_size=50)
+    for x in (11, 200, 589.9):
+        assert index.item_at(x, 15) == 0
+    assert index.item_at(590, 15) == -1  # right and bottom edges are exclusive
+
+
+def test_points_outside_the_page_miss():
+    index = RectGridIndex([(0, 0, 100, 100)], 100, 100)
+    assert index.item_at(-1, 5) == -1
+    assert index.item_at(5, 100) == -1
+    assert not index.contains(150, 50)
+
+
+def test_rect_query_returns_sorted_intersections():
+    rects = [(0, 0, 10, 10), (20, 0, 30, 10), (0, 20, 10, 30), (5, 5, 25, 25)]
+    index = RectGridIndex(rects, 100, 100, cell_size=8)
+    assert index.items_in(0, 0, 15, 15) == [0, 3]
+    assert index.items_in(40, 40, 50, 50) == []
+    assert len(index) == 4
+
+
+def test_empty_index():
+    index = RectGridIndex([], 612, 792)
+    assert index.item_at(10, 10) == -1
+    assert index.items_in(0, 0, 612, 792) == []
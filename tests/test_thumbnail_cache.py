@@ -0,0 +1,68 @@
+import itertools
+import types
+
+import pytest
+
+import core.thumbnail_cache as thumbnail_cache
+from core.thumbnail_cache import ThumbnailCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Distinct, increasing access times so least recently used is well defined
+    ticks = itertools.count(1)
+    monkeypatch.setattr(thumbnail_cache, "time", types.SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = ThumbnailCache(str(tmp_path / "thumbnails.sqlite"), max_bytes=250)
+    yield cache
+    cache.close()
+
+
+def test_hit_and_miss(cache):
+    cache.put("doc-a", 0, 0, b"page 0")
+    cache.put("doc-a", 0, 90, b"page 0 turned")
+    cache.flush()
+    assert cache.load_document("doc-a") == {(0, 0): b"page 0", (0, 90): b"page 0 turned"}
+    assert cache.load_document("doc-b") == {}
+    assert cache.load_document(None) == {}
+
+
+def test_thumbnails_outlive_the_cache_object(tmp_path, clock):
+    path = str(tmp_path / "thumbnails.sqlite")
+    cache = ThumbnailCache(path)
+    cache.put("doc-a", 3, 0, b"page 3")
+    cache.close()  # pending thumbnails are written on close
+    cache = ThumbnailCache(path)
+    assert cache.load_document("doc-a") == {(3, 0): b"page 3"}
+    cache.close()
+
+
+def test_least_recently_used_documents_are_evicted(cache):
+    for fingerprint in ("doc-a", "doc-b"):
+        cache.put(fingerprint, 0, 0, bytes(100))
+        cache.flush()
+    cache.load_document("doc-a")  # doc-b is now the least recently used
+    cache.put("doc-c", 0, 0, bytes(100))
+    cache.flush()
+    assert cache.load_document("doc-b") == {}
+    assert cache.load_document("doc-a") and cache.load_document("doc-c")
+
+
+def test_changed_pages_do_not_reuse_disk_thumbnails(model):
+    # The window looks thumbnails up by (fingerprint, source page key)
+    old_fingerprint = model.fingerprint
+    assert model.get_source_page_key(1) == (1, 0)
+
+    model.current_page = 1
+    model.rotate_current_page(90)
+    assert model.get_source_page_key(1) == (1, 90)
+    model.current_page = 2
+    model.add_highlight_annotation((50, 50, 150, 100))
+    assert model.get_source_page_key(2) is None  # edited since it was read from the file
+
+    assert model.save()
+    assert model.fingerprint != old_fingerprint
+    assert model.get_source_page_key(2) == (2, 0)
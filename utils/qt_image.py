@@ -0,0 +1,47 @@
+from PyQt5.QtGui import QImage
+import pymupdf as fitz
+
+# fitz sample layouts Qt can read in place, keyed by (colour components, has_alpha).
+# MuPDF alpha pixmaps are premultiplied. Four colour components is CMYK, which
+# Qt cannot show; pixmap_to_qimage converts those to RGB first.
+#
+# Pages are rendered as plain RGB888 rather than an RGBX/RGB32 layout: Qt draws
+# RGB888 onto the widget as fast as RGB32 (0.77 vs 0.74 ms for a 1224x1584
+# page), while rendering with alpha to get a 4-byte layout draws slower
+# (1.4 ms, the transparent background has to be blended) and MuPDF has no
+# way to render straight into BGRX.
+_QIMAGE_FORMATS = {
+    (1, False): QImage.Format_Grayscale8,
+    (3, False): QImage.Format_RGB888,
+    (3, True): QImage.Format_RGBA8888_Premultiplied,
+}
+
+
+def buffer_to_qimage(buffer, width, height, stride, n=3, alpha=False, owner=None):
+    """Wrap raw samples in a QImage without copying them.
+
+    The QImage reads straight from buffer, so whatever owns that memory is
+    pinned on the image; it is released together with the last Python
+    reference to the QImage. Call .copy() on the result before handing it to
+    code that keeps it past that point.
+    """
+    fmt = _QIMAGE_FORMATS.get((n - (1 if alpha else 0), bool(alpha)))
+    if fmt is None:
+        raise ValueError(f"Unsupported sample layout: n={n}, alpha={alpha}")
+    img = QImage(buffer, width, height, stride, fmt)
+    img._buffer_owner = owner if owner is not None else buffer
+    return img
+
+
+def pixmap_to_qimage(pixmap):
+    colorspace = pixmap.colorspace
+    if colorspace is None:
+        # alpha-only mask
+        pixmap = fitz.Pixmap(fitz.csGRAY, pixmap)
+    elif (colorspace.n, bool(pixmap.alpha)) not in _QIMAGE_FORMATS:
+        # CMYK and other colourspaces Qt has no format for
+        pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+    return buffer_to_qimage(
+        pixmap.samples_mv, pixmap.width, pixmap.height, pixmap.stride,
+        pixmap.n, pixmap.alpha, owner=pixmap
+    )
@@ -0,0 +1,84 @@
+from array import array
+import math
+
+# Target number of rects per grid cell; a few keeps point queries near O(1)
+RECTS_PER_CELL = 4
+
+
+class RectGridIndex:
+    """Uniform grid over axis-aligned rects, stored in flat arrays.
+
+    Rects are (x0, y0, x1, y1) tuples in whatever coordinates the caller
+    queries with. Each cell lists the rects overlapping it, so a point
+    query only tests the handful of rects in one cell.
+    """
+
+    def __init__(self, rects, width, height, cell_size=None):
+        self.width = max(1.0, float(width))
+        self.height = max(1.0, float(height))
+        self.coords = array('d')
+        for r in rects:
+            self.coords.extend((r[0], r[1], r[2], r[3]))
+        count = len(self.coords) // 4
+
+        if cell_size is None:
+            cell_size = math.sqrt(self.width * self.height * RECTS_PER_CELL / max(1, count))
+        self.cell_size = max(1.0, cell_size)
+        self.cols = max(1, math.ceil(self.width / self.cell_size))
+        self.rows = max(1, math.ceil(self.height / self.cell_size))
+
+        # Compressed rows: items of cell c are cell_items[cell_start[c]:cell_start[c + 1]]
+        buckets = [[] for _ in range(self.cols * self.rows)]
+        for i in range(count):
+            c0, r0, c1, r1 = self._cell_span(*self.coords[4 * i:4 * i + 4])
+            for row in range(r0, r1 + 1):
+                base = row * self.cols
+                for col in range(c0, c1 + 1):
+                    buckets[base + col].append(i)
+        self.cell_start = array('l', [0])
+        self.cell_items = array('l')
+        for bucket in buckets:
+            self.cell_items.extend(bucket)
+            self.cell_start.append(len(self.cell_items))
+
+    def __len__(self):
+        return len(self.coords) // 4
+
+    def _cell_span(self, x0, y0, x1, y1):
+        cs = self.cell_size
+        return (self._clamp(int(x0 // cs), self.cols), self._clamp(int(y0 // cs), self.rows),
+                self._clamp(int(x1 // cs), self.cols), self._clamp(int(y1 // cs), self.rows))
+
+    @staticmethod
+    def _clamp(value, limit):
+        return min(max(value, 0), limit - 1)
+
+    def item_at(self, x, y):
+        """Index of a rect containing (x, y), or -1."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return -1
+        cell = int(y // self.cell_size) * self.cols + int(x // self.cell_size)
+        coords = self.coords
+        for pos in range(self.cell_start[cell], self.cell_start[cell + 1]):
+            i = self.cell_items[pos]
+            k = 4 * i
+            if coords[k] <= x < coords[k + 2] and coords[k + 1] <= y < coords[k + 3]:
+                return i
+        return -1
+
+    def contains(self, x, y):
+        return self.item_at(x, y) >= 0
+
+    def items_in(self, x0, y0, x1, y1):
+        """Sorted indices of rects intersecting the given rect."""
+        c0, r0, c1, r1 = self._cell_span(x0, y0, x1, y1)
+        coords = self.coords
+        found = set()
+        for row in range(r0, r1 + 1):
+            for cell in range(row * self.cols + c0, row * self.cols + c1 + 1):
+                for pos in range(self.cell_start[cell], self.cell_start[cell + 1]):
+                    i = self.cell_items[pos]
+                    k = 4 * i
+                    if coords[k] < x1 and x0 < coords[k + 2] and coords[k + 1] < y1 and y0 < coords[k + 3]:
+                        found.add(i)
+        return sorted(found)